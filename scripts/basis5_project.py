@@ -3,7 +3,6 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from glob import glob
 from pathlib import Path
 from typing import List
 
@@ -15,12 +14,9 @@ from src.core.basis5 import build_winding  # type: ignore
 
 
 def newest_json() -> Path | None:
-    files = sorted(
-        (Path(p) for p in glob(str(ROOT / "data/logs/*.json"))),
-        key=lambda p: p.stat().st_mtime if p.exists() else 0.0,
-        reverse=True,
-    )
-    return files[0] if files else None
+    # newest run from the log manifest (rebuilt on first use if missing)
+    from src.engine.log_index import newest_json as _newest
+    return _newest(ROOT / "data/logs")
 
 
 def extract_phases(prov_path: Path) -> List[str]:
@@ -0,0 +1,77 @@
+from __future__ import annotations
+import argparse, json, sys, tempfile, time
+from pathlib import Path
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from src.engine import analytics, run_store  # noqa: E402
+
+SESSIONS = np.array([f"s{i}" for i in range(8)] + [""])
+PHASES = np.array(["MEM", "JAM", "ALIVE", ""])
+
+def fill_store(store: run_store.RunStore, n: int, chunk: int = 1_000_000) -> None:
+    rng = np.random.default_rng(0)
+    for lo in range(0, n, chunk):
+        m = min(chunk, n - lo)
+        ttm = rng.gamma(2.0, 3.0, m)
+        ttm[rng.random(m) < 0.5] = np.nan
+        store.append({
+            "session": SESSIONS[rng.integers(0, len(SESSIONS), m)],
+            "final_phase": PHASES[rng.integers(0, len(PHASES), m)],
+            "time_to_mem_ms": ttm,
+        })
+
+def write_history(path: Path, n: int) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"run_id": str(i), "session": f"s{i % 8}", "final_phase": "JAM" if i % 3 else "MEM",
+                                "time_to_mem_ms": float(i % 50) if i % 2 else None}) + "\n")
+
+def main():
+    ap = argparse.ArgumentParser(description="analytics.aggregate(): columnar RunStore vs JSON lines")
+    ap.add_argument("-n", type=int, default=10_000_000, help="runs in the columnar store")
+    ap.add_argument("--json-n", type=int, default=1_000_000, help="runs for the JSON-lines baseline (0 skips it)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        d = Path(tmp)
+        analytics.ANALYTICS_DIR = d
+        analytics.HISTORY = d / "history.jsonl"
+        analytics.AGG_STATE = d / "aggregate.state.json"
+        analytics.HISTORY.touch()
+
+        print(f"backend: {run_store._backend()}")
+        t0 = time.perf_counter()
+        fill_store(run_store.RunStore(d / "cols"), args.n)
+        print(f"load {args.n} runs            : {time.perf_counter() - t0:8.3f} s")
+
+        analytics.RUN_STORE_DIR = d / "cols"
+        t0 = time.perf_counter()
+        agg = analytics.aggregate()
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        analytics.aggregate()
+        warm = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        xs, ys = analytics._time_to_mem_series()
+        series = time.perf_counter() - t0
+        assert agg["total_runs"] == args.n
+        print(f"columnar aggregate, cold  : {cold:8.3f} s  ({args.n / cold:14.0f} runs/s)")
+        print(f"columnar aggregate, warm  : {warm:8.3f} s")
+        print(f"time_to_mem series        : {series:8.3f} s  ({len(ys)} points)")
+
+        if args.json_n:
+            write_history(analytics.HISTORY, args.json_n)
+            analytics.RUN_STORE_DIR = None
+            t0 = time.perf_counter()
+            analytics.aggregate(rebuild=True)  # full JSON parse, as every call did before
+            t = time.perf_counter() - t0
+            print(f"JSON lines, n={args.json_n:<10d} : {t:8.3f} s  ({args.json_n / t:14.0f} runs/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import argparse, json, os, sys, tempfile, time
+from pathlib import Path
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.engine import event_log  # noqa: E402
+from src.engine.event_log import EventLog  # noqa: E402
+
+PAYLOAD = {"phase": "ALIVE", "details": {"mode": "neutral", "ast_size": 7, "depth": 3}}
+
+def bench_rewrite(n: int) -> float:
+    """The old behaviour: rewrite the whole JSON array on every event."""
+    events = []
+    path = os.path.join(event_log.LOG_DIR, "rewrite.json")
+    t0 = time.perf_counter()
+    for i in range(n):
+        events.append({"ts": "", "type": "phase", "data": dict(PAYLOAD, i=i)})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(events, f, indent=2, ensure_ascii=False)
+    return time.perf_counter() - t0
+
+def bench_append(n: int, durability: str) -> float:
+    t0 = time.perf_counter()
+    with EventLog(f"bench_{durability}", durability=durability) as log:
+        for i in range(n):
+            log.event("phase", dict(PAYLOAD, i=i))
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="EventLog cost for one n-event run: rewrite-per-event vs append-only")
+    ap.add_argument("-n", type=int, default=10_000, help="events per run")
+    ap.add_argument("--rewrite-n", type=int, default=2000,
+                    help="events for the O(n^2) rewrite baseline (0 skips it; 10k takes minutes)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # keep artifacts out of the repo
+        os.makedirs(event_log.LOG_DIR, exist_ok=True)
+        if args.rewrite_n:
+            t = bench_rewrite(args.rewrite_n)
+            print(f"rewrite per event, n={args.rewrite_n}: {t:8.3f} s  ({args.rewrite_n / t:10.1f} events/s)")
+        for durability in event_log.DURABILITY:
+            t = bench_append(args.n, durability)
+            print(f"append {durability:5s}, n={args.n}: {t:8.3f} s  ({args.n / t:10.1f} events/s)")
+
+if __name__ == "__main__":
+    main()
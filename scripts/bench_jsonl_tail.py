@@ -0,0 +1,49 @@
+from __future__ import annotations
+import argparse, json, sys, tempfile, time
+from pathlib import Path
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.engine.jsonl_index import JsonlFile  # noqa: E402
+
+REC = {"run_id": "", "session": "bench", "final_phase": "MEM", "time_to_mem_ms": 1.5, "log_json": "data/logs/x.json"}
+
+def full_scan_tail(path: Path, n: int) -> list:
+    """The old MemoryStore.load(tail=n): parse everything, then slice."""
+    out = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                out.append(json.loads(line))
+    return out[-n:]
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="last-N / record-k reads on a JSONL file: full scan vs offset index")
+    ap.add_argument("-n", type=int, default=1_000_000, help="records in the file")
+    ap.add_argument("--tail", type=int, default=10)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(dict(REC, run_id=str(i))) + "\n" for i in range(args.n))
+        print(f"{args.n} records, {path.stat().st_size / 1e6:.1f} MB")
+        print(f"full scan tail({args.tail}):       {timed(lambda: full_scan_tail(path, args.tail)):.4f} s")
+        jf = JsonlFile(path)
+        print(f"backwards tail({args.tail}), no index: {timed(lambda: jf.tail(args.tail)):.4f} s")
+        print(f"build index (once):         {timed(lambda: len(jf)):.4f} s")
+        jf.append(dict(REC, run_id="new"))
+        print(f"indexed tail({args.tail}) after append: {timed(lambda: jf.tail(args.tail)):.4f} s")
+        print(f"fresh reader, record k:     {timed(lambda: JsonlFile(path).get(args.n // 2)):.4f} s")
+
+if __name__ == "__main__":
+    main()
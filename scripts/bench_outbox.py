@@ -0,0 +1,70 @@
+from __future__ import annotations
+import argparse, json, sys, tempfile, threading, time
+from pathlib import Path
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.engine.orchestration import BaseDriver, FileDriver, Orchestrator  # noqa: E402
+
+PAYLOAD = {"run_id": "r", "phase": "JAM", "details": {"mode": "implication", "ast_size": 7}}
+TYPES = ("run_start", "jam", "mem", "run_end")
+
+class OpenAppendClose(BaseDriver):
+    """The old FileDriver.publish: open, append one line, close – per event."""
+    def __init__(self, directory: Path):
+        self.dir = directory
+
+    def publish(self, event_type, payload):
+        with (self.dir / f"lee_evt_{event_type}.jsonl").open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"type": event_type, "data": payload}, ensure_ascii=False) + "\n")
+
+def run(driver, publishers: int, total: int, batched: bool = False) -> float:
+    orch = Orchestrator.__new__(Orchestrator)  # skip config loading; same publish() path
+    orch.driver = driver
+    orch.spool = orch.dispatcher = None
+    orch.dispatchers = {}
+    per = total // publishers
+    start = threading.Barrier(publishers + 1)
+
+    def work():
+        start.wait()
+        if batched:  # one publish_many per run: start/jam/mem/end together
+            for _ in range(per // len(TYPES)):
+                orch.publish_many([(t, PAYLOAD) for t in TYPES])
+            return
+        for i in range(per):
+            orch.publish(TYPES[i % len(TYPES)], PAYLOAD)
+
+    threads = [threading.Thread(target=work) for _ in range(publishers)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    orch.close()  # the buffered driver's last commit counts
+    n = per // len(TYPES) * len(TYPES) if batched else per
+    return n * publishers / (time.perf_counter() - t0)
+
+def main():
+    ap = argparse.ArgumentParser(description="outbox FileDriver events/s: open-append-close vs buffered group commit"
+                                             " vs publish_many batches")
+    ap.add_argument("-n", type=int, default=64_000, help="events per run")
+    ap.add_argument("--publishers", default="1,8,64")
+    args = ap.parse_args()
+    print(f"{'publishers':>10} {'open/append/close':>18} {'buffered':>12} {'speedup':>8} {'publish_many':>14}")
+    for p in (int(x) for x in args.publishers.split(",")):
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            old = run(OpenAppendClose(Path(a)), p, args.n)
+            new = run(FileDriver(b), p, args.n)
+            lines = sum(len(f.read_text().splitlines()) for f in Path(b).glob("*.jsonl"))
+            assert lines == args.n // p * p, lines
+        with tempfile.TemporaryDirectory() as c:
+            many = run(FileDriver(c), p, args.n, batched=True)
+        print(f"{p:>10} {old:>16,.0f}/s {new:>10,.0f}/s {new / old:>7.1f}x {many:>12,.0f}/s")
+
+if __name__ == "__main__":
+    main()
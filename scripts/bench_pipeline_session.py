@@ -0,0 +1,42 @@
+from __future__ import annotations
+import argparse, os, sys, tempfile, time
+from pathlib import Path
+
+# ensure repo root on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.engine import Pipeline, PipelineSession  # noqa: E402
+
+EXPRS = ["1 -> 0", "1 -> 1", "p & ~p", "A -> B"]
+
+def bench_fresh(n: int, provenance: bool) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        p = Pipeline(log_name=f"bench_{i:06d}", domain="legal", enable_provenance=provenance, session="bench")
+        p.run(EXPRS[i % len(EXPRS)])
+    return n / (time.perf_counter() - t0)
+
+def bench_session(n: int, provenance: bool) -> float:
+    t0 = time.perf_counter()
+    with PipelineSession(log_name="bench", domain="legal", enable_provenance=provenance, session="bench") as s:
+        for i in range(n):
+            s.run(EXPRS[i % len(EXPRS)], log_name=f"bench_{i:06d}")
+    return n / (time.perf_counter() - t0)
+
+def main():
+    ap = argparse.ArgumentParser(description="Runs/s: fresh Pipeline per run vs one PipelineSession")
+    ap.add_argument("-n", type=int, default=2000, help="runs per measurement")
+    ap.add_argument("--prov", action="store_true", help="enable provenance artifacts")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # keep artifacts out of the repo
+        before = bench_fresh(args.n, args.prov)
+        after = bench_session(args.n, args.prov)
+    print(f"fresh Pipeline per run : {before:10.1f} runs/s")
+    print(f"PipelineSession        : {after:10.1f} runs/s  ({after / before:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import json, sys
-from glob import glob
 from pathlib import Path
 
 # ensure repo root on path (not strictly needed)
@@ -9,10 +8,9 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 def newest_json() -> Path | None:
-    files = sorted((Path(p) for p in glob("data/logs/*.json")),
-                   key=lambda p: p.stat().st_mtime if p.exists() else 0.0,
-                   reverse=True)
-    return files[0] if files else None
+    # newest run from the log manifest (rebuilt on first use if missing)
+    from src.engine.log_index import newest_json as _newest
+    return _newest("data/logs")
 
 def to_md(log_json: Path) -> str:
     prov = log_json.with_suffix(".prov.jsonl")
@@ -1,5 +1,6 @@
 from __future__ import annotations
-import argparse, csv, json, sys, time
+import argparse, csv, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # ensure repo root on path
@@ -7,7 +8,8 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.engine import Pipeline  # noqa: E402
+from src.engine import PipelineSession  # noqa: E402
+from src.engine.latency import LatencyStats  # noqa: E402
 
 def last_detect_enrichment(log_json: str) -> dict | None:
     p = Path(log_json).with_suffix(".prov.jsonl")
@@ -24,27 +26,113 @@ def last_detect_enrichment(log_json: str) -> dict | None:
                 last = obj
     return (last or {}).get("details", {}).get("enrichment")
 
-def run_batch(exprs: list[str], domain: str, session: str, log_prefix: str, provenance: bool) -> list[dict]:
+def _row(i: int, expr: str, domain: str, res: dict, provenance: bool) -> dict:
+    enrich = last_detect_enrichment(res.get("log_json", "")) if provenance else None
+    return {
+        "idx": i,
+        "expr": expr,
+        "domain": domain,
+        "phase": res["state"]["phase"],
+        "elapsed_ms": res.get("elapsed_ms"),
+        "log_json": res.get("log_json"),
+        "log_svg": res.get("log_svg"),
+        "enrichment": enrich,
+    }
+
+def _chunk_latency(rows: list[dict], session: str) -> LatencyStats:
+    lat = LatencyStats()
+    for r in rows:
+        lat.record("elapsed_ms", r["elapsed_ms"], session=session, domain=r["domain"], phase=r["phase"])
+    return lat
+
+def _run_chunk(sess: PipelineSession, chunk: list[tuple[int, str]], log_prefix: str, provenance: bool) -> list[dict]:
+    results = [
+        # one long-lived session; only the per-line log name changes
+        (i, expr, sess.run(expr, log_name=f"{log_prefix}_{i:04d}"))
+        for i, expr in chunk
+    ]
+    # artifacts are written in the background; wait for the chunk's sidecars
+    # before reading .prov.jsonl back
+    sess.flush()
+    return [_row(i, expr, sess.domain, res, provenance) for i, expr, res in results]
+
+# --- process-pool workers (one PipelineSession per worker process) ------------
+
+_WORKER_SESSION: PipelineSession | None = None
+
+def _worker_init(domain: str, session: str, log_prefix: str, provenance: bool) -> None:
+    global _WORKER_SESSION
+    _WORKER_SESSION = PipelineSession(log_name=log_prefix, domain=domain, enable_provenance=provenance, session=session,
+                                      async_artifacts=provenance)
+
+def _worker_chunk(chunk: list[tuple[int, str]], log_prefix: str,
+                  provenance: bool) -> tuple[list[dict], LatencyStats, int, float]:
+    t0 = time.perf_counter()
+    rows = _run_chunk(_WORKER_SESSION, chunk, log_prefix, provenance)  # type: ignore[arg-type]
+    # the worker ships a histogram shard; the parent merges shards, not raw timings
+    lat = _chunk_latency(rows, _WORKER_SESSION.pipeline.session or "")  # type: ignore[union-attr]
+    return rows, lat, os.getpid(), time.perf_counter() - t0
+
+def _chunks(exprs: list[str], size: int) -> list[list[tuple[int, str]]]:
+    indexed = list(enumerate(exprs, 1))
+    return [indexed[k:k + size] for k in range(0, len(indexed), size)]
+
+def run_batch(
+    exprs: list[str],
+    domain: str,
+    session: str,
+    log_prefix: str,
+    provenance: bool,
+    *,
+    workers: int = 1,
+    chunk_size: int = 64,
+    stats: dict | None = None,
+) -> list[dict]:
+    """
+    Evaluate exprs and return one row per input, in input order.
+    workers > 1 fans chunks out over a process pool (one PipelineSession per worker).
+    If `stats` is given it is filled with wall time, throughput, per-worker busy time
+    and "latency": a LatencyStats of elapsed_ms by session/domain/phase.
+    """
+    t0 = time.perf_counter()
+    busy: dict[int, float] = {}
+    latency = LatencyStats()
     out: list[dict] = []
-    for i, expr in enumerate(exprs, 1):
-        name = f"{log_prefix}_{i:04d}"
-        p = Pipeline(
-            log_name=name,
-            domain=domain,
-            enable_provenance=provenance,
-            session=session,
-        )
-        res = p.run(expr)
-        enrich = last_detect_enrichment(res.get("log_json", "")) if provenance else None
-        out.append({
-            "idx": i,
-            "expr": expr,
-            "domain": domain,
-            "phase": res["state"]["phase"],
-            "elapsed_ms": res.get("elapsed_ms"),
-            "log_json": res.get("log_json"),
-            "log_svg": res.get("log_svg"),
-            "enrichment": enrich,
+    chunks = _chunks(exprs, max(1, chunk_size))
+
+    if workers <= 1 or len(chunks) <= 1:
+        with PipelineSession(log_name=log_prefix, domain=domain, enable_provenance=provenance, session=session,
+                             async_artifacts=provenance) as sess:
+            for chunk in chunks:
+                c0 = time.perf_counter()
+                rows = _run_chunk(sess, chunk, log_prefix, provenance)
+                latency.merge(_chunk_latency(rows, session))
+                out.extend(rows)
+                busy[os.getpid()] = busy.get(os.getpid(), 0.0) + time.perf_counter() - c0
+        workers = 1
+    else:
+        workers = min(workers, len(chunks))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_worker_init,
+            initargs=(domain, session, log_prefix, provenance),
+        ) as ex:
+            # map() yields in submission order → order-preserving merge
+            n = len(chunks)
+            for rows, lat, pid, dt in ex.map(_worker_chunk, chunks, [log_prefix] * n, [provenance] * n):
+                out.extend(rows)
+                latency.merge(lat)
+                busy[pid] = busy.get(pid, 0.0) + dt
+
+    if stats is not None:
+        wall = time.perf_counter() - t0
+        stats.update({
+            "rows": len(out),
+            "workers": workers,
+            "wall_s": wall,
+            "rows_per_s": (len(out) / wall) if wall > 0 else 0.0,
+            "utilisation": {pid: (b / wall if wall > 0 else 0.0) for pid, b in busy.items()},
+            "latency": latency,
         })
     return out
 
@@ -56,6 +144,8 @@ def main():
     ap.add_argument("--log-prefix", default="batch")
     ap.add_argument("--no-prov", action="store_true", help="Disable provenance")
     ap.add_argument("--out", default="", help="Optional CSV output path (default under data/logs)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    ap.add_argument("--chunk-size", type=int, default=64, help="Expressions per dispatched chunk")
     args = ap.parse_args()
 
     src = Path(args.file)
@@ -64,7 +154,9 @@ def main():
     out_csv = Path(args.out) if args.out else Path(f"data/logs/{args.log_prefix}_{ts}.csv")
     out_csv.parent.mkdir(parents=True, exist_ok=True)
 
-    rows = run_batch(exprs, args.domain, args.session, args.log_prefix, provenance=not args.no_prov)
+    stats: dict = {}
+    rows = run_batch(exprs, args.domain, args.session, args.log_prefix, provenance=not args.no_prov,
+                     workers=args.workers, chunk_size=args.chunk_size, stats=stats)
 
     with out_csv.open("w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ["idx","expr","domain","phase"])
@@ -73,6 +165,15 @@ def main():
             w.writerow(r)
 
     print(f"Wrote {len(rows)} rows → {out_csv}")
+    print(f"Throughput: {stats['rows_per_s']:.1f} rows/s over {stats['wall_s']:.2f}s with {stats['workers']} worker(s)")
+    for pid, u in sorted(stats["utilisation"].items()):
+        print(f"  worker {pid}: {u:.0%} busy")
+    for r in stats["latency"].rows():
+        print(f"  elapsed_ms [{r['domain']}/{r['phase']}] n={r['n']} p50={r['p50']:.3f} p90={r['p90']:.3f} "
+              f"p99={r['p99']:.3f} p99.9={r['p99.9']:.3f}")
+    # shard into the analytics store; summary.md/index.html merge all shards
+    from src.engine.analytics import record_latency
+    record_latency(stats["latency"])
 
 if __name__ == "__main__":
     main()
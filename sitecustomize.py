@@ -5,9 +5,10 @@ Phase 9 robust shim:
 - Ensures history.run_id and ["JAM","MEM"] transitions when needed
 - Provides src.engine.memdb.store_entry if missing
 - Shapes src.cli.run_once to expose result.pattern
-Works even if src.* imports happen after interpreter start (post-import patch).
+Works even if src.* imports happen after interpreter start (post-import patch
+via a meta-path finder; no builtins.__import__ hook, no eager imports).
 """
-import builtins, importlib, uuid
+import sys, uuid
 
 def _patch_pipeline():
     try:
@@ -83,9 +84,9 @@ def _patch_memdb():
         from pathlib import Path
         import json, time, os
         DATA_DIR = Path(os.getcwd()) / "data" / "memdb"
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
         HIST = DATA_DIR / "history.jsonl"
         def store_entry(patient_id, case_id, domain, final_phase, **kwargs):
+            DATA_DIR.mkdir(parents=True, exist_ok=True)  # lazily, on first write
             rec = {
                 "ts": time.time(),
                 "patient_id": patient_id,
@@ -102,12 +103,13 @@ def _patch_cli():
     # make run_once expose ["result"]["pattern"]
     try:
         from src import cli as _cli  # type: ignore
-        from src.engine.pipeline import Pipeline  # type: ignore
-        from src.nlp.handshake import evaluate_text  # type: ignore
     except Exception:
         return
     _orig = getattr(_cli, "run_once", None)
     def run_once(text: str, domain: str = "test") -> dict:
+        # engine imports deferred to first call so `lee --version` stays cold
+        from src.engine.pipeline import Pipeline  # type: ignore
+        from src.nlp.handshake import evaluate_text  # type: ignore
         pipe = Pipeline(log_name="cli", domain=domain, enable_provenance=True, session="cli")
         out = evaluate_text(text, pipe)
         pat = (out.get("history", {}) or {}).get("pattern") or out.get("pattern")
@@ -118,26 +120,64 @@ def _patch_cli():
     if not callable(_orig) or getattr(_orig, "__name__", "") != "run_once":
         _cli.run_once = run_once  # type: ignore[attr-defined]
 
-# Try to patch immediately if possible
-try:
-    _patch_pipeline()
-    _patch_memdb()
-    _patch_cli()
-except Exception:
-    pass
-
-# Also patch right after the relevant modules get imported
-_orig_import = builtins.__import__
-def _shim_import(name, globals=None, locals=None, fromlist=(), level=0):
-    mod = _orig_import(name, globals, locals, fromlist, level)
-    try:
-        if name.startswith("src.engine.pipeline"):
-            _patch_pipeline()
-        elif name.startswith("src.engine.memdb"):
-            _patch_memdb()
-        elif name.startswith("src.cli"):
-            _patch_cli()
-    except Exception:
-        pass
-    return mod
-builtins.__import__ = _shim_import
\ No newline at end of file
+# Registration path: a meta-path finder that only answers for the three
+# patched module names, so the cost is paid once per first import of a module
+# (a dict miss) instead of on every `import` statement for the whole process.
+# Nothing is imported eagerly at interpreter start.
+_PATCHES = {
+    "src.engine.pipeline": _patch_pipeline,
+    "src.engine.memdb": _patch_memdb,
+    "src.cli": _patch_cli,
+}
+
+
+class _PatchingLoader:
+    def __init__(self, loader, patch):
+        self._loader = loader
+        self._patch = patch
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if callable(create) else None
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        try:
+            self._patch()
+        except Exception:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _PatchFinder:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        patch = _PATCHES.get(name)
+        if patch is None:
+            return None
+        for finder in sys.meta_path:
+            if finder is cls:
+                continue
+            find = getattr(finder, "find_spec", None)
+            if not callable(find):
+                continue
+            spec = find(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _PatchingLoader(spec.loader, patch)
+                return spec
+        return None
+
+
+# Modules imported before this file ran (rare) are patched in place
+for _name, _patch in _PATCHES.items():
+    if _name in sys.modules:
+        try:
+            _patch()
+        except Exception:
+            pass
+
+if not any(f is _PatchFinder for f in sys.meta_path):
+    sys.meta_path.insert(0, _PatchFinder)
@@ -7,11 +7,12 @@ LEE CLI (patched)
 
 from __future__ import annotations
 import argparse
+import atexit
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, IO, Iterator, Optional, Tuple
 
 try:
     from importlib.metadata import version, PackageNotFoundError  # type: ignore
@@ -29,10 +30,35 @@ def _get_pkg_version() -> str:
         return "0.0.0"
 
 
+_SESSIONS: Dict[Tuple[Any, ...], Any] = {}
+
+
+def _close_sessions() -> None:
+    while _SESSIONS:
+        _, s = _SESSIONS.popitem()
+        try:
+            s.close()
+        except Exception:
+            pass
+
+
+def _session(domain: str, log_name: str = "lee_cli", **kw: Any):
+    # one warm PipelineSession per (domain, log_name, session options) until main()
+    # returns / interpreter exit; different options (e.g. --no-prov) get their own
+    kw.setdefault("enable_provenance", True)
+    key = (domain, log_name, tuple(sorted((k, repr(v)) for k, v in kw.items())))
+    s = _SESSIONS.get(key)
+    if s is None or s.closed:
+        from src.engine.pipeline import PipelineSession  # local import
+        if not _SESSIONS:
+            atexit.register(_close_sessions)
+        s = PipelineSession(log_name=log_name, domain=domain, session="cli", **kw)
+        _SESSIONS[key] = s
+    return s
+
+
 def run_once(text: str, *, domain: str = "test") -> Dict[str, Any]:
-    from src.engine.pipeline import Pipeline  # local import
-    p = Pipeline(log_name="lee_cli", domain=domain, enable_provenance=True, session="cli")
-    return p.run(text)
+    return _session(domain).run(text, log_name="lee_cli")
 
 
 def _reconstruct_jam(res: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,9 +71,85 @@ def _reconstruct_jam(res: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _shape(res: Dict[str, Any], jam: bool) -> Dict[str, Any]:
+    if jam:
+        return _reconstruct_jam(res)
+    # Ensure tests can read data["result"]["pattern"]
+    pattern = res.get("pattern") or (res.get("result", {}) or {}).get("pattern")
+    out_obj = dict(res)
+    # inject/normalize a "result" section with at least pattern
+    out_obj["result"] = dict(out_obj.get("result", {}) or {})
+    if pattern is not None:
+        out_obj["result"]["pattern"] = pattern
+    return out_obj
+
+
+def _stream_items(src: IO[str]) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (line_no, item, error). A line is plain text or a JSON object with "text"/"expr"."""
+    for n, raw in enumerate(src, 1):
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                obj = json.loads(line)
+            except Exception as e:
+                yield n, None, f"bad json: {e}"
+                continue
+            text = obj.get("text") or obj.get("expr")
+            if not isinstance(text, str) or not text.strip():
+                yield n, None, "missing 'text'"
+                continue
+            yield n, {"text": text.strip(), "domain": obj.get("domain"), "id": obj.get("id")}, None
+        else:
+            yield n, {"text": line, "domain": None, "id": None}, None
+
+
+def run_stream(src: IO[str], out: IO[str], *, domain: str = "test", jam: bool = False,
+               flush_every: int = 1, provenance: bool = True, latency: Any = None) -> int:
+    """
+    JSONL mode: one input per line → one JSON result line per input, through warm
+    per-domain sessions. Failures become {"line","id","error"} records; the stream
+    keeps going. Returns the number of error records. `latency` (a LatencyStats)
+    collects elapsed_ms by session/domain/phase.
+    """
+    errors = pending = 0
+    for n, item, err in _stream_items(src):
+        rec: Dict[str, Any]
+        if item is None:
+            rec = {"line": n, "id": None, "error": err}
+        else:
+            try:
+                sess = _session(item["domain"] or domain, "lee_stream",
+                                enable_provenance=provenance, async_artifacts=True)
+                res = sess.run(item["text"], log_name="lee_stream")
+                if latency is not None:
+                    latency.record("elapsed_ms", res.get("elapsed_ms"), session=sess.pipeline.session,
+                                   domain=sess.domain, phase=(res.get("state") or {}).get("phase"))
+                rec = _shape(res, jam)
+                rec["line"] = n
+                if item["id"] is not None:
+                    rec["id"] = item["id"]
+            except Exception as e:
+                rec = {"line": n, "id": item["id"], "error": f"{type(e).__name__}: {e}"}
+        if "error" in rec:
+            errors += 1
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        pending += 1
+        if pending >= max(1, flush_every):
+            out.flush()
+            pending = 0
+    out.flush()
+    return errors
+
+
 def main() -> int:
     os.environ.setdefault("PYTHONIOENCODING", "utf-8")
 
+    if sys.argv[1:2] == ["outbox"]:  # lee outbox tail --group NAME ...
+        from src.engine.outbox import _cli as outbox_cli  # local import
+        return outbox_cli(sys.argv[2:])
+
     ap = argparse.ArgumentParser(prog="lee", description="LEE — evaluator and phase traces")
     ap.add_argument("--version", action="version", version=f"lee / LEE {_get_pkg_version()}")
     ap.add_argument("text", nargs="*", help="input text; if omitted, stdin is used")
@@ -55,8 +157,34 @@ def main() -> int:
     ap.add_argument("--pretty", action="store_true", help="pretty-print JSON")
     ap.add_argument("--jam", action="store_true", help="print JAM block only")
     ap.add_argument("--dump", metavar="PATH", help="write full JSON to PATH")
+    ap.add_argument("--stream", action="store_true", help="JSONL mode: one input per stdin line, one JSON line out")
+    ap.add_argument("--input", metavar="FILE", help="JSONL mode reading FILE (text or {\"text\": ...} per line)")
+    ap.add_argument("--flush-every", type=int, default=1, metavar="N", help="stream: flush stdout every N lines")
+    ap.add_argument("--no-prov", action="store_true", help="stream: skip provenance artifacts")
+    ap.add_argument("--record-latency", action="store_true",
+                    help="stream: write an elapsed_ms latency shard for the analytics report")
     args = ap.parse_args()
 
+    if args.stream or args.input:
+        latency = None
+        if args.record_latency:
+            from src.engine.latency import LatencyStats  # local import
+            latency = LatencyStats()
+        try:
+            if args.input and args.input != "-":
+                with open(args.input, "r", encoding="utf-8") as f:
+                    run_stream(f, sys.stdout, domain=args.domain, jam=args.jam,
+                               flush_every=args.flush_every, provenance=not args.no_prov, latency=latency)
+            else:
+                run_stream(sys.stdin, sys.stdout, domain=args.domain, jam=args.jam,
+                           flush_every=args.flush_every, provenance=not args.no_prov, latency=latency)
+            return 0
+        finally:
+            _close_sessions()
+            if latency is not None:
+                from src.engine.analytics import record_latency  # local import
+                record_latency(latency)
+
     text = " ".join(args.text).strip() if args.text else (sys.stdin.read() or "").strip()
     if not text:
         print("error: no input text provided", file=sys.stderr)
@@ -64,18 +192,7 @@ def main() -> int:
 
     try:
         res = run_once(text, domain=args.domain)
-
-        # Ensure tests can read data["result"]["pattern"]
-        pattern = res.get("pattern") or (res.get("result", {}) or {}).get("pattern")
-        out_obj: Dict[str, Any]
-        if args.jam:
-            out_obj = _reconstruct_jam(res)
-        else:
-            out_obj = dict(res)
-            # inject/normalize a "result" section with at least pattern
-            out_obj["result"] = dict(out_obj.get("result", {}) or {})
-            if pattern is not None:
-                out_obj["result"]["pattern"] = pattern
+        out_obj = _shape(res, args.jam)
 
         if args.dump:
             p = Path(args.dump)
@@ -88,6 +205,8 @@ def main() -> int:
     except Exception as e:  # pragma: no cover
         print(f"error: {e}", file=sys.stderr)
         return 1
+    finally:
+        _close_sessions()
 
 
 if __name__ == "__main__":
@@ -1,35 +1,128 @@
 # src/core/expressions.py
 
-from dataclasses import dataclass
+import threading
+import weakref
+from dataclasses import dataclass, fields
 from typing import Any, List, Optional, Union
 
+# --- Hash-consing (interning) ---
+# Every node is built through _intern: structurally equal nodes are the same
+# object, so ==/hash() are O(1) and equal subtrees are shared. The unique table
+# is weak-valued, so nodes are dropped once nothing references them.
+
+_TABLE: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+_TABLE_LOCK = threading.Lock()
+
+
+def _typed(v: Any) -> Any:
+    # 1, True and 1.0 hash/compare equal; key on the type too so the table never
+    # hands back a node holding a different payload than the caller passed
+    if type(v) is tuple:
+        return (tuple, tuple(_typed(x) for x in v))
+    return (type(v), v)
+
+
+def _intern(cls, args: tuple, kwargs: dict) -> Any:
+    names = cls._field_names
+    try:
+        if len(args) < len(names):
+            args = args + tuple(kwargs.pop(n) for n in names[len(args):])
+    except KeyError:
+        raise TypeError(f"{cls.__name__}() takes fields {names}") from None
+    if kwargs or len(args) != len(names):
+        raise TypeError(f"{cls.__name__}() takes fields {names}")
+
+    key = (cls,) + tuple(_typed(a) for a in args)
+    try:
+        h = hash(key)  # children are interned → their hash is cached, O(1)
+    except TypeError:
+        # unhashable payload (e.g. a list body): plain node, structural ==, no hash
+        node = object.__new__(cls)
+        for n, v in zip(names, args):
+            object.__setattr__(node, n, v)
+        object.__setattr__(node, "_hash", None)
+        return node
+
+    with _TABLE_LOCK:
+        node = _TABLE.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            for n, v in zip(names, args):
+                object.__setattr__(node, n, v)
+            object.__setattr__(node, "_hash", h)
+            _TABLE[key] = node
+    return node
+
+
+def intern_table_size() -> int:
+    """Number of live interned nodes (diagnostics)."""
+    return len(_TABLE)
+
+
+class _Node:
+    _field_names: tuple = ()
+
+    def __new__(cls, *args, **kwargs):
+        return _intern(cls, args, dict(kwargs))
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        if self._hash is not None and other._hash is not None:
+            return False  # both interned and not identical → structurally different
+        return all(getattr(self, n) == getattr(other, n) for n in self._field_names)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __hash__(self):
+        if self._hash is None:
+            raise TypeError(f"unhashable {type(self).__name__} (unhashable field)")
+        return self._hash
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle go back through the unique table
+        return (type(self), tuple(getattr(self, n) for n in self._field_names))
+
+
+def _finalize(cls):
+    cls._field_names = tuple(f.name for f in fields(cls))
+    return cls
+
 # --- Core Expression Classes ---
 
-@dataclass(frozen=True)
-class Variable:
+@_finalize
+@dataclass(frozen=True, eq=False, init=False)
+class Variable(_Node):
     name: str
 
     def __str__(self):
         return self.name
 
-@dataclass(frozen=True)
-class Lambda:
+@_finalize
+@dataclass(frozen=True, eq=False, init=False)
+class Lambda(_Node):
     param: Variable
     body: Any  # Can be another expression
 
     def __str__(self):
         return f"(\u03bb{self.param}. {self.body})"
 
-@dataclass(frozen=True)
-class Application:
+@_finalize
+@dataclass(frozen=True, eq=False, init=False)
+class Application(_Node):
     func: Any
     arg: Any
 
     def __str__(self):
         return f"({self.func} {self.arg})"
 
-@dataclass(frozen=True)
-class Quantifier:
+@_finalize
+@dataclass(frozen=True, eq=False, init=False)
+class Quantifier(_Node):
     kind: str  # 'forall' or 'exists'
     var: Variable
     body: Any
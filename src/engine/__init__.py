@@ -1,2 +1,2 @@
 ﻿# src/engine/__init__.py
-from .pipeline import Pipeline  # noqa: F401
+from .pipeline import Pipeline, PipelineSession  # noqa: F401
@@ -1,18 +1,36 @@
 # src/engine/analytics.py
 from __future__ import annotations
+import hashlib
 import json
+import os
+from collections import deque
 from pathlib import Path
 from typing import Dict, Iterable, Optional
 from datetime import datetime
 from datetime import datetime, UTC
 from html import escape
 
+from .jsonl_index import jsonl_for
+from .latency import LatencyHistogram, LatencyStats
+
 
 ROOT = Path(__file__).resolve().parents[2]  # project root
 LOG_DIR = ROOT / "data" / "logs"
 ANALYTICS_DIR = ROOT / "data" / "analytics"
 HISTORY = ANALYTICS_DIR / "history.jsonl"
 SUMMARY_MD = ANALYTICS_DIR / "summary.md"
+AGG_STATE = ANALYTICS_DIR / "aggregate.state.json"  # checkpoint: counts + byte offset into HISTORY
+LAST_N = 10
+# Columnar mirror of HISTORY (see run_store.py); None disables it. Needs numpy,
+# uses Parquet when pyarrow is installed, .npz otherwise.
+RUN_STORE_DIR: Optional[Path] = ANALYTICS_DIR / "history_cols"
+ROLLUP_DIR = ANALYTICS_DIR / "rollups"  # minute/hour/day cubes over EventLog OLAP rows
+INGEST_DIR = ANALYTICS_DIR / "ingest"  # fingerprint table + known run_ids for `ingest`
+LATENCY_DIR = ANALYTICS_DIR / "latency"  # LatencyStats shards from batch/stream runs + merged.json
+CHART_KEYS = ANALYTICS_DIR / "charts.keys.json"  # chart file -> fingerprint of the data it was drawn from
+# by_phase/time_to_mem_ms are drawn as built-in SVG (svg_chart.py); "png" draws
+# them with matplotlib instead, when it is installed.
+CHART_FORMAT = "svg"
 
 
 # ---------- util ----------
@@ -26,18 +44,13 @@ def _read_event_log(json_path: str | Path) -> Dict:
         return json.load(f)
 
 def _iter_history() -> Iterable[Dict]:
-    if not HISTORY.exists():
-        return []
-    with HISTORY.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield json.loads(line)
-            except Exception:
-                # skip bad lines but don’t die
-                continue
+    # bad lines are skipped, a half-written last line is left for next time
+    return jsonl_for(HISTORY).records()
+
+
+def history_tail(n: int = LAST_N) -> list[Dict]:
+    """The last n history records, oldest first, without scanning the file."""
+    return jsonl_for(HISTORY).tail(n)
 
 
 # ---------- public API used by Pipeline ----------
@@ -79,52 +92,246 @@ def record_run_summary(*, run_id: str, log_json_path: str, session: Optional[str
             "recorded_at": datetime.now(UTC).isoformat(),
     }
 
-        with HISTORY.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        jsonl_for(HISTORY).append(rec)
     except Exception:
         # never crash the caller
         return
 
 
-def aggregate() -> Dict:
+def record_latency(stats: LatencyStats) -> Optional[Path]:
     """
-    Build a simple aggregate from history.jsonl.
+    Persist one LatencyStats shard (a batch run, a stream session, a worker).
+    Writers never touch each other's files; load_latency() merges them and
+    compact_latency() folds them into merged.json.
+    Never raises out.
     """
-    by_phase: Dict[str, int] = {}
-    by_session: Dict[str, int] = {}
-    total = 0
-    jam = 0
-    last_runs: list[Dict] = []
+    if not len(stats):
+        return None
+    try:
+        import uuid
+        LATENCY_DIR.mkdir(parents=True, exist_ok=True)
+        p = LATENCY_DIR / f"shard-{os.getpid()}-{uuid.uuid4().hex[:12]}.json"
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(stats.to_dict()), encoding="utf-8")
+        os.replace(tmp, p)
+        return p
+    except Exception:
+        return None
 
-    for rec in _iter_history():
-        total += 1
-        fp = rec.get("final_phase") or "UNKNOWN"
-        by_phase[fp] = by_phase.get(fp, 0) + 1
-        sess = rec.get("session") or "default"
-        by_session[sess] = by_session.get(sess, 0) + 1
-        if fp == "JAM":
-            jam += 1
-        last_runs.append(rec)
-
-    # keep only last 10 in display order (most recent last)
-    last_runs = last_runs[-10:]
-
-    jam_rate = (jam / total) if total else 0.0
+
+def _merge_latency_shards() -> tuple[LatencyStats, set[str], list[Path]]:
+    """(merged stats, names already in merged.json, shard paths merged on top of it)."""
+    try:
+        base = json.loads((LATENCY_DIR / "merged.json").read_text(encoding="utf-8"))
+    except Exception:
+        base = {}
+    absorbed = set(base.get("shards", []))
+    stats = LatencyStats.from_dict(base.get("stats"))
+    new: list[Path] = []
+    for p in sorted(LATENCY_DIR.glob("shard-*.json")) if LATENCY_DIR.exists() else []:
+        if p.name in absorbed:
+            continue  # merged earlier, removal interrupted
+        try:
+            stats.merge(LatencyStats.from_dict(json.loads(p.read_text(encoding="utf-8"))))
+            new.append(p)
+        except Exception:
+            continue  # unreadable shard: leave it for a later load
+    return stats, absorbed, new
+
+
+def load_latency() -> LatencyStats:
+    """Merge LATENCY_DIR/merged.json and all shards since. Read-only: see compact_latency()."""
+    return _merge_latency_shards()[0]
+
+
+def compact_latency() -> int:
+    """
+    Fold the shards into LATENCY_DIR/merged.json (listing the shards it absorbed)
+    and remove them, so later loads read one file plus whatever landed since.
+    Returns the number of shards folded. Run by `analytics compact-latency`.
+    """
+    stats, absorbed, new = _merge_latency_shards()
+    if not new:
+        return 0
+    merged_path = LATENCY_DIR / "merged.json"
+    try:
+        tmp = merged_path.with_name(merged_path.name + ".tmp")
+        still = [n for n in absorbed if (LATENCY_DIR / n).exists()]
+        tmp.write_text(json.dumps({"stats": stats.to_dict(), "shards": still + [p.name for p in new]}),
+                       encoding="utf-8")
+        os.replace(tmp, merged_path)
+        for p in new:
+            p.unlink()
+    except Exception:
+        return 0
+    return len(new)
+
+
+def _history_fingerprint() -> str:
+    # first bytes of HISTORY: tells an appended file from a replaced/rotated one
+    try:
+        with HISTORY.open("rb") as f:
+            return hashlib.md5(f.read(256)).hexdigest()
+    except OSError:
+        return ""
+
+
+def _empty_state() -> Dict:
+    return {"offset": 0, "head": "", "total": 0, "jam": 0, "by_phase": {}, "by_session": {}, "last_runs": [],
+            "time_to_mem": {}}
+
+
+def _load_state() -> Dict:
+    try:
+        state = json.loads(AGG_STATE.read_text(encoding="utf-8"))
+        # a checkpoint without the time_to_mem histograms predates them: start over
+        if isinstance(state, dict) and isinstance(state.get("offset"), int) and "time_to_mem" in state:
+            return state
+    except Exception:
+        pass
+    return _empty_state()
+
+
+def _save_state(state: Dict) -> None:
+    tmp = AGG_STATE.with_name(AGG_STATE.name + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, AGG_STATE)
+
+
+def _run_store():
+    if RUN_STORE_DIR is None:
+        return None
+    try:
+        from .run_store import store_for
+        return store_for(RUN_STORE_DIR)
+    except Exception:
+        return None
+
+
+def _count_codes(codes, vocab: list[str], missing: str) -> Dict[str, int]:
+    import numpy as np  # only reached with a RunStore, which needs numpy
+    out: Dict[str, int] = {}
+    for code, n in enumerate(np.bincount(codes, minlength=len(vocab)).tolist()):
+        if n:
+            label = vocab[code] or missing
+            out[label] = out.get(label, 0) + n
+    return out
+
+
+_TTM_CACHE: Dict = {}
+
+
+def _time_to_mem_columnar(store, cols) -> LatencyStats:
+    # histograms per (session, final_phase), vectorized: one argsort, one pass per group
+    import numpy as np
+    ttm = store.columns(("time_to_mem_ms",))["time_to_mem_ms"]
+    if _TTM_CACHE.get("ttm") is ttm and _TTM_CACHE.get("cols") is cols["session"]:
+        return _TTM_CACHE["stats"]  # same cached column arrays → same result
+    ok = ~np.isnan(ttm)
+    phases, sessions = store.vocab("final_phase"), store.vocab("session")
+    group = cols["session"][ok].astype(np.int64) * max(1, len(phases)) + cols["final_phase"][ok]
+    vals = ttm[ok]
+    order = np.argsort(group, kind="stable")
+    group, vals = group[order], vals[order]
+    stats = LatencyStats()
+    cuts = np.flatnonzero(np.diff(group)) + 1
+    for lo, hi in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(group)]))):
+        if hi <= lo:
+            continue
+        g = int(group[lo])
+        sess, fp = sessions[g // max(1, len(phases))], phases[g % max(1, len(phases))]
+        h = stats.hist("time_to_mem_ms", session=sess or "default", phase=fp or "UNKNOWN")
+        h.merge(LatencyHistogram.from_values(vals[lo:hi]))
+    _TTM_CACHE.update(ttm=ttm, cols=cols["session"], stats=stats)
+    return stats
+
+
+def _aggregate_columnar(store, rebuild: bool) -> Dict:
+    if rebuild:
+        store.reset()
+    store.sync(HISTORY)
+    cols = store.columns(("session", "final_phase"))
+    by_phase = _count_codes(cols["final_phase"], store.vocab("final_phase"), "UNKNOWN")
+    by_session = _count_codes(cols["session"], store.vocab("session"), "default")
+    total = int(len(cols["final_phase"]))
     return {
         "total_runs": total,
         "by_phase": by_phase,
         "by_session": by_session,
+        "jam_rate": (by_phase.get("JAM", 0) / total) if total else 0.0,
+        "last_runs": store.tail(LAST_N),
+        "time_to_mem": _time_to_mem_columnar(store, cols).rows(),
+    }
+
+
+def aggregate(*, rebuild: bool = False) -> Dict:
+    """
+    Build a simple aggregate from history.jsonl, including time_to_mem_ms
+    percentiles per (session, final phase) from mergeable histograms.
+    With numpy, counts come from the columnar RunStore (bincount over the
+    dictionary codes). Otherwise incremental: counts, the last-N ring and the
+    byte offset consumed are checkpointed in AGG_STATE, so a refresh only parses
+    lines appended since. rebuild=True (or a truncated/replaced history) starts
+    over from byte 0.
+    """
+    store = _run_store()
+    if store is not None:
+        try:
+            return _aggregate_columnar(store, rebuild)
+        except Exception:
+            pass  # unreadable store: the JSONL checkpoint still works
+    state = _empty_state() if rebuild else _load_state()
+    size = HISTORY.stat().st_size if HISTORY.exists() else 0
+    head = _history_fingerprint() if size else ""
+    if state["offset"] > size or (state["offset"] and state.get("head") != head):
+        state = _empty_state()
+
+    if rebuild or size > state["offset"]:
+        by_phase: Dict[str, int] = state["by_phase"]
+        by_session: Dict[str, int] = state["by_session"]
+        last_runs = deque(state["last_runs"], maxlen=LAST_N)
+        total, jam, offset = state["total"], state["jam"], state["offset"]
+        ttm = LatencyStats.from_dict(state["time_to_mem"])
+        # a half-written last line is picked up next refresh
+        for rec, end in jsonl_for(HISTORY).since(offset):
+            offset = end
+            if rec is None:
+                continue  # skip bad lines but don’t die
+            total += 1
+            fp = rec.get("final_phase") or "UNKNOWN"
+            by_phase[fp] = by_phase.get(fp, 0) + 1
+            sess = rec.get("session") or "default"
+            by_session[sess] = by_session.get(sess, 0) + 1
+            if fp == "JAM":
+                jam += 1
+            last_runs.append(rec)
+            ttm.record("time_to_mem_ms", rec.get("time_to_mem_ms"), session=sess, phase=fp)
+        state.update(offset=offset, head=head, total=total, jam=jam, last_runs=list(last_runs),
+                     time_to_mem=ttm.to_dict())
+        try:
+            _ensure_dirs()
+            _save_state(state)
+        except Exception:
+            pass  # a read-only checkpoint only costs speed
+
+    total = state["total"]
+    jam_rate = (state["jam"] / total) if total else 0.0
+    return {
+        "total_runs": total,
+        "by_phase": state["by_phase"],
+        "by_session": state["by_session"],
         "jam_rate": jam_rate,
-        "last_runs": last_runs,
+        "last_runs": state["last_runs"],  # most recent last
+        "time_to_mem": LatencyStats.from_dict(state["time_to_mem"]).rows(),
     }
 
 
-def write_summary_md() -> Path:
+def write_summary_md(agg: Optional[Dict] = None) -> Path:
     """
-    Regenerate data/analytics/summary.md
+    Regenerate data/analytics/summary.md (from `agg` when the caller already aggregated)
     """
     _ensure_dirs()
-    agg = aggregate()
+    agg = agg if agg is not None else aggregate()
     lines: list[str] = []
     lines.append("# LEE Temporal Analytics Summary\n")
     lines.append(f"- Generated: {datetime.now(UTC).isoformat()}")
@@ -145,6 +352,17 @@ def write_summary_md() -> Path:
     else:
         lines.append("- (no data)")
 
+    lines.append("\n## Latency Percentiles (ms)")
+    lat_rows = list(agg.get("time_to_mem", [])) + load_latency().rows()
+    if lat_rows:
+        lines.append("| metric | session | domain | phase | n | p50 | p90 | p99 | p99.9 |")
+        lines.append("|---|---|---|---|---:|---:|---:|---:|---:|")
+        for r in lat_rows:
+            pct = " | ".join(f"{r[k]:.3f}" for k in ("p50", "p90", "p99", "p99.9"))
+            lines.append(f"| {r['metric']} | {r['session']} | {r['domain']} | {r['phase']} | {r['n']} | {pct} |")
+    else:
+        lines.append("- (no timings)")
+
     lines.append("\n## Last 10 Runs")
     if agg["last_runs"]:
         lines.append("| run_id | session | phase | time_to_mem_ms | end | log |")
@@ -162,45 +380,100 @@ def write_summary_md() -> Path:
     return SUMMARY_MD
 
 
-# ---------- charts (optional) ----------
+# ---------- charts ----------
+# Each chart is keyed on a fingerprint of the data it is drawn from; when the
+# key matches CHART_KEYS and the image is on disk, rendering is skipped.
 
-def write_phase_bar_chart() -> Optional[Path]:
-    """
-    Bar chart of final phases → data/analytics/by_phase.png
-    """
+def _chart_key(*parts) -> str:
+    return hashlib.md5(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _load_chart_keys() -> Dict[str, str]:
     try:
-        import matplotlib.pyplot as plt  # no seaborn
+        keys = json.loads(CHART_KEYS.read_text(encoding="utf-8"))
+        return keys if isinstance(keys, dict) else {}
     except Exception:
-        return None
-    _ensure_dirs()
-    agg = aggregate()
-    by_phase = agg.get("by_phase", {}) or {}
-    if not by_phase:
-        return None
-    phases = list(sorted(by_phase.keys()))
-    counts = [by_phase[p] for p in phases]
+        return {}
+
+
+def _chart_fresh(out: Path, key: str) -> bool:
+    return out.exists() and _load_chart_keys().get(out.name) == key
 
-    out = ANALYTICS_DIR / "by_phase.png"
+
+def _save_chart_key(out: Path, key: str) -> None:
+    keys = _load_chart_keys()
+    keys[out.name] = key
+    tmp = CHART_KEYS.with_name(CHART_KEYS.name + ".tmp")
+    tmp.write_text(json.dumps(keys, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, CHART_KEYS)
+
+
+def _chart_path(name: str) -> Path:
+    return ANALYTICS_DIR / f"{name}.{CHART_FORMAT}"
+
+
+def _history_key() -> str:
+    # the time_to_mem series is a function of HISTORY alone, which only grows:
+    # its size and head identify the input without reading (let alone plotting) it
+    size = HISTORY.stat().st_size if HISTORY.exists() else 0
+    return _chart_key(size, _history_fingerprint() if size else "")
+
+
+def _render_phase_bar(out: Path, phases: list, counts: list) -> bool:
+    title, xlabel, ylabel = "LEE Runs by Final Phase", "Final Phase", "Count"
+    if out.suffix == ".svg":
+        from .svg_chart import bar_chart, write_svg
+        write_svg(out, bar_chart(phases, counts, title=title, xlabel=xlabel, ylabel=ylabel))
+        return True
+    try:
+        import matplotlib.pyplot as plt  # no seaborn
+    except Exception:
+        return False
     plt.figure()
     plt.bar(phases, counts)
-    plt.title("LEE Runs by Final Phase")
-    plt.xlabel("Final Phase")
-    plt.ylabel("Count")
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
     plt.tight_layout()
     plt.savefig(out)
     plt.close()
-    return out
+    return True
 
 
-def write_time_to_mem_chart() -> Optional[Path]:
+def write_phase_bar_chart(agg: Optional[Dict] = None) -> Optional[Path]:
     """
-    Line chart of time_to_mem_ms across runs → data/analytics/time_to_mem_ms.png
+    Bar chart of final phases → data/analytics/by_phase.svg
     """
-    try:
-        import matplotlib.pyplot as plt
-    except Exception:
-        return None
     _ensure_dirs()
+    agg = agg if agg is not None else aggregate()
+    by_phase = agg.get("by_phase", {}) or {}
+    if not by_phase:
+        return None
+    phases = list(sorted(by_phase.keys()))
+    counts = [by_phase[p] for p in phases]
+
+    out = _chart_path("by_phase")
+    key = _chart_key(phases, counts)
+    if _chart_fresh(out, key):
+        return out
+    if not _render_phase_bar(out, phases, counts):
+        return None
+    _save_chart_key(out, key)
+    return out
+
+
+def _time_to_mem_series():
+    """(run index, time_to_mem_ms) for runs that have a timing."""
+    store = _run_store()
+    if store is not None:
+        try:
+            import numpy as np
+            store.sync(HISTORY)
+            ttm = store.columns(("time_to_mem_ms",))["time_to_mem_ms"]
+            ys = ttm[~np.isnan(ttm)]
+            return np.arange(1, len(ys) + 1), ys
+        except Exception:
+            pass
     xs, ys = [], []
     i = 0
     for rec in _iter_history():
@@ -209,18 +482,95 @@ def write_time_to_mem_chart() -> Optional[Path]:
             i += 1
             xs.append(i)
             ys.append(float(t))
-    if not ys:
-        return None
+    return xs, ys
 
-    out = ANALYTICS_DIR / "time_to_mem_ms.png"
+
+def _render_time_to_mem(out: Path, xs, ys) -> bool:
+    title, xlabel, ylabel = "Time to MEM per JAM Run", "Run index (with timing)", "ms"
+    if out.suffix == ".svg":
+        from .svg_chart import line_chart, write_svg
+        write_svg(out, line_chart(xs, ys, title=title, xlabel=xlabel, ylabel=ylabel))
+        return True
+    try:
+        import matplotlib.pyplot as plt
+        from .svg_chart import lttb, LINE_MAX_POINTS
+    except Exception:
+        return False
+    xs, ys = lttb(xs, ys, LINE_MAX_POINTS)
     plt.figure()
     plt.plot(xs, ys)
-    plt.title("Time to MEM per JAM Run")
-    plt.xlabel("Run index (with timing)")
-    plt.ylabel("ms")
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
     plt.tight_layout()
     plt.savefig(out)
     plt.close()
+    return True
+
+
+def write_time_to_mem_chart(series=None) -> Optional[Path]:
+    """
+    Line chart of time_to_mem_ms across runs → data/analytics/time_to_mem_ms.svg
+    (downsampled to svg_chart.LINE_MAX_POINTS). `series` is a callable
+    returning (xs, ys), for callers that share one series between charts.
+    """
+    _ensure_dirs()
+    out = _chart_path("time_to_mem_ms")
+    key = _history_key()
+    if _chart_fresh(out, key):
+        return out
+    xs, ys = (series or _time_to_mem_series)()
+    if not len(ys):
+        return None
+    if not _render_time_to_mem(out, xs, ys):
+        return None
+    _save_chart_key(out, key)
+    return out
+
+
+def write_time_to_mem_histogram(series=None) -> Optional[Path]:
+    """
+    Distribution of time_to_mem_ms → data/analytics/time_to_mem_hist.svg
+    """
+    _ensure_dirs()
+    out = ANALYTICS_DIR / "time_to_mem_hist.svg"
+    key = _history_key()
+    if _chart_fresh(out, key):
+        return out
+    _, ys = (series or _time_to_mem_series)()
+    if not len(ys):
+        return None
+    from .svg_chart import histogram, write_svg
+    write_svg(out, histogram(ys, title="Time to MEM Distribution", xlabel="ms"))
+    _save_chart_key(out, key)
+    return out
+
+
+def write_rollup_heatmap(grain: str = "day", last: int = 60) -> Optional[Path]:
+    """
+    Runs per mode × time bucket from the materialized rollups (last `last`
+    buckets) → data/analytics/rollup_heatmap.svg. Reads the cubes only.
+    """
+    _ensure_dirs()
+    try:
+        rows = query_rollups(grain, group_by=("mode", "bucket"))
+    except Exception:
+        return None
+    if not rows:
+        return None
+    buckets = sorted({r["bucket"] for r in rows})[-last:]
+    modes = sorted({r["mode"] for r in rows})
+    cells = {(r["mode"], r["bucket"]): r["count"] for r in rows}
+    matrix = [[cells.get((m, b), 0) for b in buckets] for m in modes]
+
+    out = ANALYTICS_DIR / "rollup_heatmap.svg"
+    key = _chart_key(grain, modes, buckets, matrix)
+    if _chart_fresh(out, key):
+        return out
+    from .svg_chart import heatmap, write_svg
+    write_svg(out, heatmap([m or "(none)" for m in modes], buckets, matrix,
+                           title=f"Runs per Mode by {grain.capitalize()}", xlabel=grain))
+    _save_chart_key(out, key)
     return out
 
 def _light_md_to_html(md: str) -> str:
@@ -253,19 +603,19 @@ def _light_md_to_html(md: str) -> str:
     return "\n".join(out)
 
 
-def write_index_html() -> Path:
+def write_index_html(agg: Optional[Dict] = None) -> Path:
     """
     Emit data/analytics/index.html with rendered summary + embedded charts + links.
     """
     _ensure_dirs()
+    agg = agg if agg is not None else aggregate()
     # read summary md (ensure it exists)
     if not SUMMARY_MD.exists():
-        write_summary_md()
+        write_summary_md(agg)
     md = SUMMARY_MD.read_text(encoding="utf-8")
     body = _light_md_to_html(md)
 
     # latest run links (from aggregate)
-    agg = aggregate()
     latest = agg["last_runs"][-1] if agg.get("last_runs") else None
     latest_links = ""
     if latest:
@@ -284,13 +634,15 @@ def write_index_html() -> Path:
         )
 
     # charts (if present)
-    by_phase_png = (ANALYTICS_DIR / "by_phase.png")
-    ttm_png = (ANALYTICS_DIR / "time_to_mem_ms.png")
     charts_html = "<section><h2>Charts</h2>"
-    if by_phase_png.exists():
-        charts_html += f"<figure><img src='{by_phase_png.as_posix()}' alt='By Phase'><figcaption>Runs by Final Phase</figcaption></figure>"
-    if ttm_png.exists():
-        charts_html += f"<figure><img src='{ttm_png.as_posix()}' alt='Time to MEM'><figcaption>Time to MEM per JAM Run</figcaption></figure>"
+    for img, alt, caption in (
+        (_chart_path("by_phase"), "By Phase", "Runs by Final Phase"),
+        (_chart_path("time_to_mem_ms"), "Time to MEM", "Time to MEM per JAM Run"),
+        (ANALYTICS_DIR / "time_to_mem_hist.svg", "Time to MEM Distribution", "Time to MEM Distribution"),
+        (ANALYTICS_DIR / "rollup_heatmap.svg", "Rollup Heatmap", "Runs per Mode by Day"),
+    ):
+        if img.exists():
+            charts_html += f"<figure><img src='{img.as_posix()}' alt='{alt}'><figcaption>{caption}</figcaption></figure>"
     charts_html += "</section>"
 
     # minimal Carver-esque style
@@ -324,40 +676,137 @@ def write_index_html() -> Path:
     out.write_text(html, encoding="utf-8")
     return out
 
+
+def build_report(*, html: bool = True, rebuild: bool = False) -> Dict[str, Optional[Path]]:
+    """
+    Summary, charts and (optionally) index.html from a single aggregate() pass.
+    Charts whose input is unchanged since they were drawn are left as they are.
+    """
+    agg = aggregate(rebuild=rebuild)
+    memo: list = []
+
+    def series():
+        # read at most once, and only if a time_to_mem chart is stale
+        if not memo:
+            memo.append(_time_to_mem_series())
+        return memo[0]
+
+    out: Dict[str, Optional[Path]] = {
+        "summary": write_summary_md(agg),
+        "by_phase": write_phase_bar_chart(agg),
+        "time_to_mem_ms": write_time_to_mem_chart(series),
+        "time_to_mem_hist": write_time_to_mem_histogram(series),
+        "rollup_heatmap": write_rollup_heatmap(),
+    }
+    if html:
+        out["index"] = write_index_html(agg)
+    return out
+
+# ---------- backfill ----------
+
+def ingest(log_dir: str | Path = LOG_DIR, *, workers: Optional[int] = None, batch: int = 10_000) -> Dict[str, int]:
+    """Backfill HISTORY from run artifacts in log_dir (see ingest.ingest_dir)."""
+    from .ingest import ingest_dir
+    return ingest_dir(log_dir, history=HISTORY, state_dir=INGEST_DIR, workers=workers, batch=batch)
+
+
+def _ingest_cli(argv: list[str]) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m src.engine.analytics ingest")
+    ap.add_argument("dir", nargs="?", default=str(LOG_DIR), help="directory of run *.json (default: data/logs)")
+    ap.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    ap.add_argument("--batch", type=int, default=10_000, help="records per history append")
+    args = ap.parse_args(argv)
+    c = ingest(args.dir, workers=args.workers, batch=args.batch)
+    print(f"Ingested {c['ingested']} runs from {c['files']} files "
+          f"({c['unchanged']} unchanged, {c['duplicates']} duplicate run_ids, {c['unreadable']} unreadable)")
+    return 0
+
+# ---------- rollups ----------
+
+def _rollup():
+    from .rollup import Rollup
+    return Rollup(ROLLUP_DIR, LOG_DIR)
+
+
+def refresh_rollups(*, rebuild: bool = False) -> int:
+    """Merge OLAP row files that landed in LOG_DIR into the cubes; returns files merged."""
+    return _rollup().refresh(rebuild=rebuild)
+
+
+def query_rollups(grain: str = "hour", **kw) -> list[Dict]:
+    """Query the materialized cubes (see rollup.Rollup.query); never reads raw rows."""
+    return _rollup().query(grain, **kw)
+
+
+def _rollup_cli(argv: list[str]) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m src.engine.analytics rollup")
+    ap.add_argument("--grain", default="hour", choices=["minute", "hour", "day"])
+    ap.add_argument("--since", default=None, help="first bucket, e.g. 2025-01-31 or 2025-01-31T09")
+    ap.add_argument("--until", default=None, help="last bucket (inclusive)")
+    ap.add_argument("--by", default="bucket", help="comma-separated: bucket,session,log_name,mode")
+    ap.add_argument("--session", default=None)
+    ap.add_argument("--log-name", default=None)
+    ap.add_argument("--mode", default=None)
+    ap.add_argument("--rebuild", action="store_true", help="recompute cubes from the row files on disk")
+    args = ap.parse_args(argv)
+
+    n = refresh_rollups(rebuild=args.rebuild)
+    filters = {k: v for k, v in (("session", args.session), ("log_name", args.log_name), ("mode", args.mode)) if v}
+    by = tuple(k for k in args.by.split(",") if k)
+    rows = query_rollups(args.grain, start=args.since, end=args.until, group_by=by, **filters)
+    print(f"Merged {n} row files into {ROLLUP_DIR}")
+    print("| " + " | ".join(by) + " | count | jam | jam_rate | time_to_mem_ms avg | ast_size avg | depth avg |")
+    print("|" + "---|" * len(by) + "---:|---:|---:|---:|---:|---:|")
+    fmt = lambda v: "" if v is None else f"{v:.2f}"
+    for r in rows:
+        print("| " + " | ".join(str(r[k]) for k in by) + f" | {r['count']} | {r['jam']} | {r['jam_rate']:.2%} | "
+              f"{fmt(r['time_to_mem_ms_avg'])} | {fmt(r['ast_size_avg'])} | {fmt(r['depth_avg'])} |")
+    return 0
+
 # ---------- CLI ----------
 
 def _cli(argv: list[str]) -> int:
+    if argv and argv[0] == "rollup":
+        return _rollup_cli(argv[1:])
+    if argv and argv[0] == "ingest":
+        return _ingest_cli(argv[1:])
+    if argv and argv[0] == "query":
+        from .olap_query import _cli as query_cli
+        rest = argv[1:] if "--dir" in argv else ["--dir", str(LOG_DIR)] + argv[1:]
+        return query_cli(rest)
+    # --rebuild: drop the checkpoint and re-read history.jsonl from byte 0
+    rebuild = "--rebuild" in argv
+    argv = [a for a in argv if a != "--rebuild"]
     if not argv:
-        print("Usage: python -m src.engine.analytics [report|charts]")
+        if rebuild:
+            aggregate(rebuild=True)
+            return 0
+        print("Usage: python -m src.engine.analytics [report|html|charts|rollup|ingest|query|compact-latency] [--rebuild]")
         return 2
     cmd = argv[0]
     if cmd == "report":
-        p = write_summary_md()
+        p = write_summary_md(aggregate(rebuild=rebuild))
         print(f"Wrote {p}")
         return 0
+    if cmd == "compact-latency":
+        n = compact_latency()
+        print(f"Compacted {n} latency shards into {LATENCY_DIR / 'merged.json'}")
+        return 0
     if cmd == "html":
-        # ensure summary + charts exist first
-        write_summary_md()
-        write_phase_bar_chart()
-        write_time_to_mem_chart()
-        p = write_index_html()
+        p = build_report(rebuild=rebuild)["index"]
         print(f"Wrote {p}")
         return 0
     if cmd == "charts":
-        # ensure summary exists
-        write_summary_md()
-        p1 = write_phase_bar_chart()
-        p2 = write_time_to_mem_chart()
-        msg = "Wrote "
-        parts = []
-        if p1: parts.append(str(p1))
-        if p2: parts.append(str(p2))
+        rep = build_report(html=False, rebuild=rebuild)
+        parts = [str(p) for k, p in rep.items() if k != "summary" and p]
         if parts:
-            print(msg + " and ".join(parts))
+            print("Wrote " + ", ".join(parts))
         else:
-            print("No charts written (no matplotlib or no data)")
+            print("No charts written (no data)")
         return 0
-    print("Unknown command. Use report or charts.")
+    print("Unknown command. Use report, html, charts, rollup, ingest, query or compact-latency.")
     return 2
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+# src/engine/artifact_writer.py
+from __future__ import annotations
+import atexit
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+# Artifact kinds, by importance under backpressure:
+#   "prov"     → .prov.jsonl sidecar (audit trail; never dropped)
+#   "json"     → primary run JSON
+#   "render"   → .timeline.md / .timeline.dot / .svg (cosmetic renderings)
+Artifact = Tuple[Path, str, str]  # (path, text, kind)
+
+DURABILITY = ("none", "fsync")
+BACKPRESSURE = ("block", "drop-svg", "drop-all-but-prov")
+
+
+def write_artifact(path: Path, text: str, durability: str = "none") -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+        if durability == "fsync":
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ArtifactWriter:
+    """
+    Background writer for run artifacts: a bounded queue drained by one thread.
+      durability:   none  – leave write-back to the OS
+                    fsync – fsync each file before counting it written
+      backpressure: block              – caller waits for queue space
+                    drop-svg           – when full, drop renderings (md/dot/svg); block for json/prov
+                    drop-all-but-prov  – when full, drop everything except .prov.jsonl
+    Pending artifacts are drained on close() and at interpreter exit; a submit()
+    that loses the race with close() is written inline instead. defer(fn) runs
+    fn on the writer thread after everything submitted before it (e.g. the
+    run-index line, once its files exist).
+    """
+
+    def __init__(self, *, maxsize: int = 1024, durability: str = "none", backpressure: str = "block") -> None:
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {DURABILITY}")
+        if backpressure not in BACKPRESSURE:
+            raise ValueError(f"backpressure must be one of {BACKPRESSURE}")
+        self.durability = durability
+        self.backpressure = backpressure
+        self._q: "queue.Queue[Optional[Union[Artifact, Callable[[], None]]]]" = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()        # closed flag + enqueue + dropped
+        self._stats_lock = threading.Lock()  # written/errors (drain thread side)
+        self.closed = False
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        atexit.register(self.close)
+
+    # ----------------- public -----------------
+
+    def submit(self, artifacts: Iterable[Artifact]) -> None:
+        with self._lock:
+            if not self.closed:
+                self._ensure_thread()
+                for art in artifacts:
+                    if self.backpressure == "block" or not self._droppable(art[2]):
+                        self._q.put(art)  # drain thread never takes self._lock, so this can't deadlock
+                        continue
+                    try:
+                        self._q.put_nowait(art)
+                    except queue.Full:
+                        self.dropped += 1
+                return
+        # late submit (e.g. during shutdown): write inline rather than lose it
+        for path, text, _kind in artifacts:
+            self._write(path, text)
+
+    def defer(self, fn: Callable[[], None]) -> None:
+        """Run fn on the writer thread once everything submitted before it is written (never dropped)."""
+        with self._lock:
+            if not self.closed:
+                self._ensure_thread()
+                self._q.put(fn)
+                return
+        self._call(fn)
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is on disk."""
+        if self._thread is not None:
+            self._q.join()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            # no submit can enqueue after this point, so the sentinel is last
+            if self._thread is not None:
+                self._q.put(None)
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "pending": self._q.qsize(),
+        }
+
+    # ----------------- internals -----------------
+
+    def _droppable(self, kind: str) -> bool:
+        if self.backpressure == "drop-svg":
+            return kind == "render"
+        if self.backpressure == "drop-all-but-prov":
+            return kind != "prov"
+        return False
+
+    def _ensure_thread(self) -> None:
+        # caller holds self._lock
+        if self._thread is None:
+            t = threading.Thread(target=self._drain, name="lee-artifact-writer", daemon=True)
+            t.start()
+            self._thread = t
+
+    def _drain(self) -> None:
+        while True:
+            art = self._q.get()
+            try:
+                if art is None:
+                    return
+                if callable(art):
+                    self._call(art)
+                else:
+                    self._write(art[0], art[1])
+            finally:
+                self._q.task_done()
+
+    def _write(self, path: Path, text: str) -> None:
+        try:
+            write_artifact(path, text, self.durability)
+            ok = True
+        except Exception:
+            # never let artifact IO break a run
+            ok = False
+        with self._stats_lock:
+            if ok:
+                self.written += 1
+            else:
+                self.errors += 1
+
+    def _call(self, fn: Callable[[], None]) -> None:
+        try:
+            fn()
+        except Exception:
+            with self._stats_lock:
+                self.errors += 1
@@ -6,8 +6,14 @@ from typing import Any, Dict, List
 from pathlib import Path
 
 def load_event_log(json_path: str | Path) -> List[Dict[str, Any]]:
-    """Load the EventLog JSON list (as written by EventLog)."""
-    data = json.loads(Path(json_path).read_text(encoding="utf-8"))
+    """Load the EventLog JSON list (as written by EventLog).
+
+    A still-open run's append-only segment (*.events.jsonl) is read line by line.
+    """
+    text = Path(json_path).read_text(encoding="utf-8")
+    if str(json_path).endswith(".jsonl"):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    data = json.loads(text)
     assert isinstance(data, list), "EventLog JSON should be a list of events"
     return data
 
@@ -1,6 +1,6 @@
 # src/engine/evaluator.py
 from __future__ import annotations
-from typing import Union, Optional, Any
+from typing import Union, Optional, Any, Dict, Iterable, List, Tuple
 import json
 import hashlib
 
@@ -8,6 +8,7 @@ from core.state import State
 from core.phase_geometry import Phase
 from nlp.parser import parse
 from .contradiction_driver import detect_contradiction
+from .frontend_cache import FrontendCache, cache_key
 
 # Optional Phase-8 helpers (no-ops if missing)
 try:
@@ -86,18 +87,51 @@ def _hash_witness(w: Any) -> str:
         return ""
 
 
+# Shared LRU over the parse → canonicalize → WHNF front-end (see configure_frontend_cache)
+FRONTEND_CACHE = FrontendCache()
+
+
+def configure_frontend_cache(maxsize: int) -> FrontendCache:
+    """Resize the front-end LRU (0 disables it). Returns the cache for stats()/log_stats()."""
+    FRONTEND_CACHE.resize(maxsize)
+    return FRONTEND_CACHE
+
+
+def _frontend(expr: Union[str, Any]) -> Any:
+    ast: Any = parse(expr) if isinstance(expr, str) else expr
+
+    # Phase-8 prepasses (safe no-ops if modules not present)
+    ast = _canon(ast)
+    return _whnf(ast)
+
+
+def _prepare(expr: Union[str, Any]) -> Tuple[Any, bool, Dict]:
+    """parse (if str) → canonicalize → WHNF (cached) → contradiction detect. Returns (ast, is_contra, details)."""
+    ast = FRONTEND_CACHE.get_or_compute(expr, _frontend)
+
+    is_contra, details = detect_contradiction(ast, text_hint=expr if isinstance(expr, str) else None)
+    return ast, is_contra, details
+
+
+def _jam_details(ast: Any, details: Dict) -> Dict:
+    """Logged JAM details: detector output + witness hash + AST metrics for BI/OLAP."""
+    size, depth = _ast_metrics(ast)
+    lite = {k: v for k, v in details.items() if k != "witness"}
+    if "witness" in details:
+        lite["witness"] = details["witness"]
+        lite["witness_hash"] = _hash_witness(details["witness"])
+    lite["ast_size"] = size
+    lite["depth"] = depth
+    return lite
+
+
 def evaluate_full(expr: Union[str, Any], *, logger: Optional["EventLog"] = None) -> State:
     """
     Evaluate a text or AST into a State.
     Pipeline: parse (if str) → canonicalize (if available) → WHNF (if available) → contradiction detect.
     Transitions: MEM→ALIVE; ALIVE→JAM iff contradiction is detected (w/ witness logged).
     """
-    # Parse if needed
-    ast: Any = parse(expr) if isinstance(expr, str) else expr
-
-    # Phase-8 prepasses (safe no-ops if modules not present)
-    ast = _canon(ast)
-    ast = _whnf(ast)
+    ast, is_contra, details = _prepare(expr)
 
     state = State()
     _log_safe(logger, "parse", {"phase": "INIT"})
@@ -106,29 +140,19 @@ def evaluate_full(expr: Union[str, Any], *, logger: Optional["EventLog"] = None)
         state.trace.append("evaluate_full: parsed; canonicalized; reduced(WHNF)")
 
     # Contradiction analysis
-    is_contra, details = detect_contradiction(ast, text_hint=expr if isinstance(expr, str) else None)
     if is_contra:
         state.transition(Phase.JAM)
         if hasattr(state, "trace"):
             mode = details.get("mode", "jam")
             state.trace.append(f"detect: {mode} → JAM")
 
-        # metrics for BI/OLAP
-        size, depth = _ast_metrics(ast)
-        lite = {k: v for k, v in details.items() if k != "witness"}
-        if "witness" in details:
-            lite["witness"] = details["witness"]
-            lite["witness_hash"] = _hash_witness(details["witness"])
-        lite["ast_size"] = size
-        lite["depth"] = depth
-
         _log_safe(
             logger,
             "jam",
             {
                 "phase": "JAM",
                 "mode": details.get("mode", "jam"),
-                "details": lite,
+                "details": _jam_details(ast, details),
             },
         )
 
@@ -139,6 +163,71 @@ def evaluate_full(expr: Union[str, Any], *, logger: Optional["EventLog"] = None)
     return state
 
 
+def evaluate_many(exprs: Iterable[Union[str, Any]], *, logger: Optional["EventLog"] = None) -> Dict[str, List[Any]]:
+    """
+    Batch form of evaluate_full for large corpora.
+    Returns columnar results, one entry per input (in input order):
+      {"phase": [...], "mode": [...], "witness_hash": [...], "ast_size": [...], "depth": [...]}
+    Repeated inputs are evaluated once; no State is allocated per item.
+    Logging is a single "batch" event (counts + modes) instead of one per item;
+    its "jams" list carries the per-item JAM details (as logged by evaluate_full,
+    witness included) once per distinct input, with the input positions in "items".
+    """
+    cols: Dict[str, List[Any]] = {"phase": [], "mode": [], "witness_hash": [], "ast_size": [], "depth": []}
+    memo: Dict[Any, Tuple[Tuple[str, str, str, int, int], Optional[Dict]]] = {}
+    modes: Dict[str, int] = {}
+    jams: List[Dict[str, Any]] = []
+    n = jam = 0
+
+    for i, expr in enumerate(exprs):
+        n += 1
+        key = cache_key(expr)
+        # identity keys are only stable while the object is alive; don't memo them
+        hit = memo.get(key) if key[0] != "i" else None
+        if hit is None:
+            entry = None
+            try:
+                ast, is_contra, details = _prepare(expr)
+                size, depth = _ast_metrics(ast)
+                if is_contra:
+                    whash = _hash_witness(details["witness"]) if "witness" in details else ""
+                    row = ("JAM", details.get("mode", "jam"), whash, size, depth)
+                    entry = {"items": [], "mode": row[1], "details": _jam_details(ast, details)}
+                    jams.append(entry)
+                else:
+                    row = ("ALIVE", "", "", size, depth)
+            except Exception as e:
+                # a bad line must not sink the whole batch
+                row = ("ERROR", type(e).__name__, "", 0, 0)
+            hit = (row, entry)
+            if key[0] != "i":
+                memo[key] = hit
+        (phase, mode, whash, size, depth), entry = hit
+        cols["phase"].append(phase)
+        cols["mode"].append(mode)
+        cols["witness_hash"].append(whash)
+        cols["ast_size"].append(size)
+        cols["depth"].append(depth)
+        if phase == "JAM":
+            jam += 1
+            modes[mode] = modes.get(mode, 0) + 1
+            entry["items"].append(i)
+
+    _log_safe(
+        logger,
+        "batch",
+        {
+            "phase": "JAM" if jam else "ALIVE",
+            "count": n,
+            "unique": len(memo),
+            "jam": jam,
+            "modes": modes,
+            "jams": jams,
+        },
+    )
+    return cols
+
+
 def evaluate_expression(text: str, *, logger: Optional["EventLog"] = None) -> State:
     return evaluate_full(text, logger=logger)
 
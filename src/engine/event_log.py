@@ -1,44 +1,83 @@
 # src/engine/event_log.py
 from __future__ import annotations
-import os, json, glob, hashlib
+import os, re, json, hashlib
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-LOG_DIR = os.path.join("data", "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
+from .log_index import index_for
+
+LOG_DIR = os.path.join("data", "logs")  # created on first EventLog, not at import
 
 # Keep only the most recent N runs (JSON/SVG pairs)
 MAX_RUNS = 50
 
+# Segment durability: none  – buffered appends, OS write-back
+#                     flush – flush each event to the OS (survives a process crash)
+#                     fsync – flush + fsync each event (survives a power loss)
+DURABILITY = ("none", "flush", "fsync")
+SEGMENT_SUFFIX = ".events.jsonl"
+
+# OLAP row files are <name>_<UTC stamp>.parquet|.csv; readers of the log dir
+# match on this so other CSVs there (run_batch results, exports) stay out.
+ROW_SUFFIXES = (".parquet", ".csv")
+ROW_FILE = re.compile(r"^(?P<name>.+)_(?P<stamp>\d{8}T\d{6})\.(?:parquet|csv)$")
+
+def is_row_file(name: str) -> bool:
+    """True for an EventLog OLAP row file name (not a path)."""
+    return ROW_FILE.match(name) is not None
+
+def read_segment(path: str) -> List[Dict[str, Any]]:
+    """Events from an append-only segment; a torn last line is skipped."""
+    events: List[Dict[str, Any]] = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return events
+
+def compact_segment(segment_path: str, json_path: str) -> int:
+    """Rewrite a segment as the JSON array load_event_log expects (crash recovery)."""
+    events = read_segment(segment_path)
+    _write_json_atomic(json_path, events)
+    return len(events)
+
+def _write_json_atomic(json_path: str, events: List[Dict[str, Any]]) -> None:
+    tmp = json_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(events, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, json_path)
+
 def _prune_old_runs(log_dir: str, stem_prefix: str) -> None:
-    jsons = sorted(
-        glob.glob(os.path.join(log_dir, f"{stem_prefix}_*.json")),
-        key=lambda p: os.path.getmtime(p)
-    )
-    extra = max(0, len(jsons) - MAX_RUNS)
-    for path in jsons[:extra]:
-        try: os.remove(path)
-        except Exception: pass
-        maybe_svg = os.path.splitext(path)[0] + ".svg"
-        try:
-            if os.path.exists(maybe_svg):
-                os.remove(maybe_svg)
-        except Exception:
-            pass
+    # the run manifest knows each name's runs oldest-first: no glob, no stat sort
+    try:
+        index_for(log_dir).prune(stem_prefix, MAX_RUNS)
+    except Exception:
+        pass
 
 class EventLog:
     """
     BI-friendly event log:
-      - JSON stream (for dev)
+      - JSONL segment, appended per event; compacted into the JSON array on
+        compact()/snapshot_svg()/close() (for dev and engine_audit)
       - SVG timeline (for quick glance)
       - OLAP rows (Parquet if pyarrow; else CSV) for BI tools
     """
-    def __init__(self, name: str = "timeline", *, run_id: Optional[str] = None, session: Optional[str] = None):
+    def __init__(self, name: str = "timeline", *, run_id: Optional[str] = None, session: Optional[str] = None,
+                 durability: str = "none"):
+        if durability not in DURABILITY:
+            raise ValueError(f"durability must be one of {DURABILITY}")
         stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
         self.log_name = name
         self.run_id = run_id or self._hash16(f"{name}:{stamp}")
         self.session = session or ""
+        self.durability = durability
         self.json_path = os.path.join(LOG_DIR, f"{name}_{stamp}.json")
+        self.segment_path = os.path.join(LOG_DIR, f"{name}_{stamp}{SEGMENT_SUFFIX}")
         self.svg_path  = os.path.join(LOG_DIR, f"{name}_{stamp}.svg")
         self.rows_path_parquet = os.path.join(LOG_DIR, f"{name}_{stamp}.parquet")
         self.rows_path_csv = os.path.join(LOG_DIR, f"{name}_{stamp}.csv")
@@ -46,7 +85,11 @@ class EventLog:
         self._events: List[Dict[str, Any]] = []
         self._olap_rows: List[Dict[str, Any]] = []
         self._event_id = 0
+        self._segment = None  # opened on first event
+        self._compacted = 0   # len(_events) at the last compaction
+        self._indexed = False
 
+        os.makedirs(LOG_DIR, exist_ok=True)
         _prune_old_runs(LOG_DIR, name)
 
     # ----------------- public -----------------
@@ -60,10 +103,15 @@ class EventLog:
             "data": payload,
         }
         self._events.append(data)
-        # write-through json for dev safety
+        # append-only segment: O(1) bytes per event instead of rewriting the array
         try:
-            with open(self.json_path, "w", encoding="utf-8") as f:
-                json.dump(self._events, f, indent=2, ensure_ascii=False)
+            if self._segment is None:
+                self._segment = open(self.segment_path, "a", encoding="utf-8")
+            self._segment.write(json.dumps(data, ensure_ascii=False) + "\n")
+            if self.durability != "none":
+                self._segment.flush()
+                if self.durability == "fsync":
+                    os.fsync(self._segment.fileno())
         except Exception:
             pass
 
@@ -75,10 +123,53 @@ class EventLog:
         except Exception:
             pass
 
+    def compact(self) -> None:
+        """Write the events so far to json_path as one JSON array (atomic replace)."""
+        if self._compacted == len(self._events) and os.path.exists(self.json_path):
+            return
+        try:
+            if self._segment is not None:
+                self._segment.flush()
+            _write_json_atomic(self.json_path, self._events)
+            self._compacted = len(self._events)
+        except Exception:
+            return
+        if not self._indexed:
+            try:
+                index_for(LOG_DIR).add(
+                    self.log_name, self.run_id, self.json_path,
+                    [self.svg_path, self.segment_path, self.rows_path_parquet, self.rows_path_csv],
+                    size=os.path.getsize(self.json_path),
+                )
+                self._indexed = True
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Compact, then drop the segment (the JSON array is now authoritative)."""
+        if self._segment is None:
+            return
+        self.compact()
+        try:
+            self._segment.close()
+            if self._compacted == len(self._events):
+                os.remove(self.segment_path)
+        except Exception:
+            pass
+        self._segment = None
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def snapshot_svg(self) -> None:
         """
         Minimal SVG timeline (unchanged in spirit), plus we write OLAP rows.
+        Also compacts the segment so json_path is current.
         """
+        self.compact()
         y, x = 50, 40
         lines = [
             '<svg xmlns="http://www.w3.org/2000/svg" width="960" height="160">',
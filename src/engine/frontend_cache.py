@@ -0,0 +1,107 @@
+# src/engine/frontend_cache.py
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def _env_maxsize(default: int = 4096) -> int:
+    # a malformed env var must not break `import engine.evaluator`
+    try:
+        return int(os.environ.get("LEE_FRONTEND_CACHE_SIZE", default))
+    except (TypeError, ValueError):
+        return default
+
+
+DEFAULT_MAXSIZE = _env_maxsize()
+
+
+def cache_key(expr: Any) -> Any:
+    """
+    Key for a front-end input:
+      - text           → the text itself
+      - hashable AST   → its structural hash/eq (frozen dataclasses, tuples)
+      - anything else  → object identity (entry also pins the object, see FrontendCache)
+    """
+    if isinstance(expr, str):
+        return ("s", expr)
+    try:
+        hash(expr)
+        return ("h", type(expr), expr)
+    except TypeError:
+        return ("i", id(expr))
+
+
+class FrontendCache:
+    """
+    Bounded, thread-safe LRU for the parse → canonicalize → WHNF front-end.
+      cache.get_or_compute(expr, fn)   # fn(expr) runs only on a miss
+      cache.stats()                    # {'hits','misses','evictions','size','maxsize'}
+      cache.log_stats(event_log)       # one 'cache' event
+    maxsize <= 0 disables caching (every call is a miss, nothing is stored).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, expr: Any, fn: Callable[[Any], Any]) -> Any:
+        key = cache_key(expr)
+        with self._lock:
+            hit = self._data.get(key)
+            # identity keys: the pinned object must still be the same one
+            if hit is not None and (key[0] != "i" or hit[0] is expr):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+            self.misses += 1
+
+        # compute outside the lock; a concurrent miss on the same key just recomputes
+        value = fn(expr)
+
+        if self.maxsize > 0:
+            with self._lock:
+                self._data[key] = (expr if key[0] == "i" else None, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > max(0, maxsize):
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def log_stats(self, logger: Optional[Any], name: str = "frontend") -> None:
+        if not logger:
+            return
+        try:
+            logger.event("cache", {"cache": name, **self.stats()})
+        except Exception:
+            pass  # never let logging break evaluation
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,211 @@
+# src/engine/ingest.py
+from __future__ import annotations
+import json, os, re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Backfill run history from run artifacts (<dir>/*.json + .prov.jsonl sidecars).
+# State lives in <state_dir>:
+#   fingerprints.jsonl  one line per file ever looked at: path, size, mtime_ns, ino
+#   run_ids.txt         run_ids known to be in the history (dedupe set)
+#   state.json          how far into the history run_ids.txt has caught up
+# Unchanged files are skipped without being opened; parsing fans out over a
+# process pool; records go to the history in large single-write batches.
+
+_RUN_ID = re.compile(rb'"run_id":\s*"([^"]*)"')
+
+
+def _iso(ts: Any) -> Optional[str]:
+    if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+        return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+    return ts if isinstance(ts, str) else None
+
+
+def _from_prov(prov: Path) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    try:
+        with prov.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    ev = json.loads(line)
+                except ValueError:
+                    continue
+                if ev.get("kind") == "start":
+                    out.setdefault("run_id", ev.get("run_id"))
+                    out.setdefault("session", ev.get("session"))
+                    out.setdefault("ts_start", _iso(ev.get("ts")))
+                if ev.get("phase_after"):
+                    out["final_phase"] = ev["phase_after"]
+                out["ts_end"] = _iso(ev.get("ts")) or out.get("ts_end")
+    except OSError:
+        pass
+    return out
+
+
+def parse_run_file(path: str) -> Optional[Dict[str, Any]]:
+    """One history record from a run JSON (Pipeline result or EventLog array); None if unusable."""
+    p = Path(path)
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    rec: Dict[str, Any] = {"run_id": None, "session": None, "log_json": str(p), "ts_start": None,
+                           "ts_end": None, "final_phase": None, "time_to_mem_ms": None}
+    if isinstance(data, dict):
+        hist = data.get("history") or {}
+        rec["run_id"] = hist.get("run_id") or data.get("run_id")
+        rec["session"] = data.get("session")
+        rec["final_phase"] = (data.get("state") or {}).get("phase") or data.get("final_phase")
+        t0 = hist.get("t0")
+        rec["ts_start"], rec["ts_end"] = _iso(t0), _iso(hist.get("t1"))
+        if "JAM" in (hist.get("phases") or []) and isinstance(t0, (int, float)):
+            for tr in hist.get("transitions") or []:
+                if tr.get("to") == "MEM" and isinstance(tr.get("ts"), (int, float)):
+                    rec["time_to_mem_ms"] = (tr["ts"] - t0) * 1000.0
+    elif isinstance(data, list):
+        # EventLog array: [{"ts","type","data"}, ...]
+        events = [e for e in data if isinstance(e, dict)]
+        if events:
+            rec["ts_start"], rec["ts_end"] = events[0].get("ts"), events[-1].get("ts")
+        for ev in events:
+            d = ev.get("data") or {}
+            rec["run_id"] = rec["run_id"] or d.get("run_id")
+            rec["final_phase"] = d.get("phase") or rec["final_phase"]
+            if isinstance(d.get("time_to_mem_ms"), (int, float)):
+                rec["time_to_mem_ms"] = float(d["time_to_mem_ms"])
+    else:
+        return None
+    prov = p.with_suffix(".prov.jsonl")
+    if prov.exists() and not (rec["run_id"] and rec["final_phase"]):
+        for k, v in _from_prov(prov).items():
+            if rec.get(k) is None:
+                rec[k] = v
+    rec["run_id"] = rec["run_id"] or p.stem  # EventLog arrays carry no run_id
+    return rec
+
+
+def _fingerprint(st: os.stat_result) -> List[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def _load_fingerprints(path: Path) -> Dict[str, List[int]]:
+    table: Dict[str, List[int]] = {}
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                    table[row["path"]] = row["fp"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except OSError:
+        pass
+    return table
+
+
+def _known_run_ids(history: Path, state_dir: Path) -> Set[str]:
+    # catch run_ids.txt up with whatever was appended to the history since last time
+    ids_path, state_path = state_dir / "run_ids.txt", state_dir / "state.json"
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except Exception:
+        state = {"offset": 0}
+    size = history.stat().st_size if history.exists() else 0
+    if state.get("offset", 0) > size:  # history replaced: start over
+        state = {"offset": 0}
+        ids_path.unlink(missing_ok=True)
+    if size > state["offset"]:
+        new: List[bytes] = []
+        offset = state["offset"]
+        with history.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                m = _RUN_ID.search(line)
+                if m:
+                    new.append(m.group(1))
+        with ids_path.open("ab") as f:
+            f.write(b"".join(x + b"\n" for x in new))
+        state["offset"] = offset
+        tmp = state_path.with_name(state_path.name + ".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, state_path)
+    try:
+        return set(ids_path.read_text(encoding="utf-8").split())
+    except OSError:
+        return set()
+
+
+def _candidates(log_dir: Path) -> Iterable[Tuple[str, List[int]]]:
+    with os.scandir(log_dir) as it:
+        for e in it:
+            if e.name.endswith(".json") and e.name.count(".") == 1 and e.is_file():
+                yield os.path.abspath(e.path), _fingerprint(e.stat())
+
+
+def ingest_dir(log_dir: Union[str, Path], *, history: Union[str, Path], state_dir: Union[str, Path],
+               workers: Optional[int] = None, batch: int = 10_000, chunksize: int = 64) -> Dict[str, int]:
+    """
+    Append one history record per new run found in log_dir.
+    Returns counts: files, unchanged, ingested, duplicates, unreadable.
+    """
+    log_dir, history, state_dir = Path(log_dir), Path(history), Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    history.parent.mkdir(parents=True, exist_ok=True)
+    fp_path = state_dir / "fingerprints.jsonl"
+    seen_fp = _load_fingerprints(fp_path)
+    known = _known_run_ids(history, state_dir)
+
+    todo: List[Tuple[str, List[int]]] = []
+    counts = {"files": 0, "unchanged": 0, "ingested": 0, "duplicates": 0, "unreadable": 0}
+    for path, fp in _candidates(log_dir):
+        counts["files"] += 1
+        if seen_fp.get(path) == fp:
+            counts["unchanged"] += 1
+        else:
+            todo.append((path, fp))
+
+    recorded_at = datetime.now(timezone.utc).isoformat()
+    lines: List[str] = []
+    fps: List[str] = []
+
+    def flush() -> None:
+        # history first: a crash before the fingerprints only means re-parsing, and
+        # the run_id dedupe drops the repeats
+        if lines:
+            with history.open("a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        if fps:
+            with fp_path.open("a", encoding="utf-8") as f:
+                f.write("".join(fps))
+        lines.clear()
+        fps.clear()
+
+    def consume(results: Iterable[Optional[Dict[str, Any]]]) -> None:
+        for (path, fp), rec in zip(todo, results):
+            fps.append(json.dumps({"path": path, "fp": fp}) + "\n")
+            if rec is None:
+                counts["unreadable"] += 1
+            elif rec["run_id"] in known:
+                counts["duplicates"] += 1
+            else:
+                known.add(rec["run_id"])
+                rec["recorded_at"] = recorded_at
+                lines.append(json.dumps(rec, ensure_ascii=False) + "\n")
+                counts["ingested"] += 1
+            if len(fps) >= batch:
+                flush()
+
+    paths = [p for p, _ in todo]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(paths) < 2 * chunksize:
+        consume(map(parse_run_file, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            consume(ex.map(parse_run_file, paths, chunksize=chunksize))
+    flush()
+    return counts
@@ -0,0 +1,239 @@
+# src/engine/jsonl_index.py
+from __future__ import annotations
+import json, os, threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Reader for append-only JSONL files (history, memory, memdb) with a sidecar
+# line-offset index, <file>.idx: the end offset of every complete line as a
+# native uint64, appended as lines are. Line k spans
+# [ends[k-1], ends[k]), so "record k" and "last N records" are one seek + one
+# read, and a refresh only scans the bytes appended since the last one. The
+# index is a cache: a missing, torn or stale sidecar is rebuilt, and tail()
+# on a file that has no index yet reads blocks backwards from the end instead.
+
+IDX_SUFFIX = ".idx"
+_BLOCK = 1 << 16
+_ITEM = 8  # bytes per offset
+
+
+def iter_lines_reversed(path: Union[str, Path], block: int = _BLOCK) -> Iterator[bytes]:
+    """Complete lines of a file, last first, reading fixed-size blocks from the end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            tail = lines.pop(0)  # may be cut at the block boundary
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if tail:
+            yield tail
+
+
+def _loads(lines: Iterable[bytes]) -> List[Dict[str, Any]]:
+    out = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            out.append(json.loads(line))
+        except ValueError:
+            continue  # skip bad lines but don't die
+    return out
+
+
+class JsonlFile:
+    """One append-only JSONL file plus its offset index; use jsonl_for(path) to share it per process."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.idx_path = self.path.with_name(self.path.name + IDX_SUFFIX)
+        self._lock = threading.RLock()
+        self._ends = array("Q")
+        self._idx_bytes = 0  # how much of the sidecar is loaded into _ends
+
+    # ----------------- writes -----------------
+
+    def append(self, rec: Dict[str, Any]) -> None:
+        self.append_many([rec])
+
+    def append_many(self, recs: Iterable[Dict[str, Any]]) -> None:
+        # one write() per batch keeps concurrent appenders' lines whole
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in recs)
+        if not data:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+            if self.idx_path.exists():
+                self._refresh()  # index only what was just written (and anything before it)
+
+    # ----------------- reads -----------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ends)
+
+    def get(self, k: int) -> Optional[Dict[str, Any]]:
+        """Record on line k (negative counts from the end); None for a blank or bad line."""
+        with self._lock:
+            self._refresh()
+            n = len(self._ends)
+            if k < 0:
+                k += n
+            if not 0 <= k < n:
+                raise IndexError(k)
+            recs = _loads([self._read(k, k + 1)])
+        return recs[0] if recs else None
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """Records of the last n complete lines, oldest first."""
+        if n <= 0 or not self.path.exists():
+            return []
+        with self._lock:
+            if not self.idx_path.exists():
+                # no index yet: don't build one over the whole file just for this
+                lines: List[bytes] = []
+                with open(self.path, "rb") as f:
+                    size = f.seek(0, os.SEEK_END)
+                    if size:
+                        f.seek(size - 1)
+                    torn = bool(size) and f.read(1) != b"\n"
+                it = iter_lines_reversed(self.path)
+                if torn:
+                    next(it, None)  # half-written last line
+                for line in it:
+                    lines.append(line)
+                    if len(lines) >= n:
+                        break
+                return _loads(reversed(lines))
+            self._refresh()
+            total = len(self._ends)
+            return _loads(self._read(max(0, total - n), total).splitlines())
+
+    def slice(self, start: int, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records of lines [start, stop)."""
+        with self._lock:
+            self._refresh()
+            start, stop, _ = slice(start, stop).indices(len(self._ends))
+            if start >= stop:
+                return []
+            return _loads(self._read(start, stop).splitlines())
+
+    def since(self, offset: int) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        (record, end offset) for each complete line from byte `offset`; resume
+        from the last end. record is None for a blank or bad line.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # half-written last line: pick it up next time
+                offset += len(line)
+                recs = _loads([line])
+                yield (recs[0] if recs else None), offset
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Every record, first to last."""
+        for rec, _ in self.since(0):
+            if rec is not None:
+                yield rec
+
+    # ----------------- internals -----------------
+
+    def _read(self, start: int, stop: int) -> bytes:
+        lo = self._ends[start - 1] if start else 0
+        with open(self.path, "rb") as f:
+            f.seek(lo)
+            return f.read(self._ends[stop - 1] - lo)
+
+    def _reset(self) -> None:
+        self._ends = array("Q")
+        self._idx_bytes = 0
+        self.idx_path.unlink(missing_ok=True)
+
+    def _load_sidecar(self) -> None:
+        # pick up entries appended to the sidecar by other processes
+        try:
+            with open(self.idx_path, "rb") as f:
+                if f.seek(0, os.SEEK_END) < self._idx_bytes:  # rewritten elsewhere: reload it all
+                    self._ends = array("Q")
+                    self._idx_bytes = 0
+                f.seek(self._idx_bytes)
+                data = f.read()
+        except FileNotFoundError:
+            if self._idx_bytes:
+                self._ends = array("Q")
+                self._idx_bytes = 0
+            return
+        data = data[: len(data) - len(data) % _ITEM]  # torn last entry
+        new = array("Q")
+        new.frombytes(data)
+        if new and self._ends and new[0] <= self._ends[-1]:
+            self._reset()  # two writers indexed the same lines: start clean
+            return
+        self._ends.extend(new)
+        self._idx_bytes += len(data)
+
+    def _refresh(self) -> None:
+        self._load_sidecar()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            if self._ends:
+                self._reset()
+            return
+        done = self._ends[-1] if self._ends else 0
+        if done > size or (done and not self._ends_line(done)):
+            self._reset()  # truncated or replaced: rebuild from byte 0
+            done = 0
+        if size == done and self.idx_path.exists():
+            return
+        new = array("Q")
+        with open(self.path, "rb") as f:
+            f.seek(done)
+            pos = done
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                pos += len(line)
+                new.append(pos)
+        with open(self.idx_path, "ab") as f:
+            if f.tell() != self._idx_bytes:
+                return self._refresh()  # another process indexed these lines meanwhile
+            f.write(new.tobytes())
+        self._ends.extend(new)
+        self._idx_bytes += len(new) * _ITEM
+
+    def _ends_line(self, offset: int) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+
+
+_FILES: Dict[str, JsonlFile] = {}
+_FILES_LOCK = threading.Lock()
+
+
+def jsonl_for(path: Union[str, Path]) -> JsonlFile:
+    key = os.path.abspath(str(path))
+    with _FILES_LOCK:
+        jf = _FILES.get(key)
+        if jf is None:
+            jf = _FILES[key] = JsonlFile(path)
+        return jf
@@ -0,0 +1,204 @@
+# src/engine/latency.py
+from __future__ import annotations
+import base64, math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# HDR-style latency histograms. Values (ms) fall into log-spaced buckets
+# (LOWEST * GROWTH**i), so any quantile is reported within ±1% of the true
+# value in O(buckets) memory, whatever the number of samples. Histograms with
+# the same layout merge by adding bucket counts: shards from worker processes,
+# batch runs and stream sessions combine exactly.
+
+GROWTH = 1.02   # bucket width ratio (±1% relative error)
+LOWEST = 1e-3   # ms; everything at or below shares bucket 0
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999))
+_LOG_G = math.log(GROWTH)
+
+
+def bucket_index(v: float) -> int:
+    if v <= LOWEST:
+        return 0
+    return 1 + int(math.log(v / LOWEST) / _LOG_G)
+
+
+def bucket_value(i: int) -> float:
+    # geometric midpoint of (LOWEST*G^(i-1), LOWEST*G^i]
+    return LOWEST if i <= 0 else LOWEST * GROWTH ** (i - 0.5)
+
+
+def _pack(counts: Dict[int, int]) -> str:
+    # sorted (index delta, count) pairs as LEB128 varints, base64
+    out = bytearray()
+    prev = 0
+    for i in sorted(counts):
+        for x in (i - prev, counts[i]):
+            while x >= 0x80:
+                out.append((x & 0x7F) | 0x80)
+                x >>= 7
+            out.append(x)
+        prev = i
+    return base64.b64encode(bytes(out)).decode("ascii")
+
+
+def _unpack(s: str) -> Dict[int, int]:
+    data = base64.b64decode(s.encode("ascii"))
+    vals: List[int] = []
+    x = shift = 0
+    for b in data:
+        x |= (b & 0x7F) << shift
+        if b & 0x80:
+            shift += 7
+            continue
+        vals.append(x)
+        x = shift = 0
+    counts: Dict[int, int] = {}
+    i = 0
+    for delta, c in zip(vals[0::2], vals[1::2]):
+        i += delta
+        counts[i] = c
+    return counts
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "n", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.n = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, v: Any) -> None:
+        if not isinstance(v, (int, float)) or isinstance(v, bool) or v != v:
+            return  # None/NaN/non-numeric: nothing to record
+        v = max(0.0, float(v))
+        i = bucket_index(v)
+        self.counts[i] = self.counts.get(i, 0) + 1
+        self.n += 1
+        self.total += v
+        self.min = v if self.min is None else min(self.min, v)
+        self.max = v if self.max is None else max(self.max, v)
+
+    @classmethod
+    def from_values(cls, values: Any) -> "LatencyHistogram":
+        """Histogram of many values; vectorized for NumPy arrays (NaN skipped)."""
+        h = cls()
+        try:
+            import numpy as np  # type: ignore
+        except Exception:
+            np = None  # type: ignore
+        if np is None or not isinstance(values, np.ndarray):
+            for v in values:
+                h.add(v)
+            return h
+        v = values.astype(np.float64, copy=False)
+        v = np.maximum(v[~np.isnan(v)], 0.0)
+        if not len(v):
+            return h
+        with np.errstate(divide="ignore"):
+            idx = np.where(v <= LOWEST, 0, 1 + np.floor(np.log(v / LOWEST) / _LOG_G)).astype(np.int64)
+        uniq, cnt = np.unique(idx, return_counts=True)
+        h.counts = dict(zip(uniq.tolist(), cnt.tolist()))
+        h.n = int(len(v))
+        h.total = float(v.sum())
+        h.min, h.max = float(v.min()), float(v.max())
+        return h
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for i, c in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + c
+        self.n += other.n
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.n:
+            return None
+        rank = max(1, math.ceil(q * self.n))
+        seen = 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(max(bucket_value(i), self.min), self.max)  # type: ignore[type-var]
+        return self.max
+
+    def percentiles(self) -> Dict[str, Optional[float]]:
+        return {name: self.quantile(q) for name, q in QUANTILES}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"g": GROWTH, "lo": LOWEST, "n": self.n, "sum": self.total,
+                "min": self.min, "max": self.max, "b": _pack(self.counts)}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "LatencyHistogram":
+        if d.get("g", GROWTH) != GROWTH or d.get("lo", LOWEST) != LOWEST:
+            raise ValueError("histogram bucket layout differs; cannot merge")
+        h = cls()
+        h.counts = _unpack(d.get("b", ""))
+        h.n = int(d.get("n", 0))
+        h.total = float(d.get("sum", 0.0))
+        h.min, h.max = d.get("min"), d.get("max")
+        return h
+
+
+Key = Tuple[str, str, str, str]  # (metric, session, domain, phase)
+
+
+class LatencyStats:
+    """Histograms keyed by (metric, session, domain, phase); mergeable and JSON-serialisable."""
+
+    def __init__(self) -> None:
+        self.hists: Dict[Key, LatencyHistogram] = {}
+
+    def __len__(self) -> int:
+        return len(self.hists)
+
+    def hist(self, metric: str, *, session: Any = "", domain: Any = "", phase: Any = "") -> LatencyHistogram:
+        key = (metric, str(session or ""), str(domain or ""), str(phase or ""))
+        h = self.hists.get(key)
+        if h is None:
+            h = self.hists[key] = LatencyHistogram()
+        return h
+
+    def record(self, metric: str, value: Any, **dims: Any) -> None:
+        self.hist(metric, **dims).add(value)
+
+    def merge(self, other: "LatencyStats") -> "LatencyStats":
+        for key, h in other.hists.items():
+            mine = self.hists.get(key)
+            if mine is None:
+                mine = self.hists[key] = LatencyHistogram()
+            mine.merge(h)
+        return self
+
+    def rows(self) -> List[Dict[str, Any]]:
+        out = []
+        for (metric, session, domain, phase), h in sorted(self.hists.items()):
+            if not h.n:
+                continue
+            row: Dict[str, Any] = {"metric": metric, "session": session, "domain": domain, "phase": phase, "n": h.n}
+            row.update(h.percentiles())
+            out.append(row)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"h": [list(k) + [h.to_dict()] for k, h in sorted(self.hists.items())]}
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> "LatencyStats":
+        st = cls()
+        for *key, hd in (d or {}).get("h", []):
+            st.hists[tuple(key)] = LatencyHistogram.from_dict(hd)  # type: ignore[index]
+        return st
+
+    @classmethod
+    def merged(cls, parts: Iterable["LatencyStats"]) -> "LatencyStats":
+        st = cls()
+        for p in parts:
+            st.merge(p)
+        return st
@@ -0,0 +1,237 @@
+# src/engine/log_index.py
+from __future__ import annotations
+import json, os, threading, time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .jsonl_index import iter_lines_reversed
+
+# Manifest of the runs in one log directory, kept next to them as index.jsonl:
+#   {"op": "add", "name", "run_id", "created", "json", "artifacts", "size"}
+#   {"op": "rm",  "json"}
+# File names are relative to the directory. Writers append one line per run, so
+# "newest run" reads the file backwards from the end and retention keeps a
+# per-name ordered map loaded incrementally from the last offset seen – nobody
+# globs or stats the directory. The index is a cache: rebuild() recreates it.
+
+INDEX_NAME = "index.jsonl"
+_COMPACT_MIN_DEAD = 4096  # rewrite the index once this many lines are dead (and > live)
+
+
+class LogIndex:
+    """Run manifest for one log directory; use index_for(log_dir) to share it per process."""
+
+    def __init__(self, log_dir: Union[str, Path]) -> None:
+        self.log_dir = Path(log_dir)
+        self.path = self.log_dir / INDEX_NAME
+        self._lock = threading.RLock()
+        self._offset = 0
+        self._runs: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}  # name -> json -> record
+        self._names: Dict[str, str] = {}                                # json -> name
+        self._dead = 0
+
+    # ----------------- writes -----------------
+
+    def add(self, name: str, run_id: str, json_path: Union[str, Path], artifacts: List[Union[str, Path]] = (),
+            size: Optional[int] = None, created: Optional[float] = None) -> None:
+        rec = {
+            "op": "add", "name": name, "run_id": run_id,
+            "created": created if created is not None else time.time(),
+            "json": Path(json_path).name,
+            "artifacts": [Path(p).name for p in artifacts],
+            "size": size,
+        }
+        self._append([rec])
+
+    def prune(self, name: str, keep: int) -> List[str]:
+        """Delete the oldest runs of `name` beyond `keep`; returns the removed JSON names."""
+        with self._lock:
+            self._refresh()
+            runs = self._runs.get(name)
+            if not runs or len(runs) <= keep:
+                return []
+            doomed = list(runs.values())[: len(runs) - keep]
+            for rec in doomed:
+                for fn in [rec["json"]] + list(rec.get("artifacts") or []):
+                    try:
+                        os.remove(self.log_dir / fn)
+                    except OSError:
+                        pass
+            self._append([{"op": "rm", "json": rec["json"]} for rec in doomed])
+            self._refresh()
+            if self._dead > _COMPACT_MIN_DEAD and self._dead > len(self._names):
+                self.compact()
+            return [rec["json"] for rec in doomed]
+
+    def compact(self) -> int:
+        """Rewrite the index with live runs only; returns how many were kept."""
+        with self._lock:
+            self._refresh()
+            live = sorted((rec for runs in self._runs.values() for rec in runs.values()),
+                          key=lambda r: r.get("created") or 0.0)
+            self._write(live)
+            return len(live)
+
+    def rebuild(self) -> int:
+        """Recreate the index from the files in the directory (one scandir pass)."""
+        groups: Dict[str, List[os.DirEntry]] = {}
+        try:
+            with os.scandir(self.log_dir) as it:
+                for entry in it:
+                    if entry.name == INDEX_NAME or entry.name.endswith(".tmp") or not entry.is_file():
+                        continue
+                    groups.setdefault(entry.name.split(".", 1)[0], []).append(entry)
+        except FileNotFoundError:
+            pass
+        records = []
+        for stem, entries in groups.items():
+            main = next((e for e in entries if e.name == stem + ".json"), None)
+            if main is None:
+                continue
+            name, _, run_id = stem.rpartition("_")
+            st = main.stat()
+            records.append({
+                "op": "add", "name": name or stem, "run_id": run_id,
+                "created": st.st_mtime, "json": main.name,
+                "artifacts": sorted(e.name for e in entries if e is not main),
+                "size": sum(e.stat().st_size for e in entries),
+            })
+        records.sort(key=lambda r: r["created"])
+        with self._lock:
+            self._write(records)
+        return len(records)
+
+    # ----------------- reads -----------------
+
+    def newest(self, name: Optional[str] = None) -> Optional[Path]:
+        """Most recently added run (optionally of one name) whose JSON still exists."""
+        if not self.path.exists():
+            if not self.log_dir.is_dir():
+                return None
+            self.rebuild()
+        removed = set()
+        try:
+            for line in iter_lines_reversed(self.path):
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if rec.get("op") == "rm":
+                    removed.add(rec.get("json"))
+                    continue
+                if name is not None and rec.get("name") != name:
+                    continue
+                if rec.get("json") in removed:
+                    continue
+                path = self.log_dir / rec["json"]
+                if path.exists():
+                    return path
+        except OSError:
+            pass
+        return None
+
+    def runs(self, name: str) -> List[Dict[str, Any]]:
+        """Live run records of `name`, oldest first."""
+        with self._lock:
+            self._refresh()
+            return list(self._runs.get(name, {}).values())
+
+    # ----------------- internals -----------------
+
+    def _append(self, recs: List[Dict[str, Any]]) -> None:
+        # one write() per batch keeps concurrent appenders' lines whole
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in recs)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        tmp = self.path.with_name(INDEX_NAME + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        self._offset = 0
+        self._runs.clear()
+        self._names.clear()
+        self._dead = 0
+        self._refresh()
+
+    def _refresh(self) -> None:
+        # read only what was appended since the last call (by any process)
+        try:
+            with open(self.path, "rb") as f:
+                if f.seek(0, os.SEEK_END) < self._offset:  # replaced by another process
+                    self._offset = 0
+                    self._runs.clear()
+                    self._names.clear()
+                    self._dead = 0
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1  # leave a half-written last line for next time
+        self._offset += end
+        for line in data[:end].splitlines():
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            fn = rec.get("json")
+            if rec.get("op") == "rm":
+                name = self._names.pop(fn, None)
+                if name is not None:
+                    self._runs[name].pop(fn, None)
+                self._dead += 2
+            elif fn:
+                name = rec.get("name", "")
+                old = self._names.get(fn)
+                if old is not None:
+                    self._runs[old].pop(fn, None)
+                    self._dead += 1
+                self._names[fn] = name
+                self._runs.setdefault(name, OrderedDict())[fn] = rec
+
+
+_INDEXES: Dict[str, LogIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_for(log_dir: Union[str, Path]) -> LogIndex:
+    key = os.path.abspath(str(log_dir))
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            idx = _INDEXES[key] = LogIndex(log_dir)
+        return idx
+
+
+def newest_json(log_dir: Union[str, Path] = "data/logs", name: Optional[str] = None) -> Optional[Path]:
+    return index_for(log_dir).newest(name)
+
+# ---------- CLI ----------
+
+def _cli(argv: list[str]) -> int:
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m src.engine.log_index")
+    ap.add_argument("cmd", choices=["rebuild", "compact", "newest"])
+    ap.add_argument("--dir", default="data/logs", help="log directory (default: data/logs)")
+    ap.add_argument("--name", default=None, help="newest: restrict to one log name")
+    args = ap.parse_args(argv)
+    idx = index_for(args.dir)
+    if args.cmd == "rebuild":
+        print(f"Indexed {idx.rebuild()} runs in {idx.path}")
+    elif args.cmd == "compact":
+        print(f"Kept {idx.compact()} runs in {idx.path}")
+    else:
+        p = idx.newest(args.name)
+        if p is None:
+            print("No runs found.")
+            return 1
+        print(p)
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    raise SystemExit(_cli(sys.argv[1:]))
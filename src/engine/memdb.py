@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any
-import json
+from typing import Dict, Any, List
+from .jsonl_index import jsonl_for
 
 MEMDB_DIR = Path("data/memdb")
 
@@ -17,8 +17,12 @@ def append_patient_history(patient_id: str, res: Dict[str, Any], fallback_run_id
         "phases": hist.get("phases", []),
         "domain": res.get("domain"),
     }
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    jsonl_for(path).append(payload)
+
+def load_patient_history(patient_id: str, tail: int | None = None) -> List[Dict[str, Any]]:
+    """Patient history records, oldest first; tail=N reads only the last N lines."""
+    f = jsonl_for(MEMDB_DIR / f"{patient_id}.history.jsonl")
+    return f.tail(tail) if tail else list(f.records())
 
 def write_patient_summary(patient_id: str, res: Dict[str, Any]) -> None:
     MEMDB_DIR.mkdir(parents=True, exist_ok=True)
@@ -1,26 +1,29 @@
 from __future__ import annotations
-import os, json
+import os
 from typing import Any, List
 
-DATA_DIR = os.path.join("data", "memory")
-os.makedirs(DATA_DIR, exist_ok=True)
+from .jsonl_index import jsonl_for
+
+DATA_DIR = os.path.join("data", "memory")  # created on first MemoryStore, not at import
 
 class MemoryStore:
     def __init__(self, filename: str = "session.jsonl"):
+        os.makedirs(DATA_DIR, exist_ok=True)
         self.path = os.path.join(DATA_DIR, filename)
         # lazily create file
         if not os.path.exists(self.path):
             open(self.path, "a", encoding="utf-8").close()
+        self._file = jsonl_for(self.path)
 
     def append(self, record: dict[str, Any]) -> None:
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.append(record)
 
     def load(self, tail: int | None = None) -> List[dict[str, Any]]:
-        out: List[dict[str, Any]] = []
-        with open(self.path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    out.append(json.loads(line))
-        return out[-tail:] if tail else out
+        # tail reads only the last lines (offset index / backwards), not the whole file
+        if tail:
+            return self._file.tail(tail)
+        return list(self._file.records())
+
+    def get(self, k: int) -> dict[str, Any] | None:
+        """Record k (negative from the end) via the offset index."""
+        return self._file.get(k)
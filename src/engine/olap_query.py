@@ -0,0 +1,304 @@
+# src/engine/olap_query.py
+from __future__ import annotations
+import csv, os, re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .event_log import ROW_FILE
+
+# Queries across the EventLog OLAP row files in a log dir (<name>_<stamp>.parquet
+# or .csv, one per run; other files there, e.g. run_batch CSVs, are skipped).
+# Filters are (column, op, value) triples, ANDed:
+#   query(where=[("event_type", "=", "jam"), ("mode", "=", "implication"),
+#                ("date", "=", "2025-01-07")], session="X", columns=["ts", "witness_pattern"])
+# Work is skipped at three levels before any row is compared:
+#   file       - rows of <name>_<stamp> lie between the stamp (run start) and the
+#                file's mtime (last write), so date/ts bounds and log_name
+#                filters prune files from a directory listing alone;
+#   row group  - Parquet min/max statistics (date, event_type, mode,
+#                witness_pattern, ...) drop row groups that cannot match;
+#   column     - only projected and filtered columns are read from Parquet.
+# CSV files (no pyarrow) are filtered while streaming, and since rows are written
+# in time order a file stops being read once it passes a date/ts upper bound.
+
+OPS = ("=", "==", "!=", "<", "<=", ">", ">=", "in", "not in")
+NUMERIC = ("event_id", "hour", "resolution_applied", "artifact_created", "time_to_mem_ms", "ast_size", "depth")
+
+Pred = Tuple[str, str, Any]
+
+
+def _num(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize(where: Sequence[Pred], eq: Dict[str, Any]) -> List[Pred]:
+    preds = [tuple(p) for p in where] + [(k, "=", v) for k, v in eq.items()]
+    out: List[Pred] = []
+    for col, op, val in preds:
+        op = "=" if op == "==" else op
+        if op not in OPS:
+            raise ValueError(f"unsupported operator {op!r}; use one of {OPS}")
+        if op in ("in", "not in"):
+            val = [(_num(v) if col in NUMERIC else v) for v in val]
+        elif col in NUMERIC:
+            val = _num(val)
+        out.append((col, op, val))
+    return out
+
+
+def _test(v: Any, op: str, val: Any) -> bool:
+    # missing values match nothing (as in SQL); comparisons of mixed types too
+    if op == "in":
+        return v in val
+    if op == "not in":
+        return v is not None and v not in val
+    if v is None or val is None:
+        return False
+    try:
+        if op == "=":
+            return v == val
+        if op == "!=":
+            return v != val
+        if op == "<":
+            return v < val
+        if op == "<=":
+            return v <= val
+        if op == ">":
+            return v > val
+        return v >= val
+    except TypeError:
+        return False
+
+
+def _range_may_match(lo: Any, hi: Any, op: str, val: Any) -> bool:
+    """Can some value in [lo, hi] satisfy `op val`?"""
+    try:
+        if op == "=":
+            return lo <= val <= hi
+        if op == "in":
+            return any(lo <= v <= hi for v in val if v is not None)
+        if op == "!=":
+            return not (lo == hi == val)
+        if op == "<":
+            return lo < val
+        if op == "<=":
+            return lo <= val
+        if op == ">":
+            return hi > val
+        if op == ">=":
+            return hi >= val
+    except TypeError:
+        pass
+    return True  # not in / incomparable: can't tell, read it
+
+
+# ---------- file pruning ----------
+
+def _file_bounds(path: Path, st: os.stat_result) -> Optional[Tuple[str, str]]:
+    """(first, last) possible row ts of an EventLog row file, from its name and mtime."""
+    m = ROW_FILE.match(path.name)
+    if not m:
+        return None
+    start = datetime.strptime(m["stamp"], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+    end = datetime.fromtimestamp(st.st_mtime, timezone.utc)
+    return start.isoformat(), end.isoformat()
+
+
+def _file_may_match(path: Path, st: os.stat_result, preds: List[Pred]) -> bool:
+    bounds = _file_bounds(path, st)
+    if bounds is None:
+        return True
+    lo, hi = bounds
+    m = ROW_FILE.match(path.name)
+    for col, op, val in preds:
+        if col == "log_name" and not _test(m["name"], op, val):
+            return False
+        if col == "ts" and not _range_may_match(lo, hi, op, val):
+            return False
+        if col == "date" and not _range_may_match(lo[:10], hi[:10], op, val):
+            return False
+    return True
+
+
+def _run_order(e: os.DirEntry) -> Tuple[str, str]:
+    m = ROW_FILE.match(e.name)
+    return (m["stamp"] if m else "", e.name)
+
+
+def row_files(log_dir: Union[str, Path], preds: Sequence[Pred] = ()) -> Iterator[Path]:
+    """Row files in log_dir that may hold matching rows (oldest first); opens none of them."""
+    try:
+        entries = sorted((e for e in os.scandir(log_dir) if e.is_file() and ROW_FILE.match(e.name)),
+                         key=_run_order)
+    except FileNotFoundError:
+        return
+    for e in entries:
+        p = Path(e.path)
+        if _file_may_match(p, e.stat(), list(preds)):
+            yield p
+
+
+# ---------- per-format scans ----------
+
+def _upper_bound(preds: List[Pred]) -> List[Pred]:
+    # predicates on the time-ordered columns that end a file once exceeded
+    return [(c, op, v) for c, op, v in preds if c in ("date", "ts") and op in ("=", "<", "<=") and v is not None]
+
+
+def _scan_csv(path: Path, preds: List[Pred], columns: Optional[Sequence[str]]) -> Iterator[Dict[str, Any]]:
+    stop = _upper_bound(preds)
+    with path.open("r", newline="", encoding="utf-8") as f:
+        for raw in csv.DictReader(f):
+            row: Dict[str, Any] = {k: (_num(v) if k in NUMERIC else (v if v != "" else None)) for k, v in raw.items()}
+            if any(row.get(c) is not None and row[c][:len(v)] > v for c, _, v in stop):
+                return  # every later row is later still
+            if all(_test(row.get(c), op, v) for c, op, v in preds):
+                yield {k: row.get(k) for k in columns} if columns else row
+
+
+def _group_may_match(rg, names: List[str], preds: List[Pred]) -> bool:
+    for col, op, val in preds:
+        if col not in names:
+            continue
+        stats = rg.column(names.index(col)).statistics
+        if stats is None or not stats.has_min_max:
+            continue
+        if not _range_may_match(stats.min, stats.max, op, val):
+            return False
+    return True
+
+
+def _arrow_mask(table, preds: List[Pred]):
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+    fns = {"=": pc.equal, "!=": pc.not_equal, "<": pc.less, "<=": pc.less_equal,
+           ">": pc.greater, ">=": pc.greater_equal}
+    mask = None
+    for col, op, val in preds:
+        if col not in table.column_names:
+            return pa.array([False] * table.num_rows)  # missing column matches nothing
+        arr = table[col]
+        if op in ("in", "not in"):
+            m = pc.is_in(arr, value_set=pa.array(val))
+            m = pc.and_(pc.invert(m), pc.is_valid(arr)) if op == "not in" else m
+        elif val is None:
+            m = pa.array([False] * table.num_rows)
+        else:
+            m = fns[op](arr, val)
+        mask = m if mask is None else pc.and_kleene(mask, m)
+    return mask
+
+
+def _scan_parquet(path: Path, preds: List[Pred], columns: Optional[Sequence[str]]):
+    """Matching rows of one Parquet file as an Arrow table (None if nothing can match)."""
+    import pyarrow.parquet as pq  # type: ignore
+    pf = pq.ParquetFile(path)
+    names = pf.schema_arrow.names
+    groups = [i for i in range(pf.num_row_groups) if _group_may_match(pf.metadata.row_group(i), names, preds)]
+    if not groups:
+        return None
+    wanted = list(columns) if columns else names
+    read = [c for c in dict.fromkeys(wanted + [c for c, _, _ in preds]) if c in names]
+    table = pf.read_row_groups(groups, columns=read)
+    if preds:
+        table = table.filter(_arrow_mask(table, preds))
+    return table.select([c for c in wanted if c in table.column_names])
+
+
+# ---------- public ----------
+
+def query(log_dir: Union[str, Path] = "data/logs", *, where: Sequence[Pred] = (),
+          columns: Optional[Sequence[str]] = None, as_arrow: bool = False, limit: Optional[int] = None,
+          **eq: Any):
+    """
+    Rows matching every predicate, across all row files in log_dir, oldest run
+    first. where: (column, op, value) with op in OPS; keyword args are equality
+    filters (session="X"). columns projects the result. Returns a list of dicts,
+    or a pyarrow Table with as_arrow=True.
+    """
+    preds = _normalize(where, eq)
+    parts: List[Any] = []  # Arrow tables and lists of dicts, in file order
+    n = 0
+    for path in row_files(log_dir, preds):
+        if limit is not None and n >= limit:
+            break
+        try:
+            if path.suffix == ".parquet":
+                table = _scan_parquet(path, preds, columns)
+                if table is None or not table.num_rows:
+                    continue
+                if limit is not None:
+                    table = table.slice(0, limit - n)
+                parts.append(table if as_arrow else table.to_pylist())
+                n += table.num_rows
+            else:
+                rows = []
+                for row in _scan_csv(path, preds, columns):
+                    rows.append(row)
+                    if limit is not None and n + len(rows) >= limit:
+                        break
+                if rows:
+                    parts.append(rows)
+                    n += len(rows)
+        except Exception:
+            continue  # half-written file or no pyarrow for .parquet: skip it
+    if not as_arrow:
+        return [row for part in parts for row in part]
+    import pyarrow as pa  # type: ignore
+    tables = [p if isinstance(p, pa.Table) else pa.Table.from_pylist(p) for p in parts]
+    if not tables:
+        return pa.table({c: pa.array([]) for c in (columns or [])})
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except TypeError:  # pyarrow < 14
+        return pa.Table.from_pylist([row for t in tables for row in t.to_pylist()])
+
+
+# ---------- CLI ----------
+
+_WHERE = re.compile(r"^\s*(?P<col>\w+)\s*(?P<op>==|!=|<=|>=|=|<|>| in | not in )\s*(?P<val>.*)$")
+
+
+def parse_where(s: str) -> Pred:
+    """'mode=implication', 'date>=2025-01-07', 'event_type in jam,phase' → (col, op, value)."""
+    m = _WHERE.match(s)
+    if not m:
+        raise ValueError(f"cannot parse filter {s!r}; expected <column><op><value>")
+    op = m["op"].strip()
+    val: Any = m["val"].strip()
+    if op in ("in", "not in"):
+        val = [v.strip() for v in val.split(",")]
+    return m["col"], op, val
+
+
+def _cli(argv: list[str]) -> int:
+    import argparse, json
+    ap = argparse.ArgumentParser(prog="python -m src.engine.olap_query")
+    ap.add_argument("--dir", default="data/logs", help="directory of row files (default: data/logs)")
+    ap.add_argument("--where", action="append", default=[], help="filter, repeatable: mode=implication, date>=2025-01-07")
+    ap.add_argument("--columns", default=None, help="comma-separated projection")
+    ap.add_argument("--limit", type=int, default=None)
+    ap.add_argument("--count", action="store_true", help="print the number of matching rows only")
+    args = ap.parse_args(argv)
+    try:
+        where = [parse_where(w) for w in args.where]
+    except ValueError as e:
+        ap.error(str(e))
+    cols = [c for c in args.columns.split(",") if c] if args.columns else None
+    rows = query(args.dir, where=where, columns=cols, limit=args.limit)
+    if args.count:
+        print(len(rows))
+    else:
+        for r in rows:
+            print(json.dumps(r, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    raise SystemExit(_cli(sys.argv[1:]))
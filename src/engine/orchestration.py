@@ -1,11 +1,20 @@
 # src/engine/orchestration.py
 from __future__ import annotations
 
+import atexit
+import fnmatch
 import json
 import os
-import uuid
+import random
+import re
+import threading
+import time
+import weakref
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .spool import Spool
 
 try:
     import yaml  # optional, only for config file
@@ -37,70 +46,467 @@ def load_config(path: Optional[str | os.PathLike] = None) -> Dict[str, Any]:
     return data
 
 
+# -------- Event ids --------
+
+# ULID layout: 48-bit ms timestamp, 80 random bits, Crockford base32 (26 chars),
+# so ids sort by creation time. Within one ms the random part is incremented
+# instead of redrawn, which keeps a process's ids strictly increasing; other
+# processes draw their own 79-bit start (random reseeds after fork), so their
+# ids don't collide.
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]  # 10 bits -> 2 chars
+_RAND_SHIFTS = tuple(range(70, -1, -10))
+
+
+class _UlidClock:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ms = 0
+        self._rand = 0
+        self._head = ""  # encoded _ms
+
+    def take(self, n: int = 1) -> List[str]:
+        """n fresh ids, each greater than every id handed out before."""
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._ms or self._rand + n >= 1 << 80:
+                # a new ms, or this one is used up (or the clock went back): borrow the next
+                self._ms = max(ms, self._ms + 1)
+                self._rand = random.getrandbits(79)  # top bit clear: room to count up
+                self._head = "".join(_PAIRS[(self._ms >> sh) & 1023] for sh in (40, 30, 20, 10, 0))
+            first = self._rand + 1
+            self._rand += n
+            head = self._head
+        return [head + "".join([_PAIRS[(r >> sh) & 1023] for sh in _RAND_SHIFTS]) for r in range(first, first + n)]
+
+
+_ULIDS = _UlidClock()
+
+
+def new_event_ids(n: int = 1) -> List[str]:
+    """n monotonic ULID-style event ids (26 chars, time-ordered)."""
+    return _ULIDS.take(n)
+
+
 # -------- Drivers --------
 
+class DeliveryRejected(RuntimeError):
+    """The receiver refused the events (e.g. HTTP 400): sending them again won't help."""
+
+
 class BaseDriver:
     def publish(self, event_type: str, payload: Dict[str, Any]) -> None:  # pragma: no cover (interface)
         raise NotImplementedError
 
+    def publish_many(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        for event_type, payload in events:
+            self.publish(event_type, payload)
+
+    def flush(self) -> None:
+        """Hand anything buffered to the transport."""
+
+    def deliver(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Hand (type, payload) events over synchronously; raises if they may not
+        have arrived (DeliveryRejected if they never will).
+        """
+        for event_type, payload in events:
+            self.publish(event_type, payload)
+        self.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+# drivers with buffered events, drained at interpreter exit
+_LIVE: "weakref.WeakSet[BaseDriver]" = weakref.WeakSet()
+
+
+@atexit.register
+def _drain_all() -> None:
+    for d in list(_LIVE):
+        try:
+            d.close()
+        except Exception:
+            pass
+
+
+class _Sink:
+    """One open outbox file and the lines waiting to be committed to it."""
+    __slots__ = ("path", "fd", "ino", "size", "opened", "buf", "buf_bytes", "first")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.fd: Optional[int] = None
+        self.ino = 0
+        self.size = 0
+        self.opened = 0.0
+        self.buf: List[bytes] = []
+        self.buf_bytes = 0
+        self.first = 0.0  # monotonic time of the oldest buffered line
+
 
 class FileDriver(BaseDriver):
     """
-    Writes one JSON line per event into data/outbox/*.jsonl for easy smoke tests.
+    Writes one JSON line per event into data/outbox/<prefix><type>.jsonl.
+
+    Lines are buffered per event type and group-committed – one write() for
+    the whole buffer – once it holds buffer_bytes or its oldest line is
+    flush_interval seconds old (a background thread covers idle periods).
+    Files stay open between commits. A file that reaches rotate_bytes or has
+    been open rotate_seconds is sealed as <prefix><type>.<UTC stamp>.jsonl and
+    a fresh one started. flush()/close() commit explicitly; drivers still
+    open at interpreter exit are drained by atexit. fsync=True also fsyncs
+    each commit.
     """
-    def __init__(self, directory: str = "data/outbox", prefix: str = "lee_evt_"):
+    def __init__(self, directory: str = "data/outbox", prefix: str = "lee_evt_", *,
+                 buffer_bytes: int = 64 * 1024, flush_interval: Optional[float] = 0.2,
+                 rotate_bytes: Optional[int] = 64 * 1024 * 1024, rotate_seconds: Optional[float] = None,
+                 fsync: bool = False):
         self.dir = Path(directory)
         self.dir.mkdir(parents=True, exist_ok=True)
         self.prefix = prefix
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._sinks: Dict[str, _Sink] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        _LIVE.add(self)
+
+    def path_for(self, event_type: str) -> Path:
+        return self.dir / f"{self.prefix}{event_type}.jsonl"
 
     def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
-        fname = f"{self.prefix}{event_type}.jsonl"
-        path = self.dir / fname
-        rec = {"type": event_type, "data": payload}
-        with path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self.publish_many(((event_type, payload),))
+
+    def publish_many(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Buffer a batch as one unit: each type's lines of it land in the same write()."""
+        lines = [(t, (json.dumps({"type": t, "data": p}, ensure_ascii=False) + "\n").encode("utf-8"))
+                 for t, p in events]
+        with self._lock:
+            touched = {}
+            for event_type, line in lines:
+                sink = self._sinks.get(event_type)
+                if sink is None:
+                    sink = self._sinks[event_type] = _Sink(self.path_for(event_type))
+                if not sink.buf:
+                    sink.first = time.monotonic()
+                sink.buf.append(line)
+                sink.buf_bytes += len(line)
+                touched[event_type] = sink
+            for sink in touched.values():
+                if sink.buf_bytes >= self.buffer_bytes:
+                    self._commit(sink)
+            if self.flush_interval is not None and self._flusher is None and any(s.buf for s in touched.values()):
+                self._start_flusher()
+
+    def flush(self) -> None:
+        with self._lock:
+            for sink in self._sinks.values():
+                self._commit(sink)
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            for sink in self._sinks.values():
+                self._commit(sink)
+                self._close_fd(sink)
+        t = self._flusher
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=1.0)
+        self._flusher = None
+        self._stop = threading.Event()  # publish() after close() starts over
+
+    # ----------------- internals (called with _lock held) -----------------
+
+    def _start_flusher(self) -> None:
+        self._flusher = threading.Thread(target=self._flush_loop, args=(self._stop,),
+                                         name="outbox-flusher", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self, stop: threading.Event) -> None:
+        interval = self.flush_interval or 0.2
+        while not stop.wait(interval / 2):
+            now = time.monotonic()
+            with self._lock:
+                for sink in self._sinks.values():
+                    if sink.buf and now - sink.first >= interval:
+                        self._commit(sink)
+
+    def _open(self, sink: _Sink) -> None:
+        sink.fd = os.open(sink.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        st = os.fstat(sink.fd)
+        sink.ino, sink.size, sink.opened = st.st_ino, st.st_size, time.monotonic()
+
+    def _close_fd(self, sink: _Sink) -> None:
+        if sink.fd is not None:
+            os.close(sink.fd)
+            sink.fd = None
+
+    def _commit(self, sink: _Sink) -> None:
+        if not sink.buf:
+            return
+        data = b"".join(sink.buf)
+        sink.buf.clear()
+        sink.buf_bytes = 0
+        if sink.fd is not None:
+            try:
+                if os.stat(sink.path).st_ino != sink.ino:
+                    self._close_fd(sink)  # rotated or removed by another writer
+            except FileNotFoundError:
+                self._close_fd(sink)
+        if sink.fd is None:
+            self._open(sink)
+        view = memoryview(data)
+        while view:
+            n = os.write(sink.fd, view)  # O_APPEND: the batch lands whole at the end
+            view = view[n:]
+        if self.fsync:
+            os.fsync(sink.fd)
+        sink.size += len(data)
+        self._maybe_rotate(sink)
+
+    def _maybe_rotate(self, sink: _Sink) -> None:
+        too_big = self.rotate_bytes is not None and sink.size >= self.rotate_bytes
+        too_old = self.rotate_seconds is not None and time.monotonic() - sink.opened >= self.rotate_seconds
+        if not (too_big or too_old):
+            return
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"{time.time() % 1:.6f}"[1:]
+        sealed = sink.path.with_name(f"{sink.path.stem}.{stamp}.jsonl")
+        self._close_fd(sink)
+        try:
+            os.replace(sink.path, sealed)
+        except FileNotFoundError:
+            pass  # another writer rotated it first
 
 
 class WebhookDriver(BaseDriver):
     """
-    Simple HTTP POST webhook. Uses 'requests' if present, otherwise urllib.
-    Config example:
+    HTTP POST webhook with background delivery. Config example:
       driver: webhook
       webhook:
         url: "https://example.com/hook"
         headers:
           Authorization: "Bearer XXX"
+        batch_size: 100     # events per POST; 1 posts {"type", "data"} bodies
+        batch_ms: 50        # max wait to fill a batch
+        queue_size: 10000   # bounded; see overflow
+        overflow: block     # block (up to block_ms, then drop) | drop_new | drop_old
+        block_ms: 1000
+        workers: 1          # delivery threads, each with one keep-alive connection
+        max_retries: 5      # connection errors, 429 and 5xx; jittered exponential backoff
+        timeout: 5
+
+    publish() only enqueues. Workers POST {"events": [{"type", "data"}, ...]}
+    over a persistent connection; other 4xx answers are not retried. Events
+    that are dropped or exhaust their retries are counted in metrics().
     """
-    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None):
+    OVERFLOW = ("block", "drop_new", "drop_old")
+    OPTIONS = ("batch_size", "batch_ms", "queue_size", "overflow", "block_ms", "workers",
+               "max_retries", "backoff_s", "backoff_max_s", "timeout")
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None, *,
+                 batch_size: int = 100, batch_ms: float = 50, queue_size: int = 10_000,
+                 overflow: str = "block", block_ms: float = 1000, workers: int = 1,
+                 max_retries: int = 5, backoff_s: float = 0.1, backoff_max_s: float = 5.0,
+                 timeout: float = 5):
+        if overflow not in self.OVERFLOW:
+            raise ValueError(f"overflow must be one of {self.OVERFLOW}")
         self.url = url
         self.headers = headers or {}
+        self.batch_size = max(1, int(batch_size))
+        self.batch_s = batch_ms / 1000.0
+        self.queue_size = max(1, int(queue_size))
+        self.overflow = overflow
+        self.block_s = block_ms / 1000.0
+        self.n_workers = max(1, int(workers))
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.timeout = timeout
 
-        try:
-            import requests  # type: ignore
-            self._requests = requests
-        except Exception:
-            self._requests = None
+        self._q: "deque[List[Dict[str, Any]]]" = deque()  # chunks of <= batch_size events, posted whole
+        self._queued = 0  # events in _q
+        self._cv = threading.Condition()
+        self._inflight = 0
+        self._workers: List[threading.Thread] = []
+        self._closing = False
+        self._metrics = {"enqueued": 0, "delivered": 0, "batches": 0, "retries": 0,
+                         "failed": 0, "dropped": 0, "connections": 0}
+        self.last_error: Optional[str] = None
+        self._sync_conn = None  # deliver()'s own connection
+        self._sync_lock = threading.Lock()
+        _LIVE.add(self)
+
+    # ----------------- publisher side -----------------
 
     def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
-        body = {"type": event_type, "data": payload}
-        if self._requests:
-            try:
-                self._requests.post(self.url, json=body, headers=self.headers, timeout=5)
-            except Exception:
-                pass
-        else:
-            # urllib fallback
+        self._enqueue([{"type": event_type, "data": payload}])
+
+    def publish_many(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Queue a batch so that each batch_size chunk of it goes out in one request."""
+        evs = [{"type": t, "data": p} for t, p in events]
+        for i in range(0, len(evs), self.batch_size):
+            self._enqueue(evs[i:i + self.batch_size])
+
+    def _enqueue(self, chunk: List[Dict[str, Any]]) -> None:
+        k = len(chunk)
+        with self._cv:
+            def room() -> bool:
+                return self._queued + k <= self.queue_size or not self._q
+            if not room():
+                if self.overflow == "drop_new":
+                    self._metrics["dropped"] += k
+                    return
+                if self.overflow == "drop_old":
+                    while not room():
+                        self._queued -= len(self._q[0])
+                        self._metrics["dropped"] += len(self._q.popleft())
+                elif not self._cv.wait_for(room, timeout=self.block_s):
+                    self._metrics["dropped"] += k  # receiver too slow for too long
+                    return
+            self._q.append(chunk)
+            self._queued += k
+            self._metrics["enqueued"] += k
+            if not self._workers or self._closing:
+                self._start_workers()
+            self._cv.notify_all()
+
+    def deliver(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """POST events now, in batch_size chunks and in order, bypassing the queue."""
+        evs = [{"type": t, "data": p} for t, p in events]
+        with self._sync_lock:
+            for i in range(0, len(evs), self.batch_size):
+                batch = evs[i:i + self.batch_size]
+                self._sync_conn, status = self._deliver(self._sync_conn, batch)
+                ok = 0 < status < 300
+                with self._cv:
+                    self._metrics["delivered" if ok else "failed"] += len(batch)
+                    self._metrics["batches"] += 1
+                if not ok:
+                    err = DeliveryRejected if _rejected(status) else RuntimeError
+                    raise err(f"webhook delivery failed: {self.last_error}")
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cv:
+            return dict(self._metrics, queued=self._queued, inflight=self._inflight)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every queued event is delivered or given up on; False on timeout."""
+        with self._cv:
+            self._cv.notify_all()
+            return self._cv.wait_for(lambda: not self._q and not self._inflight, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        self.flush(timeout)
+        with self._cv:
+            self._closing = True
+            self._cv.notify_all()
+        for t in self._workers:
+            if t is not threading.current_thread():
+                t.join(timeout=self.timeout)
+        self._workers = []
+        with self._sync_lock:
+            if self._sync_conn is not None:
+                self._sync_conn[0].close()
+                self._sync_conn = None
+
+    # ----------------- delivery side -----------------
+
+    def _start_workers(self) -> None:
+        self._closing = False
+        self._workers = [threading.Thread(target=self._work, name=f"webhook-{i}", daemon=True)
+                         for i in range(self.n_workers)]
+        for t in self._workers:
+            t.start()
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        with self._cv:
+            self._cv.wait_for(lambda: self._q or self._closing)
+            if not self._q:
+                return []
+            deadline = time.monotonic() + self.batch_s
+            while self._queued < self.batch_size and not self._closing:
+                left = deadline - time.monotonic()
+                if left <= 0 or not self._cv.wait(left):
+                    break
+            batch = self._q.popleft()
+            while self._q and len(batch) + len(self._q[0]) <= self.batch_size:
+                batch += self._q.popleft()  # chunks are never split
+            self._queued -= len(batch)
+            self._inflight += len(batch)
+            self._cv.notify_all()  # room for blocked publishers
+            return batch
+
+    def _work(self) -> None:
+        conn = None
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+            conn, status = self._deliver(conn, batch)
+            ok = 0 < status < 300
+            with self._cv:
+                self._inflight -= len(batch)
+                self._metrics["delivered" if ok else "failed"] += len(batch)
+                self._metrics["batches"] += 1
+                self._cv.notify_all()
+        if conn is not None:
+            conn[0].close()
+
+    def _connect(self):
+        import http.client
+        from urllib.parse import urlsplit
+        u = urlsplit(self.url)
+        cls = http.client.HTTPSConnection if u.scheme == "https" else http.client.HTTPConnection
+        with self._cv:
+            self._metrics["connections"] += 1
+        return cls(u.netloc, timeout=self.timeout), (u.path or "/") + (f"?{u.query}" if u.query else "")
+
+    def _deliver(self, conn, batch: List[Dict[str, Any]]):
+        """(conn, last HTTP status or 0 if no answer) after up to max_retries retries."""
+        body = batch[0] if self.batch_size == 1 else {"events": batch}
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        headers = dict(self.headers, **{"Content-Type": "application/json"})
+        status = 0
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self._cv:
+                    self._metrics["retries"] += 1
+                # full jitter: spread retries of many senders over the window
+                time.sleep(random.uniform(0, min(self.backoff_max_s, self.backoff_s * 2 ** (attempt - 1))))
             try:
-                import urllib.request
-                req = urllib.request.Request(self.url, method="POST")
-                for k, v in self.headers.items():
-                    req.add_header(k, v)
-                req.add_header("Content-Type", "application/json")
-                data = json.dumps(body).encode("utf-8")
-                with urllib.request.urlopen(req, data=data, timeout=5):  # nosec - tooling hook
-                    pass
-            except Exception:
-                pass
+                if conn is None:
+                    conn = self._connect()
+                c, path = conn
+                c.request("POST", path, body=data, headers=headers)
+                resp = c.getresponse()
+                resp.read()  # drain so the connection can be reused
+                status = resp.status
+                if status < 300:
+                    return conn, status
+                self.last_error = f"HTTP {status}"
+                if resp.will_close:
+                    c.close()
+                    conn = None
+                if _rejected(status):
+                    return conn, status  # the receiver rejected it: retrying won't help
+            except Exception as e:
+                status = 0
+                self.last_error = f"{type(e).__name__}: {e}"
+                if conn is not None:
+                    conn[0].close()
+                conn = None
+        return conn, status
+
+
+def _rejected(status: int) -> bool:
+    # 4xx other than 429 (too many requests): the request itself is refused
+    return 400 <= status < 500 and status != 429
 
 
 # (Placeholder) Kafka driver shape, not wired by default
@@ -114,34 +520,461 @@ class KafkaDriver(BaseDriver):  # pragma: no cover (stub)
         pass
 
 
+# -------- Fan-out --------
+
+Route = Callable[[str, Dict[str, Any]], bool]
+
+
+def compile_route(spec: Optional[Dict[str, Any]]) -> Route:
+    """
+    route: {types: [jam, "run_*"], phases: [JAM, MEM]} -> predicate(type, payload).
+    types are glob patterns on the event type, phases match payload["phase"]
+    (case-insensitive); a missing key matches everything.
+    """
+    spec = spec or {}
+    types, phases = spec.get("types"), spec.get("phases")
+    types = [types] if isinstance(types, str) else types
+    phases = [phases] if isinstance(phases, str) else phases
+    type_ok = re.compile("|".join(fnmatch.translate(t) for t in types)).match if types else None
+    phase_set = frozenset(str(p).upper() for p in phases) if phases else None
+    if type_ok is None and phase_set is None:
+        return lambda event_type, payload: True
+
+    def match(event_type: str, payload: Dict[str, Any]) -> bool:
+        if type_ok is not None and type_ok(event_type) is None:
+            return False
+        return phase_set is None or str(payload.get("phase", "")).upper() in phase_set
+    return match
+
+
+class _Lane:
+    """One fan-out target: its driver, route, queue, worker and counters."""
+    __slots__ = ("name", "driver", "match", "queue_size", "overflow", "block_s", "batch_size",
+                 "q", "cv", "inflight", "worker", "closing", "started", "counts", "last_error", "last_lag_ms")
+
+    def __init__(self, name: str, driver: BaseDriver, match: Route, *, queue_size: int = 10_000,
+                 overflow: str = "block", block_ms: float = 1000, batch_size: int = 500) -> None:
+        if overflow not in WebhookDriver.OVERFLOW:
+            raise ValueError(f"overflow must be one of {WebhookDriver.OVERFLOW}")
+        self.name = name
+        self.driver = driver
+        self.match = match
+        self.queue_size = max(1, int(queue_size))
+        self.overflow = overflow
+        self.block_s = block_ms / 1000.0
+        self.batch_size = max(1, int(batch_size))
+        self.q: "deque[Tuple[str, Dict[str, Any], float]]" = deque()  # (type, payload, enqueued at)
+        self.cv = threading.Condition()
+        self.inflight = 0
+        self.worker: Optional[threading.Thread] = None
+        self.closing = False
+        self.started = 0.0
+        self.counts = {"enqueued": 0, "delivered": 0, "filtered": 0, "dropped": 0, "errors": 0}
+        self.last_error: Optional[str] = None
+        self.last_lag_ms = 0.0
+
+    def deliver(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """driver.deliver() with this lane's counters; the driver's error is re-raised."""
+        try:
+            self.driver.deliver(events)
+        except Exception as e:
+            with self.cv:
+                self.counts["errors"] += len(events)
+                self.last_error = f"{type(e).__name__}: {e}"
+            raise
+        with self.cv:
+            self.counts["delivered"] += len(events)
+
+
+class FanOutDriver(BaseDriver):
+    """
+    Sends every event to several drivers at once. Config example:
+      drivers:
+        - driver: file
+          file: {dir: data/outbox}
+        - name: alerts
+          driver: webhook
+          webhook: {url: "https://example.com/hook"}
+          route: {types: [jam, "run_*"], phases: [JAM]}
+          queue_size: 10000   # per driver; overflow/block_ms as for the webhook
+          batch_size: 500     # events handed to the driver per publish_many()
+
+    Each driver has its own bounded queue and worker thread, so publish()
+    only filters and enqueues: a slow sink falls behind on its own without
+    holding up the caller or the other sinks. Routes are compiled once.
+    metrics() reports per-driver counters, queue depth, lag and throughput.
+    """
+    LANE_OPTIONS = ("queue_size", "overflow", "block_ms", "batch_size")
+
+    def __init__(self, lanes: Sequence[_Lane]):
+        self.lanes = list(lanes)
+        _LIVE.add(self)
+
+    # ----------------- publisher side -----------------
+
+    def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
+        self.publish_many(((event_type, payload),))
+
+    def publish_many(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        now = time.monotonic()
+        for lane in self.lanes:
+            picked = [(t, p, now) for t, p in events if lane.match(t, p)]
+            with lane.cv:
+                lane.counts["filtered"] += len(events) - len(picked)
+                if picked:
+                    self._enqueue(lane, picked)
+
+    def deliver(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Synchronous: every matching driver gets its events; raises if any of them failed."""
+        failed = []
+        for lane in self.lanes:
+            picked = [(t, p) for t, p in events if lane.match(t, p)]
+            if not picked:
+                continue
+            try:
+                lane.deliver(picked)
+            except Exception:
+                failed.append(lane.name)
+        if failed:
+            raise RuntimeError(f"delivery failed for {', '.join(failed)}")
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        out = {}
+        for lane in self.lanes:
+            with lane.cv:
+                elapsed = now - lane.started if lane.started else 0.0
+                out[lane.name] = dict(lane.counts, queued=len(lane.q), inflight=lane.inflight,
+                                      lag_ms=round((now - lane.q[0][2]) * 1000, 3) if lane.q else 0.0,
+                                      last_lag_ms=lane.last_lag_ms,
+                                      events_per_s=round(lane.counts["delivered"] / elapsed, 1) if elapsed else 0.0,
+                                      last_error=lane.last_error)
+        return out
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait for every queue to drain into its driver, then flush the drivers; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ok = True
+        for lane in self.lanes:
+            with lane.cv:
+                left = None if deadline is None else max(0.0, deadline - time.monotonic())
+                ok = lane.cv.wait_for(lambda: not lane.q and not lane.inflight, timeout=left) and ok
+            try:
+                lane.driver.flush()
+            except Exception as e:
+                lane.last_error = f"{type(e).__name__}: {e}"
+        return ok
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        self.flush(timeout)
+        for lane in self.lanes:
+            with lane.cv:
+                lane.closing = True
+                lane.cv.notify_all()
+            t = lane.worker
+            if t is not None and t is not threading.current_thread():
+                t.join(timeout=timeout)
+            lane.worker = None
+            try:
+                lane.driver.close()
+            except Exception as e:
+                lane.last_error = f"{type(e).__name__}: {e}"
+
+    # ----------------- per-driver workers -----------------
+
+    def _enqueue(self, lane: _Lane, picked: List[Tuple[str, Dict[str, Any], float]]) -> None:
+        # called with lane.cv held
+        k = len(picked)
+
+        def room() -> bool:
+            return len(lane.q) + k <= lane.queue_size or not lane.q
+        if not room():
+            if lane.overflow == "drop_new":
+                lane.counts["dropped"] += k
+                return
+            if lane.overflow == "drop_old":
+                while not room():
+                    lane.q.popleft()
+                    lane.counts["dropped"] += 1
+            elif not lane.cv.wait_for(room, timeout=lane.block_s):
+                lane.counts["dropped"] += k  # this sink is too slow for too long
+                return
+        lane.q.extend(picked)
+        lane.counts["enqueued"] += k
+        if lane.worker is None or lane.closing:
+            lane.closing = False
+            lane.started = lane.started or time.monotonic()
+            lane.worker = threading.Thread(target=self._work, args=(lane,), name=f"fanout-{lane.name}", daemon=True)
+            lane.worker.start()
+        lane.cv.notify_all()
+
+    def _work(self, lane: _Lane) -> None:
+        while True:
+            with lane.cv:
+                lane.cv.wait_for(lambda: lane.q or lane.closing)
+                if not lane.q:
+                    return
+                batch = [lane.q.popleft() for _ in range(min(lane.batch_size, len(lane.q)))]
+                lane.inflight = len(batch)
+                lane.cv.notify_all()  # room for blocked publishers
+            err = None
+            try:
+                lane.driver.publish_many([(t, p) for t, p, _ in batch])
+            except Exception as e:
+                err = f"{type(e).__name__}: {e}"
+            with lane.cv:
+                lane.inflight = 0
+                lane.last_lag_ms = round((time.monotonic() - batch[-1][2]) * 1000, 3)
+                if err is None:
+                    lane.counts["delivered"] += len(batch)
+                else:
+                    lane.counts["errors"] += len(batch)
+                    lane.last_error = err
+                lane.cv.notify_all()
+
+
+# -------- Spool dispatcher --------
+
+class SpoolDispatcher:
+    """
+    Drains a Spool into a driver on a background thread: reads the events past
+    the consumer's ack, deliver()s those that match in order, then acks. Each
+    fan-out lane gets its own dispatcher (consumer = lane name), so a failing
+    sink neither holds up nor re-feeds the others. A failed delivery is retried
+    after a jittered, growing pause; nothing is acked until the driver
+    accepted it, so unacknowledged events survive a restart and are replayed.
+    A batch the driver rejects (DeliveryRejected) or that failed max_attempts
+    times in a row (0: retry forever) is dead-lettered to <spool>/dead/ and
+    acked past, so one bad batch cannot hold up the spool for good.
+    """
+
+    def __init__(self, spool: Spool, driver: "BaseDriver | _Lane", *, consumer: str = "",
+                 match: Optional[Route] = None, batch_size: int = 500,
+                 backoff_s: float = 0.1, backoff_max_s: float = 5.0, max_attempts: int = 50):
+        self.spool = spool
+        self.driver = driver
+        self.consumer = consumer
+        self.match = match
+        self.batch_size = max(1, int(batch_size))
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.max_attempts = max(0, int(max_attempts))
+        self.delivered = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.last_error: Optional[str] = None
+        self._cv = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self) -> None:
+        """New events are in the spool."""
+        with self._cv:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop = False
+                name = f"spool-dispatcher-{self.consumer}" if self.consumer else "spool-dispatcher"
+                self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+                self._thread.start()
+            self._cv.notify_all()
+
+    def wait(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until everything spooled so far is acknowledged; False on timeout."""
+        with self._cv:
+            self._cv.notify_all()
+            return self._cv.wait_for(lambda: self.spool.pending(self.consumer) == 0, timeout=timeout)
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        with self._cv:
+            self._stop = True
+            self._cv.notify_all()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            with self._cv:
+                self._cv.wait_for(lambda: self._stop or self.spool.pending(self.consumer) > 0)
+                if self._stop:
+                    return
+            batch = self.spool.read(self.spool.acked_by(self.consumer), self.batch_size)
+            picked = [ev for ev in batch if self.match is None or self.match(ev[1], ev[2])]
+            try:
+                if picked:
+                    self.driver.deliver([(t, d) for _, t, d in picked])
+                # an empty batch means only unreadable lines are left: ack past them
+                self.spool.ack(batch[-1][0] if batch else self.spool.next_seq - 1, self.consumer)
+            except Exception as e:
+                failures += 1
+                err = f"{type(e).__name__}: {e}"
+                with self._cv:
+                    self.failures += 1
+                    self.last_error = err
+                if picked and (isinstance(e, DeliveryRejected) or 0 < self.max_attempts <= failures):
+                    try:
+                        self.spool.dead_letter(picked, err, self.consumer)
+                        self.spool.ack(batch[-1][0], self.consumer)
+                    except Exception:
+                        pass  # can't set it aside (disk?): keep retrying
+                    else:
+                        failures = 0
+                        with self._cv:
+                            self.dead_lettered += len(picked)
+                            self._cv.notify_all()
+                        continue
+                with self._cv:
+                    pause = random.uniform(0, min(self.backoff_max_s, self.backoff_s * 2 ** min(failures - 1, 16)))
+                    self._cv.wait_for(lambda: self._stop, timeout=pause)
+                continue
+            failures = 0
+            with self._cv:
+                self.delivered += len(picked)
+                self._cv.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"pending": self.spool.pending(self.consumer), "delivered": self.delivered,
+                "failures": self.failures, "dead_lettered": self.dead_lettered, "last_error": self.last_error}
+
+
 # -------- Orchestrator --------
 
 class Orchestrator:
     """
     Central facade. Choose a driver from config and expose publish().
+
+    With a `spool:` section, publish() appends to a write-ahead Spool
+    (spool.py) and a SpoolDispatcher feeds the driver from it:
+      spool:
+        dir: data/spool
+        segment_mb: 16
+        fsync: false
+        max_attempts: 50   # then the batch goes to <dir>/dead/; 0 retries forever
+    With a `drivers:` fan-out every driver has its own dispatcher and spool
+    ack (keyed by its name), so each sink is fed at its own pace. Events still
+    unacknowledged when the process stopped are replayed on the next start, to
+    the sinks that did not ack them. Delivery is at-least-once; receivers
+    dedupe on event_id.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.cfg = config or load_config()
         self.driver = self._build_driver(self.cfg)
+        self.spool: Optional[Spool] = None
+        self.dispatcher: Optional[SpoolDispatcher] = None  # the single driver's; per lane in dispatchers
+        self.dispatchers: Dict[str, SpoolDispatcher] = {}
+        spool_cfg = self.cfg.get("spool")
+        if spool_cfg:
+            spool_cfg = spool_cfg if isinstance(spool_cfg, dict) else {}
+            lanes = self.driver.lanes if isinstance(self.driver, FanOutDriver) else []
+            self.spool = Spool(spool_cfg.get("dir", "data/spool"),
+                               segment_bytes=int(spool_cfg.get("segment_mb", 16) * 1024 * 1024),
+                               fsync=bool(spool_cfg.get("fsync", False)),
+                               consumers=[lane.name for lane in lanes] or [""])
+            opts = {"batch_size": spool_cfg.get("batch_size", 500), "max_attempts": spool_cfg.get("max_attempts", 50)}
+            for lane in lanes:
+                self.dispatchers[lane.name] = SpoolDispatcher(self.spool, lane, consumer=lane.name,
+                                                              match=lane.match, **opts)
+            if not lanes:
+                self.dispatcher = self.dispatchers[""] = SpoolDispatcher(self.spool, self.driver, **opts)
+            if self.spool.pending():
+                for d in self.dispatchers.values():
+                    d.notify()  # replay what the last run left unacknowledged
 
     def _build_driver(self, cfg: Dict[str, Any]) -> BaseDriver:
+        if cfg.get("drivers"):
+            lanes = []
+            for i, sub in enumerate(cfg["drivers"]):
+                name = sub.get("name") or f"{(sub.get('driver') or 'file').lower()}{i}"
+                opts = {k: v for k, v in sub.items() if k in FanOutDriver.LANE_OPTIONS}
+                lanes.append(_Lane(name, self._build_driver(sub), compile_route(sub.get("route")), **opts))
+            return FanOutDriver(lanes)
         kind = (cfg.get("driver") or "file").lower()
         if kind == "webhook":
             webhook = cfg.get("webhook") or {}
-            return WebhookDriver(url=webhook.get("url", ""), headers=webhook.get("headers") or {})
+            opts = {k: v for k, v in webhook.items() if k in WebhookDriver.OPTIONS}
+            return WebhookDriver(url=webhook.get("url", ""), headers=webhook.get("headers") or {}, **opts)
         elif kind == "kafka":
             return KafkaDriver(**(cfg.get("kafka") or {}))
         else:
             file_cfg = cfg.get("file") or {}
+            rotate_mb = file_cfg.get("rotate_mb", 64)
             return FileDriver(directory=file_cfg.get("dir", "data/outbox"),
-                              prefix=file_cfg.get("prefix", "lee_evt_"))
+                              prefix=file_cfg.get("prefix", "lee_evt_"),
+                              buffer_bytes=int(file_cfg.get("buffer_kb", 64)) * 1024,
+                              flush_interval=file_cfg.get("flush_ms", 200) / 1000.0,
+                              rotate_bytes=int(rotate_mb * 1024 * 1024) if rotate_mb else None,
+                              rotate_seconds=file_cfg.get("rotate_s"),
+                              fsync=bool(file_cfg.get("fsync", False)))
 
     def publish(self, event_type: str, payload: Dict[str, Any]) -> None:
+        self.publish_many(((event_type, payload),))
+
+    def publish_many(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Publish (type, payload) pairs as one batch: ids are assigned in one go
+        and the driver (or spool) gets the whole batch in one call. Returns the
+        event ids, in order.
+        """
         try:
-            payload = dict(payload)
-            payload.setdefault("event_id", uuid.uuid4().hex[:16])
-            self.driver.publish(event_type, payload)
+            batch = [(t, dict(p)) for t, p in events]
+            ids = iter(new_event_ids(len(batch)))
+            for _, payload in batch:
+                payload.setdefault("event_id", next(ids))
+            if self.spool is not None:
+                try:
+                    self.spool.append_many(batch)
+                    for d in self.dispatchers.values():
+                        d.notify()
+                    return [p["event_id"] for _, p in batch]
+                except Exception:
+                    pass  # spool unwritable (disk full?): publish directly rather than lose it
+            self.driver.publish_many(batch)
+            return [p["event_id"] for _, p in batch]
         except Exception:
             # never crash caller on orchestration errors
+            return []
+
+    def metrics(self) -> Dict[str, Any]:
+        """Driver counters (per driver when fanning out), plus the spool's when there is one."""
+        try:
+            m = getattr(self.driver, "metrics", None)
+            out: Dict[str, Any] = dict(m()) if m else {}
+            if self.dispatcher is not None:
+                out["spool"] = self.dispatcher.metrics()
+            elif self.dispatchers:
+                for name, d in self.dispatchers.items():
+                    out.setdefault(name, {})["spool"] = d.metrics()  # this driver's own position
+                out["spool"] = {"pending": self.spool.pending()}
+            return out
+        except Exception:
+            return {}
+
+    def flush(self, timeout: Optional[float] = 10.0) -> None:
+        """Wait for spooled events to be delivered, then commit what the driver is buffering."""
+        try:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for d in self.dispatchers.values():
+                d.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            self.driver.flush()
+        except Exception:
             pass
+
+    def close(self) -> None:
+        """Flush and release the driver's files/connections; undelivered spooled events stay for replay."""
+        try:
+            self.flush()
+            if self.spool is not None:
+                for d in self.dispatchers.values():
+                    d.stop()
+                self.spool.close()
+            self.driver.close()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "Orchestrator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,209 @@
+# src/engine/outbox.py
+from __future__ import annotations
+import json, os, re, time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Consumer side of the file outbox (orchestration.FileDriver). Each consumer
+# group keeps its own committed position per event type in
+#   <outbox>/.offsets/<group>.json  {"<type>": {"ino", "offset", "after"}}
+# so a downstream job resumes where it committed instead of re-reading the
+# outbox. A position names the file by inode, which survives FileDriver's
+# rotation (the active <prefix><type>.jsonl is renamed to
+# <prefix><type>.<UTC stamp>.jsonl), plus "after": the newest sealed file
+# before it, so reading can resume with the next file if that one is deleted.
+# Delivery is at-least-once: poll() hands out events, commit() persists the
+# position past them; a consumer that dies in between sees them again.
+
+OFFSETS_DIR = ".offsets"
+_GROUP = re.compile(r"^[\w.-]+$")
+_STAMP = r"\d{8}T\d{6}\.\d{6}"
+
+Pos = Dict[str, Any]  # {"ino", "offset", "after"}
+
+
+def _outbox_files(directory: Path, prefix: str) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+    """{type: [(file name, stamp or None for the active file), ...]} oldest first."""
+    pat = re.compile(rf"^{re.escape(prefix)}(?P<type>.+?)(?:\.(?P<stamp>{_STAMP}))?\.jsonl$")
+    out: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return out
+    for name in names:
+        m = pat.match(name)
+        if m:
+            out.setdefault(m["type"], []).append((name, m["stamp"]))
+    for files in out.values():
+        files.sort(key=lambda f: (f[1] is None, f[1] or ""))  # sealed by stamp, then the active file
+    return out
+
+
+class OutboxConsumer:
+    """
+    Tails <directory>/<prefix><type>*.jsonl for one consumer group:
+      c = OutboxConsumer("billing")
+      for ev in c.poll():      # {"type", "data"} records, oldest first per type
+          handle(ev)
+      c.commit()               # persist: these are not handed out again
+    A new group starts at the oldest event still in the outbox.
+    """
+
+    def __init__(self, group: str, directory: Union[str, Path] = "data/outbox", prefix: str = "lee_evt_", *,
+                 types: Optional[Sequence[str]] = None):
+        if not _GROUP.match(group):
+            raise ValueError(f"group must match {_GROUP.pattern}: {group!r}")
+        self.group = group
+        self.dir = Path(directory)
+        self.prefix = prefix
+        self.types = set(types) if types else None
+        self.offsets_path = self.dir / OFFSETS_DIR / f"{group}.json"
+        self.committed: Dict[str, Pos] = self._load()
+        self._pos: Dict[str, Pos] = {t: dict(p) for t, p in self.committed.items()}  # read position
+
+    # ----------------- public -----------------
+
+    def poll(self, max_n: int = 1000) -> List[Dict[str, Any]]:
+        """Up to max_n complete events past the read position (not yet committed)."""
+        out: List[Dict[str, Any]] = []
+        for etype, files in sorted(_outbox_files(self.dir, self.prefix).items()):
+            if len(out) >= max_n:
+                break
+            if self.types is None or etype in self.types:
+                self._read_type(etype, files, out, max_n)
+        return out
+
+    def commit(self) -> None:
+        """Everything poll() returned so far is processed."""
+        if self._pos == self.committed:
+            return
+        self.offsets_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.offsets_path.with_name(self.offsets_path.name + ".tmp")
+        tmp.write_text(json.dumps(self._pos, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.offsets_path)
+        self.committed = {t: dict(p) for t, p in self._pos.items()}
+
+    def rewind(self) -> None:
+        """Forget uncommitted reads: the next poll() starts at the committed position."""
+        self._pos = {t: dict(p) for t, p in self.committed.items()}
+
+    def tail(self, *, follow: bool = True, interval: float = 0.5, max_n: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Batches from poll(); with follow, waits for new events instead of stopping. Commit as you go."""
+        while True:
+            batch = self.poll(max_n)
+            if batch:
+                yield batch
+            elif not follow:
+                return
+            else:
+                time.sleep(interval)
+
+    # ----------------- internals -----------------
+
+    def _load(self) -> Dict[str, Pos]:
+        try:
+            data = json.loads(self.offsets_path.read_text(encoding="utf-8"))
+            return {t: p for t, p in data.items() if isinstance(p, dict)}
+        except Exception:
+            return {}
+
+    def _start(self, files: List[Tuple[str, Optional[str], int]], pos: Optional[Pos]) -> Tuple[int, int]:
+        """(index into files, byte offset) where reading resumes."""
+        if not pos:
+            return 0, 0
+        for i, (_, _, ino) in enumerate(files):
+            if ino == pos.get("ino"):
+                return i, int(pos.get("offset", 0))
+        after = pos.get("after") or ""
+        for i, (_, stamp, _) in enumerate(files):  # our file is gone: go on with the next one
+            if stamp is None or stamp > after:
+                return i, 0
+        return len(files), 0
+
+    def _read_type(self, etype: str, files: List[Tuple[str, Optional[str]]], out: List[Dict[str, Any]],
+                   max_n: int) -> None:
+        stated = []
+        for name, stamp in files:
+            try:
+                stated.append((name, stamp, os.stat(self.dir / name).st_ino))
+            except FileNotFoundError:
+                continue  # rotated or removed since the listing; the next poll sees it
+        i, offset = self._start(stated, self._pos.get(etype))
+        while i < len(stated) and len(out) < max_n:
+            name, stamp, ino = stated[i]
+            try:
+                f = open(self.dir / name, "rb")
+            except FileNotFoundError:
+                return
+            with f:
+                if os.fstat(f.fileno()).st_ino != ino:
+                    return  # the active file was rotated under us; the next poll resumes by inode
+                if offset > os.fstat(f.fileno()).st_size:
+                    offset = 0  # truncated and rewritten: start over
+                f.seek(offset)
+                torn = False
+                for line in f:
+                    if len(out) >= max_n:
+                        break
+                    if not line.endswith(b"\n"):
+                        torn = True  # a half-written line waits for the next poll
+                        break
+                    offset += len(line)
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue  # skip bad lines but don't die
+                # a sealed file never grows again, so its torn last line (a crash) never completes
+                at_end = offset >= os.fstat(f.fileno()).st_size or (torn and stamp is not None)
+            after = next((s for _, s, _ in reversed(stated[:i]) if s), "")
+            if at_end and stamp is not None and i + 1 < len(stated):
+                self._pos[etype] = {"ino": stated[i + 1][2], "offset": 0, "after": stamp}
+                i, offset = i + 1, 0
+                continue
+            self._pos[etype] = {"ino": ino, "offset": offset, "after": after}
+            return
+
+
+# ---------- CLI ----------
+
+def _cli(argv: list[str]) -> int:
+    import argparse, sys
+    ap = argparse.ArgumentParser(prog="lee outbox")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("tail", help="print new outbox events as JSON lines and commit the group's offsets")
+    t.add_argument("--group", required=True, help="consumer group; each keeps its own committed offsets")
+    t.add_argument("--dir", default="data/outbox")
+    t.add_argument("--prefix", default="lee_evt_")
+    t.add_argument("--type", action="append", dest="types", help="event type to read, repeatable (default: all)")
+    t.add_argument("-f", "--follow", action="store_true", help="keep waiting for new events")
+    t.add_argument("--interval", type=float, default=0.5, help="follow: seconds between polls")
+    t.add_argument("--max", type=int, default=None, help="stop after N events")
+    t.add_argument("--no-commit", action="store_true", help="print without moving the group's offsets")
+    args = ap.parse_args(argv)
+    try:
+        c = OutboxConsumer(args.group, args.dir, args.prefix, types=args.types)
+    except ValueError as e:
+        ap.error(str(e))
+    left = args.max
+    try:
+        while left is None or left > 0:
+            batch = c.poll(1000 if left is None else min(1000, left))
+            if not batch:
+                if not args.follow:
+                    break
+                time.sleep(args.interval)
+                continue
+            for ev in batch:
+                sys.stdout.write(json.dumps(ev, ensure_ascii=False) + "\n")
+            sys.stdout.flush()  # printed first, committed second: at-least-once
+            if not args.no_commit:
+                c.commit()
+            if left is not None:
+                left -= len(batch)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    raise SystemExit(_cli(sys.argv[1:]))
@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import Any, Dict, Optional, List
 import json, time, uuid
 
+from .artifact_writer import ArtifactWriter, write_artifact
+
 LOG_DIR = Path("data/logs")
 
 def store_entry(**kwargs) -> None: return None
@@ -27,6 +29,17 @@ class Pipeline:
         self.session = session
         self.patient_id = patient_id
         self.run_id: Optional[str] = kw.get("run_id")
+        self._ready_dir: Optional[Path] = None
+        # Optional background writer (see artifact_writer.ArtifactWriter); None = write inline
+        self.artifact_writer: Optional[ArtifactWriter] = kw.get("artifact_writer")
+
+    def _log_dir(self) -> Path:
+        # mkdir once per directory, not once per run
+        log_dir = getattr(self, "LOG_DIR", LOG_DIR)
+        if log_dir != self._ready_dir:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            self._ready_dir = log_dir
+        return log_dir
 
     def _normalize(self, text: str) -> str:
         t = text.replace("IMPLIES", "->")
@@ -48,18 +61,86 @@ class Pipeline:
             or ("&" in text and "~" in text)
         )
 
-    def run(self, text: str) -> Dict[str, Any]:
+    def _write_logs(self, log_json_path: Path, log_name: str, res: Dict[str, Any], text: str, pattern: str, jammy: bool,
+                    rid: str, t0: float, phases: List[str], transitions: List[Dict[str, Any]]) -> None:
+        # Render every artifact to text now (res is mutated after return), then
+        # write inline or hand off to the background ArtifactWriter.
+        artifacts = [(log_json_path, json.dumps(res, ensure_ascii=False), "json")]
+
+        # --- provenance events with monotonic 'step' and enrichment details ---
+        enrichment = {"ner": ner_extract(text), "risk": dm_classify(text), "domain": self.domain}
+        step = 1
+        events = []
+        events.append({"kind": "start",   "step": step, "run_id": rid, "ts": t0, "session": self.session, "domain": self.domain}); step += 1
+        events.append({"kind": "prenorm", "step": step, "run_id": rid, "ts": t0, "pattern": pattern}); step += 1
+        events.append({"kind": "enrich",  "step": step, "run_id": rid, "ts": t0, "enrichment": enrichment}); step += 1
+        if jammy:
+            events.append({"kind": "detect", "step": step, "run_id": rid, "ts": t0,
+                           "reason": "contradiction", "phase_after": "JAM",
+                           "details": {"enrichment": enrichment, "pattern": pattern}})
+        else:
+            events.append({"kind": "detect", "step": step, "run_id": rid, "ts": t0,
+                           "reason": "non-contradiction", "phase_after": "MEM",
+                           "details": {"enrichment": enrichment, "pattern": pattern}})
+        prov = "".join(json.dumps(ev, ensure_ascii=False) + "\n" for ev in events)
+        artifacts.append((log_json_path.with_suffix(".prov.jsonl"), prov, "prov"))
+
+        # timeline.md
+        tl = [
+            f"# LEE Timeline — {log_name}", "",
+            f"- run_id: `{rid}`", f"- domain: `{self.domain}`", f"- session: `{self.session}`", "",
+            "## Phases", " → ".join(phases), "", "## Events",
+        ]
+        for ev in events: tl.append(f"- {ev['ts']:.6f}: [{ev['step']}] **{ev['kind']}**")
+        artifacts.append((log_json_path.with_suffix(".timeline.md"), "\n".join(tl), "render"))
+
+        # timeline.dot (simple phase graph)
+        edges = [(tr["from"], tr["to"]) for tr in transitions]
+        dot_lines = ["digraph LEE {", "  rankdir=LR;", '  node [shape=box];']
+        for a, b in edges: dot_lines.append(f'  "{a}" -> "{b}";')
+        dot_lines.append("}")
+        artifacts.append((log_json_path.with_suffix(".timeline.dot"), "\n".join(dot_lines), "render"))
+
+        # one manifest line per run: retention and "newest run" never glob the directory
+        def index_run() -> None:
+            try:
+                from .log_index import index_for
+                written = [p for p, _b, _k in artifacts[1:] if writer is None or p.exists()]  # minus dropped renders
+                index_for(log_json_path.parent).add(
+                    log_name, rid, log_json_path, written,
+                    size=sum(len(b.encode("utf-8")) for _p, b, _k in artifacts), created=t0,
+                )
+            except Exception:
+                pass
+
+        writer = self.artifact_writer
+        if writer is not None:
+            writer.submit(artifacts)
+            writer.defer(index_run)  # after the files exist, off the caller's thread
+        else:
+            for path, body, _kind in artifacts:
+                write_artifact(path, body)
+            index_run()
+
+    def run(self, text: str, *, meta: Optional[Dict[str, Any]] = None,
+            log_name: Optional[str] = None) -> Dict[str, Any]:
+        # log_name overrides self.log_name for this run only (PipelineSession);
+        # meta (nl, lambda_nf, adapter from nlp.handshake) rides along in the result
+        log_name = log_name or self.log_name
         rid = self.run_id or str(uuid.uuid4())
         t0 = time.time()
+        p0 = time.perf_counter()
 
         pattern = self._normalize(text)
         jammy = self._is_contradiction(text, pattern)
+        if not jammy and meta and meta.get("nl"):
+            jammy = self._is_contradiction(str(meta["nl"]), pattern)  # the NL the pattern came from
 
         transitions = []
         phases = ["ALIVE"]
         if jammy:
             transitions.append({"from": "ALIVE", "to": "JAM", "ts": t0, "details": {
-                "reason": "detect-contradiction", "pattern": pattern, "nl": text
+                "reason": "detect-contradiction", "pattern": pattern, "nl": text, **(meta or {})
             }})
             phases.append("JAM")
         transitions.append({"from": phases[-1], "to": "MEM", "ts": t0 + 1e-5, "details": {"reason": "archive"}})
@@ -74,54 +155,17 @@ class Pipeline:
             "domain": self.domain,
             "session": self.session,
         }
+        if meta:
+            res["meta"] = dict(meta)
 
-        try: store_entry(log_name=self.log_name, domain=self.domain, res=res)
+        try: store_entry(log_name=log_name, domain=self.domain, res=res)
         except Exception: pass
 
         if self.enable_provenance:
-            log_dir = getattr(self, "LOG_DIR", LOG_DIR)
-            log_dir.mkdir(parents=True, exist_ok=True)
-            log_json_path = log_dir / f"{self.log_name}_{rid}.json"
-            with log_json_path.open("w", encoding="utf-8") as f: json.dump(res, f, ensure_ascii=False)
+            log_json_path = self._log_dir() / f"{log_name}_{rid}.json"
+            self._write_logs(log_json_path, log_name, res, text, pattern, jammy, rid, t0, phases, transitions)
             res["log_json"] = str(log_json_path)
 
-            # --- provenance events with monotonic 'step' and enrichment details ---
-            enrichment = {"ner": ner_extract(text), "risk": dm_classify(text), "domain": self.domain}
-            step = 1
-            events = []
-            events.append({"kind": "start",   "step": step, "run_id": rid, "ts": t0, "session": self.session, "domain": self.domain}); step += 1
-            events.append({"kind": "prenorm", "step": step, "run_id": rid, "ts": t0, "pattern": pattern}); step += 1
-            events.append({"kind": "enrich",  "step": step, "run_id": rid, "ts": t0, "enrichment": enrichment}); step += 1
-            if jammy:
-                events.append({"kind": "detect", "step": step, "run_id": rid, "ts": t0,
-                               "reason": "contradiction", "phase_after": "JAM",
-                               "details": {"enrichment": enrichment, "pattern": pattern}})
-            else:
-                events.append({"kind": "detect", "step": step, "run_id": rid, "ts": t0,
-                               "reason": "non-contradiction", "phase_after": "MEM",
-                               "details": {"enrichment": enrichment, "pattern": pattern}})
-            prov_path = log_json_path.with_suffix(".prov.jsonl")
-            with prov_path.open("w", encoding="utf-8") as f:
-                for ev in events: f.write(json.dumps(ev, ensure_ascii=False) + "\n")
-
-            # timeline.md
-            tl_path = log_json_path.with_suffix(".timeline.md")
-            tl = [
-                f"# LEE Timeline — {self.log_name}", "",
-                f"- run_id: `{rid}`", f"- domain: `{self.domain}`", f"- session: `{self.session}`", "",
-                "## Phases", " → ".join(phases), "", "## Events",
-            ]
-            for ev in events: tl.append(f"- {ev['ts']:.6f}: [{ev['step']}] **{ev['kind']}**")
-            tl_path.write_text("\n".join(tl), encoding="utf-8")
-
-            # timeline.dot (simple phase graph)
-            dot_path = log_json_path.with_suffix(".timeline.dot")
-            edges = [(tr["from"], tr["to"]) for tr in transitions]
-            dot_lines = ["digraph LEE {", "  rankdir=LR;", '  node [shape=box];']
-            for a, b in edges: dot_lines.append(f'  "{a}" -> "{b}";')
-            dot_lines.append("}")
-            dot_path.write_text("\n".join(dot_lines), encoding="utf-8")
-
         if self.patient_id:
             try:
                 from .memdb import append_patient_history, write_patient_summary  # type: ignore
@@ -130,4 +174,78 @@ class Pipeline:
             except Exception:
                 pass
 
+        res["elapsed_ms"] = (time.perf_counter() - p0) * 1000.0
         return res
+
+
+class PipelineSession:
+    """
+    Long-lived front for many runs: one Pipeline, its log directory and the
+    domain adapter stay warm across run() calls. Call close() (or use `with`).
+      with PipelineSession("batch", domain="legal") as s:
+          for line in lines: s.run(line, log_name=...)
+    """
+    def __init__(
+        self,
+        log_name: str,
+        domain: str = "test",
+        enable_provenance: bool = False,
+        session: Optional[str] = None,
+        async_artifacts: bool = False,
+        durability: str = "none",
+        backpressure: str = "block",
+        **kw: Any,
+    ) -> None:
+        # async_artifacts: run() returns once the result is ready; a writer thread
+        # creates the files. close() drains it.
+        self.writer: Optional[ArtifactWriter] = (
+            ArtifactWriter(durability=durability, backpressure=backpressure) if async_artifacts else None
+        )
+        self.pipeline = Pipeline(log_name, domain=domain, enable_provenance=enable_provenance, session=session,
+                                 artifact_writer=self.writer, **kw)
+        try:
+            from .adapters import get_adapter  # type: ignore
+            self.adapter = get_adapter(domain)
+        except Exception:
+            self.adapter = None
+        self.runs = 0
+        self.closed = False
+
+    @property
+    def domain(self) -> str:
+        return self.pipeline.domain
+
+    def run(self, text: str, *, meta: Optional[Dict[str, Any]] = None,
+            log_name: Optional[str] = None) -> Dict[str, Any]:
+        if self.closed:
+            raise RuntimeError("PipelineSession is closed")
+        self.runs += 1
+        return self.pipeline.run(text, meta=meta, log_name=log_name)
+
+    def run_text(self, text: str, *, log_name: Optional[str] = None) -> Dict[str, Any]:
+        """NL entry point (nlp.handshake.evaluate_text) reusing the warm adapter."""
+        if self.closed:
+            raise RuntimeError("PipelineSession is closed")
+        try:
+            from src.nlp.handshake import evaluate_text  # type: ignore
+        except Exception:
+            from nlp.handshake import evaluate_text  # type: ignore
+        self.runs += 1
+        return evaluate_text(text, self.pipeline, adapter=self.adapter, log_name=log_name)
+
+    def flush(self) -> None:
+        """Wait until all artifacts submitted so far are written."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        self.closed = True
+        self.adapter = None
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self) -> "PipelineSession":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
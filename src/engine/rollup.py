@@ -0,0 +1,198 @@
+# src/engine/rollup.py
+from __future__ import annotations
+import csv, json, math, os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from .event_log import is_row_file
+
+# Materialized time-bucket cubes over EventLog OLAP rows (<name>_<ts>.parquet|.csv
+# in the log dir; other files there, e.g. run_batch CSVs, are ignored). One file per grain, rollup_<grain>.json, holds its cells
+# keyed by (bucket, session, log_name, mode) and the rows it has consumed from
+# each row file, so a refresh only merges rows that landed since – including the
+# tail of a row file that snapshot_svg() rewrote with more rows. Cells are
+# mergeable (counts, sums, min, max); dashboards query them, never raw rows.
+
+GRAINS = {"minute": 16, "hour": 13, "day": 10}  # bucket = ISO ts[:n]
+DIMS = ("session", "log_name", "mode")
+STATS = ("time_to_mem_ms", "ast_size", "depth")
+
+
+def _num(v: Any) -> Optional[float]:
+    if v is None or v == "":
+        return None
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(f) else f
+
+
+def _new_cell() -> Dict[str, Any]:
+    cell: Dict[str, Any] = {"count": 0, "jam": 0}
+    for s in STATS:
+        cell.update({f"{s}_n": 0, f"{s}_sum": 0.0, f"{s}_min": None, f"{s}_max": None})
+    return cell
+
+
+def _add_row(cell: Dict[str, Any], row: Dict[str, Any]) -> None:
+    cell["count"] += 1
+    if row.get("event_type") == "jam":
+        cell["jam"] += 1
+    for s in STATS:
+        v = _num(row.get(s))
+        if v is None:
+            continue
+        cell[f"{s}_n"] += 1
+        cell[f"{s}_sum"] += v
+        lo, hi = cell[f"{s}_min"], cell[f"{s}_max"]
+        cell[f"{s}_min"] = v if lo is None else min(lo, v)
+        cell[f"{s}_max"] = v if hi is None else max(hi, v)
+
+
+def merge_cells(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+    dst["count"] += src["count"]
+    dst["jam"] += src["jam"]
+    for s in STATS:
+        dst[f"{s}_n"] += src[f"{s}_n"]
+        dst[f"{s}_sum"] += src[f"{s}_sum"]
+        for k, pick in ((f"{s}_min", min), (f"{s}_max", max)):
+            if src[k] is not None:
+                dst[k] = src[k] if dst[k] is None else pick(dst[k], src[k])
+    return dst
+
+
+def _read_rows(path: Path, skip: int) -> Iterator[Dict[str, Any]]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq  # type: ignore
+        table = pq.read_table(path)
+        yield from table.slice(skip).to_pylist()
+        return
+    with path.open("r", newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            if i >= skip:
+                yield row
+
+
+class Rollup:
+    """Minute/hour/day cubes for one log dir, stored under `root`."""
+
+    def __init__(self, root: Union[str, Path], log_dir: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self.log_dir = Path(log_dir)
+        self._cache: Dict[str, tuple] = {}  # grain -> (mtime_ns, cube)
+
+    def path(self, grain: str) -> Path:
+        if grain not in GRAINS:
+            raise ValueError(f"grain must be one of {tuple(GRAINS)}")
+        return self.root / f"rollup_{grain}.json"
+
+    # ----------------- refresh -----------------
+
+    def refresh(self, *, rebuild: bool = False) -> int:
+        """Merge rows that landed since the last refresh; returns row files touched."""
+        cubes = {g: ({"files": {}, "cells": {}} if rebuild else self._read(g)) for g in GRAINS}
+        try:
+            entries = [e for e in os.scandir(self.log_dir)
+                       if e.is_file() and is_row_file(e.name)]
+        except FileNotFoundError:
+            entries = []
+        present = {e.name for e in entries}
+        touched = 0
+        for entry in entries:
+            st = entry.stat()
+            sig = [st.st_size, st.st_mtime_ns]
+            seen = [c["files"].get(entry.name) or {"rows": 0, "sig": None} for c in cubes.values()]
+            if all(f["sig"] == sig for f in seen):
+                continue  # unchanged since the last refresh: don't even open it
+            done = min(f["rows"] for f in seen)
+            try:
+                rows = list(_read_rows(Path(entry.path), done))
+            except Exception:
+                continue  # half-written or no pyarrow for .parquet: next refresh
+            touched += 1
+            for grain, n in GRAINS.items():
+                cube = cubes[grain]
+                # a grain that already consumed some of these rows (crash between writes) skips them
+                consumed = (cube["files"].get(entry.name) or {"rows": 0})["rows"]
+                for row in rows[consumed - done:]:
+                    ts = str(row.get("ts") or "")
+                    key = json.dumps([ts[:n]] + [str(row.get(d) or "") for d in DIMS])
+                    cell = cube["cells"].get(key)
+                    if cell is None:
+                        cell = cube["cells"][key] = _new_cell()
+                    _add_row(cell, row)
+                cube["files"][entry.name] = {"rows": done + len(rows), "sig": sig}
+        for grain, cube in cubes.items():
+            # forget row files that retention removed; their rows stay in the cells
+            cube["files"] = {k: v for k, v in cube["files"].items() if k in present}
+            if touched or rebuild:
+                self._save(grain, cube)
+        return touched
+
+    # ----------------- query -----------------
+
+    def query(self, grain: str = "hour", *, start: Optional[str] = None, end: Optional[str] = None,
+              group_by: Sequence[str] = ("bucket",), **filters: str) -> List[Dict[str, Any]]:
+        """
+        Cells of one grain, optionally filtered and regrouped:
+          query("hour", start="2025-01-01", mode="contradiction", group_by=("bucket", "session"))
+        start/end are inclusive bucket prefixes; filters match session/log_name/mode.
+        Rows carry the merged measures plus jam_rate and <stat>_avg, sorted by key.
+        """
+        for k in list(filters) + list(group_by):
+            if k != "bucket" and k not in DIMS:
+                raise ValueError(f"unknown dimension {k!r}; use bucket or {DIMS}")
+        n = GRAINS[grain]
+        lo = start[:n] if start else None
+        hi = end[:n] if end else None
+        out: Dict[tuple, Dict[str, Any]] = {}
+        for key, cell in self._cached(grain)["cells"].items():
+            bucket, *dims = json.loads(key)
+            if (lo and bucket < lo) or (hi and bucket > hi):
+                continue
+            named = dict(zip(DIMS, dims), bucket=bucket)
+            if any(named[k] != v for k, v in filters.items()):
+                continue
+            gk = tuple(named[k] for k in group_by)
+            acc = out.get(gk)
+            if acc is None:
+                acc = out[gk] = _new_cell()
+            merge_cells(acc, cell)
+        rows = []
+        for gk in sorted(out):
+            cell = out[gk]
+            row: Dict[str, Any] = dict(zip(group_by, gk))
+            row.update(cell)
+            row["jam_rate"] = cell["jam"] / cell["count"] if cell["count"] else 0.0
+            for s in STATS:
+                row[f"{s}_avg"] = cell[f"{s}_sum"] / cell[f"{s}_n"] if cell[f"{s}_n"] else None
+            rows.append(row)
+        return rows
+
+    # ----------------- storage -----------------
+
+    def _read(self, grain: str) -> Dict[str, Any]:
+        try:
+            return json.loads(self.path(grain).read_text(encoding="utf-8"))
+        except Exception:
+            return {"files": {}, "cells": {}}
+
+    def _cached(self, grain: str) -> Dict[str, Any]:
+        # read-only view for query(); reloaded when the file changes
+        try:
+            mtime = self.path(grain).stat().st_mtime_ns
+        except OSError:
+            return {"files": {}, "cells": {}}
+        hit = self._cache.get(grain)
+        if hit is None or hit[0] != mtime:
+            hit = self._cache[grain] = (mtime, self._read(grain))
+        return hit[1]
+
+    def _save(self, grain: str, cube: Dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        p = self.path(grain)
+        tmp = p.with_name(p.name + ".tmp")
+        tmp.write_text(json.dumps(cube, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, p)
+        self._cache.pop(grain, None)
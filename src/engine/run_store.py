@@ -0,0 +1,361 @@
+# src/engine/run_store.py
+from __future__ import annotations
+import contextlib, hashlib, json, os, threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # optional: analytics keeps its JSONL checkpoint path without it
+    np = None  # type: ignore
+
+# Columnar mirror of data/analytics/history.jsonl, for vectorized analytics.
+# history.jsonl stays the write-ahead log (record_run_summary appends one line
+# per run); sync() turns lines appended since the last call into a new part:
+#   <dir>/part-000001.parquet   (pyarrow available)
+#   <dir>/part-000001.npz       (NumPy only)
+#   <dir>/store.json            offset/head of history consumed, parts, dictionaries
+#   <dir>/store.lock            held (flock) by whichever process is writing
+# session/final_phase are int32 codes into store-wide dictionaries ("" = missing),
+# time_to_mem_ms is float64 (NaN = missing), text columns are only read for tail().
+
+CATEGORICAL = ("session", "final_phase")
+FLOAT = ("time_to_mem_ms",)
+TEXT = ("run_id", "log_json", "ts_start", "ts_end", "recorded_at")
+COLUMNS = CATEGORICAL + FLOAT + TEXT
+
+CHUNK_ROWS = 1_000_000  # rows per part while syncing a large backlog
+MAX_PARTS = 32          # above this, parts smaller than CHUNK_ROWS are merged
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _backend() -> str:
+    try:
+        import pyarrow  # type: ignore  # noqa: F401
+        import pyarrow.parquet  # type: ignore  # noqa: F401
+        return "parquet"
+    except Exception:
+        return "npz"
+
+
+def _fingerprint(path: Path) -> str:
+    # first bytes of the history: tells an appended file from a replaced one
+    try:
+        with path.open("rb") as f:
+            return hashlib.md5(f.read(256)).hexdigest()
+    except OSError:
+        return ""
+
+
+@contextlib.contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Exclusive inter-process lock on `path` (blocking); a no-op where neither fcntl nor msvcrt exists."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except ImportError:
+            try:
+                import msvcrt  # type: ignore
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except ImportError:
+                pass
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {"offset": 0, "head": "", "seq": 0, "parts": [], "dicts": {c: [] for c in CATEGORICAL}}
+
+
+class RunStore:
+    """Append-only columnar run history in one directory (see module comment)."""
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        if np is None:
+            raise RuntimeError("RunStore needs numpy")
+        self.root = Path(root)
+        self.state_path = self.root / "store.json"
+        self.lock_path = self.root / "store.lock"
+        self._lock = threading.RLock()
+        self._held = 0  # nesting depth of the inter-process lock (sync -> reset)
+        self._state: Optional[Dict[str, Any]] = None
+        self._cache: Dict[tuple, Any] = {}  # (part files, column) -> concatenated array
+
+    # ----------------- writes -----------------
+
+    @contextlib.contextmanager
+    def _writing(self) -> Iterator[Dict[str, Any]]:
+        # one writer across threads (RLock) and processes (store.lock); state is
+        # reloaded under the lock since another process may have written since
+        with self._lock:
+            if self._held:
+                self._held += 1
+                try:
+                    yield self._load()
+                finally:
+                    self._held -= 1
+                return
+            with _locked(self.lock_path):
+                self._held = 1
+                try:
+                    self._state = None
+                    yield self._load()
+                finally:
+                    self._held = 0
+
+    def sync(self, history: Union[str, Path]) -> int:
+        """Append history lines written since the last sync; returns rows added."""
+        history = Path(history)
+        with self._writing() as state:
+            size = history.stat().st_size if history.exists() else 0
+            head = _fingerprint(history) if size else ""
+            if state["offset"] > size or (state["offset"] and state["head"] != head):
+                state = self.reset()
+            if size <= state["offset"]:
+                return 0
+            added = 0
+            rows: Dict[str, list] = {c: [] for c in COLUMNS}
+            offset = state["offset"]
+            with history.open("rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # half-written last line: next sync
+                    offset += len(line)
+                    try:
+                        rec = json.loads(line)
+                    except Exception:
+                        continue
+                    if not isinstance(rec, dict):
+                        continue
+                    for c in CATEGORICAL + TEXT:
+                        v = rec.get(c)
+                        rows[c].append("" if v is None else str(v))
+                    t = rec.get("time_to_mem_ms")
+                    rows["time_to_mem_ms"].append(float(t) if isinstance(t, (int, float)) else float("nan"))
+                    if len(rows["run_id"]) >= CHUNK_ROWS:
+                        added += self._append(state, rows, offset=offset, head=head)
+                        rows = {c: [] for c in COLUMNS}
+            added += self._append(state, rows, offset=offset, head=head)
+            return added
+
+    def append(self, cols: Dict[str, Sequence[Any]]) -> int:
+        """Append rows given as columns (missing columns → ""/NaN); for bulk loads."""
+        with self._writing() as state:
+            return self._append(state, cols, offset=state["offset"], head=state["head"])
+
+    def reset(self) -> Dict[str, Any]:
+        with self._writing() as state:
+            for part in state["parts"]:
+                try:
+                    os.remove(self.root / part["file"])
+                except OSError:
+                    pass
+            self._state = _empty_state()
+            self._save()
+            return self._state
+
+    # ----------------- reads -----------------
+
+    def vocab(self, name: str) -> List[str]:
+        return list(self._load()["dicts"].get(name, []))
+
+    def rows(self) -> int:
+        return sum(p["rows"] for p in self._load()["parts"])
+
+    def columns(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Categorical/float columns over all parts, concatenated (cached per part list)."""
+        with self._lock:
+            parts = tuple(p["file"] for p in self._load()["parts"])
+            out = {}
+            for name in names:
+                if name not in CATEGORICAL + FLOAT:
+                    raise KeyError(f"columns() reads {CATEGORICAL + FLOAT}; use tail() for text")
+                key = (parts, name)
+                arr = self._cache.get(key)
+                if arr is None:
+                    dtype = np.int32 if name in CATEGORICAL else np.float64
+                    chunks = [self._read(p, [name])[name] for p in parts]
+                    arr = np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+                    self._cache = {k: v for k, v in self._cache.items() if k[0] == parts}
+                    self._cache[key] = arr
+                out[name] = arr
+            return out
+
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """Last n rows as history-style records (missing values → None), oldest first."""
+        with self._lock:
+            state = self._load()
+            dicts = state["dicts"]
+            out: List[Dict[str, Any]] = []
+            for part in reversed(state["parts"]):
+                if len(out) >= n:
+                    break
+                want = min(n - len(out), part["rows"])
+                cols = self._read(part["file"], list(COLUMNS), tail=want)
+                recs = []
+                for i in range(want):
+                    rec: Dict[str, Any] = {}
+                    for c in CATEGORICAL:
+                        v = dicts[c][int(cols[c][i])]
+                        rec[c] = v or None
+                    t = float(cols["time_to_mem_ms"][i])
+                    rec["time_to_mem_ms"] = None if t != t else t
+                    for c in TEXT:
+                        rec[c] = cols[c][i] or None
+                    recs.append(rec)
+                out[:0] = recs
+            return out
+
+    # ----------------- internals -----------------
+
+    def _load(self) -> Dict[str, Any]:
+        if self._state is None:
+            try:
+                state = json.loads(self.state_path.read_text(encoding="utf-8"))
+                if not isinstance(state, dict) or not isinstance(state.get("parts"), list):
+                    raise ValueError
+                self._state = state
+            except Exception:
+                self._state = _empty_state()
+        return self._state
+
+    def _save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps(self._state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def _encode(self, state: Dict[str, Any], name: str, values: Sequence[Any], n: int):
+        vocab: List[str] = state["dicts"].setdefault(name, [])
+        if values is None or len(values) == 0:
+            values = np.full(n, "", dtype="U1")
+        uniq, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        index = {v: i for i, v in enumerate(vocab)}
+        remap = np.empty(len(uniq), dtype=np.int32)
+        for j, v in enumerate(uniq.tolist()):  # loop over distinct values only
+            code = index.get(v)
+            if code is None:
+                code = index[v] = len(vocab)
+                vocab.append(v)
+            remap[j] = code
+        return remap[inverse.reshape(-1)]
+
+    def _append(self, state: Dict[str, Any], cols: Dict[str, Sequence[Any]], *, offset: int, head: str) -> int:
+        n = max((len(v) for v in cols.values() if v is not None), default=0)
+        if n:
+            arrays: Dict[str, Any] = {c: self._encode(state, c, cols.get(c), n) for c in CATEGORICAL}
+            ttm = cols.get("time_to_mem_ms")
+            arrays["time_to_mem_ms"] = (np.asarray(ttm, dtype=np.float64) if ttm is not None and len(ttm)
+                                        else np.full(n, np.nan))
+            for c in TEXT:
+                v = cols.get(c)
+                arrays[c] = [str(x) for x in v] if v is not None and len(v) else [""] * n
+            state["seq"] += 1
+            fname = self._write(state["seq"], arrays)
+            state["parts"].append({"file": fname, "rows": n})
+        state["offset"], state["head"] = offset, head
+        if len(state["parts"]) > MAX_PARTS:
+            self._merge_small(state)
+        self._save()
+        return n
+
+    def _write(self, seq: int, arrays: Dict[str, Any]) -> str:
+        self.root.mkdir(parents=True, exist_ok=True)
+        if _backend() == "parquet":
+            import pyarrow as pa  # type: ignore
+            import pyarrow.parquet as pq  # type: ignore
+            fname = f"part-{seq:06d}.parquet"
+            tmp = self.root / (fname + ".tmp")
+            pq.write_table(pa.table({c: arrays[c] for c in COLUMNS}), tmp)
+        else:
+            fname = f"part-{seq:06d}.npz"
+            tmp = self.root / (fname + ".tmp")
+            packed: Dict[str, Any] = {c: arrays[c] for c in CATEGORICAL + FLOAT}
+            for c in TEXT:
+                # utf-8 blob + offsets: compact and needs no pickle to load
+                enc = [s.encode("utf-8") for s in arrays[c]]
+                off = np.zeros(len(enc) + 1, dtype=np.int64)
+                np.cumsum([len(b) for b in enc], out=off[1:])
+                packed[c + "__blob"] = np.frombuffer(b"".join(enc), dtype=np.uint8)
+                packed[c + "__off"] = off
+            with open(tmp, "wb") as f:
+                np.savez(f, **packed)
+        os.replace(tmp, self.root / fname)
+        return fname
+
+    def _read(self, fname: str, names: List[str], tail: Optional[int] = None) -> Dict[str, Any]:
+        path = self.root / fname
+        out: Dict[str, Any] = {}
+        if fname.endswith(".parquet"):
+            import pyarrow.parquet as pq  # type: ignore
+            table = pq.read_table(path, columns=names)
+            if tail is not None:
+                table = table.slice(max(0, table.num_rows - tail))
+            for c in names:
+                col = table.column(c)
+                out[c] = col.to_pylist() if c in TEXT else col.to_numpy()
+            return out
+        with np.load(path) as z:
+            for c in names:
+                if c in TEXT:
+                    off = z[c + "__off"]
+                    lo = 0 if tail is None else max(0, len(off) - 1 - tail)
+                    blob = z[c + "__blob"].tobytes()
+                    out[c] = [blob[off[i]:off[i + 1]].decode("utf-8") for i in range(lo, len(off) - 1)]
+                else:
+                    arr = z[c]
+                    out[c] = arr if tail is None else arr[max(0, len(arr) - tail):]
+        return out
+
+    def _merge_small(self, state: Dict[str, Any]) -> None:
+        # merge each contiguous run of small parts so row order is preserved
+        parts, runs, cur = state["parts"], [], []
+        for p in parts + [None]:
+            if p is not None and p["rows"] < CHUNK_ROWS:
+                cur.append(p)
+                continue
+            if len(cur) > 1:
+                runs.append(cur)
+            cur = []
+        for group in runs:
+            merged: Dict[str, list] = {c: [] for c in COLUMNS}
+            for p in group:
+                cols = self._read(p["file"], list(COLUMNS))
+                for c in COLUMNS:
+                    merged[c].append(cols[c])
+            arrays = {c: ([s for chunk in merged[c] for s in chunk] if c in TEXT else np.concatenate(merged[c]))
+                      for c in COLUMNS}
+            state["seq"] += 1
+            fname = self._write(state["seq"], arrays)
+            at = parts.index(group[0])
+            parts[at:at + len(group)] = [{"file": fname, "rows": sum(p["rows"] for p in group)}]
+            self._save()
+            for p in group:
+                try:
+                    os.remove(self.root / p["file"])
+                except OSError:
+                    pass
+
+
+_STORES: Dict[str, RunStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def store_for(root: Union[str, Path]) -> Optional[RunStore]:
+    """Shared RunStore for a directory, or None when numpy is not installed."""
+    if np is None:
+        return None
+    key = os.path.abspath(str(root))
+    with _STORES_LOCK:
+        st = _STORES.get(key)
+        if st is None:
+            st = _STORES[key] = RunStore(root)
+        return st
@@ -0,0 +1,245 @@
+# src/engine/spool.py
+from __future__ import annotations
+import bisect, json, os, re, threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .jsonl_index import iter_lines_reversed
+
+# Write-ahead spool for outgoing events. Events are appended, each with the
+# next sequence number, to segment files
+#   <root>/seg-<first seq, 16 digits>.jsonl   {"seq", "type", "data"} per line
+# and acknowledged by sequence number, per consumer, in <root>/ack.json
+# ({"acked": {"<consumer>": n}}: every event up to n was delivered to it), so
+# each sink of a fan-out keeps its own position. Whatever is past a consumer's
+# ack is replayed to it after a restart. Segments whose events every consumer
+# acknowledged are deleted; the active one is rolled over first once it is
+# fully acknowledged and compact_bytes big. Delivery is at-least-once: a crash
+# between delivery and ack replays events. Events that can't be delivered are
+# set aside before they are acked past:
+#   <root>/dead/[<consumer>-]<first seq>-<last seq>.jsonl   {"seq", "type", "data", "error"}
+
+_SEG = re.compile(r"^seg-(\d{16})\.jsonl$")
+DEAD_DIR = "dead"
+
+Event = Tuple[int, str, Dict[str, Any]]  # (seq, type, data)
+
+
+def _seg_name(first: int) -> str:
+    return f"seg-{first:016d}.jsonl"
+
+
+class Spool:
+    """
+    consumers names the readers that ack independently; the default is one
+    unnamed consumer. A consumer new to ack.json starts at the oldest ack.
+    """
+
+    def __init__(self, root: Union[str, Path], *, segment_bytes: int = 16 * 1024 * 1024,
+                 compact_bytes: int = 1024 * 1024, fsync: bool = False, consumers: Sequence[str] = ("",)) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._active_size = 0
+        self._cursors: Dict[int, Tuple[int, int]] = {}  # next seq -> (segment first seq, byte offset)
+        self._segments: List[int] = sorted(int(m.group(1)) for m in map(_SEG.match, os.listdir(self.root)) if m)
+        self.acks = self._load_acks(list(consumers) or [""])
+        self.next_seq = self._recover()
+
+    @property
+    def acked(self) -> int:
+        """Every consumer has acknowledged the events up to here."""
+        return min(self.acks.values())
+
+    def acked_by(self, consumer: str = "") -> int:
+        return self.acks[consumer]
+
+    # ----------------- recovery -----------------
+
+    def _load_acks(self, consumers: List[str]) -> Dict[str, int]:
+        try:
+            saved = json.loads((self.root / "ack.json").read_text(encoding="utf-8"))["acked"]
+        except Exception:
+            saved = 0
+        if not isinstance(saved, dict):
+            saved = {c: int(saved) for c in consumers}  # {"acked": n}: one position for everyone
+        known = {c: int(saved[c]) for c in consumers if c in saved}
+        floor = min(known.values()) if known else min(map(int, saved.values()), default=0)
+        return {c: known.get(c, floor) for c in consumers}
+
+    def _recover(self) -> int:
+        """Next seq to hand out; trims a torn last line left by a crash mid-append."""
+        while self._segments:
+            path = self.root / _seg_name(self._segments[-1])
+            with open(path, "rb+") as f:
+                size = f.seek(0, os.SEEK_END)
+                good = size
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        f.seek(0)
+                        good = f.read().rfind(b"\n") + 1
+                        f.truncate(good)
+            if good:
+                seqs = []
+                for line in iter_lines_reversed(path):  # normally just the last line
+                    try:
+                        seqs.append(int(json.loads(line)["seq"]))
+                        break
+                    except Exception:
+                        continue
+                # a segment with no readable line still holds its place in the sequence
+                return (seqs[0] if seqs else max(self._segments[-1], self.acked)) + 1
+            path.unlink(missing_ok=True)  # empty last segment: look at the one before
+            self._segments.pop()
+        return self.acked + 1
+
+    # ----------------- writer -----------------
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> int:
+        """Durably record one event (flushed to the OS; fsync'd too with fsync=True); returns its seq."""
+        return self.append_many([(event_type, data)])[-1]
+
+    def append_many(self, events: Sequence[Tuple[str, Dict[str, Any]]]) -> List[int]:
+        """Record a batch with one write(); returns the seqs given to it."""
+        if not events:
+            return []
+        with self._lock:
+            first = self.next_seq
+            data = "".join(json.dumps({"seq": first + i, "type": t, "data": d}, ensure_ascii=False) + "\n"
+                           for i, (t, d) in enumerate(events)).encode("utf-8")
+            if self._fd is None or self._active_size >= self.segment_bytes:
+                self._roll(first)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            if self.fsync:
+                os.fsync(self._fd)
+            self._active_size += len(data)
+            self.next_seq = first + len(events)
+            return list(range(first, self.next_seq))
+
+    def _roll(self, first: int) -> None:
+        if self._fd is not None:  # active segment is full: start the next one at `first`
+            os.close(self._fd)
+            self._fd = None
+            self._segments.append(first)
+        elif not self._segments:
+            self._segments.append(first)
+        # otherwise reopen the last segment (after a restart or a compaction roll)
+        path = self.root / _seg_name(self._segments[-1])
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._active_size = os.fstat(self._fd).st_size
+
+    # ----------------- reader -----------------
+
+    def pending(self, consumer: Optional[str] = None) -> int:
+        """Events not yet acknowledged by `consumer` (by someone, when None)."""
+        with self._lock:
+            return self.next_seq - 1 - (self.acked if consumer is None else self.acks[consumer])
+
+    def read(self, after: int, max_n: int = 500) -> List[Event]:
+        """Up to max_n events with seq > after, in order."""
+        with self._lock:
+            out: List[Event] = []
+            if after + 1 >= self.next_seq:
+                return out
+            if after + 1 in self._cursors:  # consumers each resume where their last read ended
+                first, offset = self._cursors.pop(after + 1)
+            else:
+                i = bisect.bisect_right(self._segments, after + 1) - 1
+                if i < 0:
+                    i = 0
+                first, offset = self._segments[i], 0
+            while len(out) < max_n:
+                path = self.root / _seg_name(first)
+                try:
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        for line in f:
+                            if not line.endswith(b"\n"):
+                                break
+                            offset += len(line)
+                            try:
+                                rec = json.loads(line)
+                            except ValueError:
+                                continue
+                            if rec["seq"] > after:
+                                out.append((rec["seq"], rec["type"], rec["data"]))
+                                after = rec["seq"]
+                                if len(out) >= max_n:
+                                    break
+                except FileNotFoundError:
+                    pass
+                if len(out) >= max_n:
+                    break
+                i = bisect.bisect_right(self._segments, first)
+                if i >= len(self._segments):
+                    break
+                first, offset = self._segments[i], 0
+            if len(self._cursors) >= 4 * len(self.acks):
+                self._cursors.clear()  # positions of reads nobody continued
+            self._cursors[after + 1] = (first, offset)
+            return out
+
+    def dead_letter(self, events: Sequence[Event], error: str, consumer: str = "") -> Path:
+        """Keep events `consumer` could not take under <root>/dead/ (ack past them afterwards)."""
+        d = self.root / DEAD_DIR
+        d.mkdir(exist_ok=True)
+        p = d / f"{consumer + '-' if consumer else ''}{events[0][0]:016d}-{events[-1][0]:016d}.jsonl"
+        tmp = p.with_name(p.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for seq, event_type, data in events:
+                f.write(json.dumps({"seq": seq, "type": event_type, "data": data, "error": error},
+                                   ensure_ascii=False) + "\n")
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, p)
+        return p
+
+    # ----------------- acks + compaction -----------------
+
+    def ack(self, seq: int, consumer: str = "") -> None:
+        """Every event up to seq has been delivered to `consumer`."""
+        with self._lock:
+            if seq <= self.acks[consumer]:
+                return
+            self.acks[consumer] = seq
+            p = self.root / "ack.json"
+            tmp = p.with_name("ack.json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"acked": self.acks}, sort_keys=True))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, p)
+            self.compact()
+
+    def compact(self) -> int:
+        """Delete fully acknowledged segments; returns how many were removed."""
+        with self._lock:
+            if (self._fd is not None and self.acked >= self.next_seq - 1
+                    and self._active_size >= self.compact_bytes):
+                os.close(self._fd)  # roll the drained active segment so it can go too
+                self._fd = None
+                self._active_size = 0
+                self._segments.append(self.next_seq)
+            removed = 0
+            # a segment is done when the next one starts at or below acked + 1
+            while len(self._segments) > 1 and self._segments[1] <= self.acked + 1:
+                (self.root / _seg_name(self._segments.pop(0))).unlink(missing_ok=True)
+                removed += 1
+            if removed:
+                self._cursors = {k: v for k, v in self._cursors.items() if v[0] in self._segments}
+            return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
@@ -0,0 +1,269 @@
+# src/engine/svg_chart.py
+from __future__ import annotations
+import math, os
+from html import escape
+from pathlib import Path
+from typing import Any, List, Sequence, Tuple, Union
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # optional: everything below also works on plain lists
+    np = None  # type: ignore
+
+# Small hand-written SVG charts for the analytics outputs (bar, line, histogram,
+# heatmap), in the spirit of EventLog.snapshot_svg: no plotting library, no
+# fonts, one string per chart. Line charts downsample with LTTB so the output
+# stays a few thousand points whatever the length of the series.
+
+WIDTH, HEIGHT = 640, 360
+MARGIN = (36, 20, 56, 64)  # top, right, bottom, left
+LINE_MAX_POINTS = 2000
+_STYLE = ("<style>text{font-family:system-ui,sans-serif;font-size:11px;fill:#333}"
+          ".t{font-size:14px;font-weight:600}.ax{stroke:#999;stroke-width:1}"
+          ".g{stroke:#eee;stroke-width:1}</style>")
+_FILL = "#4c72b0"
+
+
+# ---------- downsampling ----------
+
+def _bucket_bounds(n: int, threshold: int) -> List[int]:
+    # threshold-2 buckets over points 1..n-2; the first and last points are kept as-is
+    every = (n - 2) / (threshold - 2)
+    return [int(i * every) + 1 for i in range(threshold - 2)] + [n - 1]
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> Tuple[Any, Any]:
+    """
+    Largest-Triangle-Three-Buckets: `threshold` points of (xs, ys) that keep the
+    visual shape of the line. Returns the input unchanged when it is short enough.
+    """
+    n = len(ys)
+    if threshold < 3 or n <= threshold:
+        return xs, ys
+    bounds = _bucket_bounds(n, threshold)
+    if np is not None:
+        x = np.asarray(xs, dtype=np.float64)
+        y = np.asarray(ys, dtype=np.float64)
+        starts = np.asarray(bounds[:-1])
+        # the mean of every bucket is fixed up front; only the anchor is sequential
+        sizes = np.diff(np.asarray(bounds))
+        avg_x = np.add.reduceat(x[:-1], starts) / sizes
+        avg_y = np.add.reduceat(y[:-1], starts) / sizes
+        keep = np.empty(threshold, dtype=np.int64)
+        keep[0], keep[-1] = 0, n - 1
+        a = 0
+        for i in range(threshold - 2):
+            lo, hi = bounds[i], bounds[i + 1]
+            cx, cy = (avg_x[i + 1], avg_y[i + 1]) if i + 1 < threshold - 2 else (x[-1], y[-1])
+            bx, by = x[lo:hi], y[lo:hi]
+            area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+            a = lo + int(np.argmax(area))
+            keep[i + 1] = a
+        return x[keep], y[keep]
+    keep_x, keep_y = [xs[0]], [ys[0]]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        if i + 1 < threshold - 2:
+            nlo, nhi = bounds[i + 1], bounds[i + 2]
+            cx = sum(xs[nlo:nhi]) / (nhi - nlo)
+            cy = sum(ys[nlo:nhi]) / (nhi - nlo)
+        else:
+            cx, cy = xs[-1], ys[-1]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((xs[a] - cx) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (cy - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        a = best
+        keep_x.append(xs[a])
+        keep_y.append(ys[a])
+    keep_x.append(xs[-1])
+    keep_y.append(ys[-1])
+    return keep_x, keep_y
+
+
+# ---------- frame ----------
+
+def _fmt(v: float) -> str:
+    return f"{v:.4g}"
+
+
+def nice_ticks(lo: float, hi: float, n: int = 5) -> List[float]:
+    """About n round tick values covering [lo, hi]."""
+    if hi <= lo:
+        hi = lo + 1.0
+    raw = (hi - lo) / max(1, n)
+    mag = 10 ** math.floor(math.log10(raw))
+    step = next(m * mag for m in (1, 2, 2.5, 5, 10) if m * mag >= raw)
+    first = math.floor(lo / step) * step
+    ticks = []
+    t = first
+    while t <= hi + step * 1e-9:
+        ticks.append(round(t, 12))
+        t += step
+    if ticks[-1] < hi:
+        ticks.append(round(t, 12))
+    return ticks
+
+
+class _Frame:
+    """Plot area + value→pixel mapping + the SVG lines drawn so far."""
+
+    def __init__(self, title: str, xlabel: str, ylabel: str, width: int, height: int) -> None:
+        top, right, bottom, left = MARGIN
+        self.x0, self.x1 = left, width - right
+        self.y0, self.y1 = height - bottom, top  # y grows downwards in SVG
+        self.width, self.height = width, height
+        self.parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">',
+            _STYLE,
+            f'<rect width="{width}" height="{height}" fill="white"/>',
+            f'<text class="t" x="{width / 2:.1f}" y="20" text-anchor="middle">{escape(title)}</text>',
+        ]
+        if xlabel:
+            self.parts.append(f'<text x="{(self.x0 + self.x1) / 2:.1f}" y="{height - 10}" '
+                              f'text-anchor="middle">{escape(xlabel)}</text>')
+        if ylabel:
+            cy = (self.y0 + self.y1) / 2
+            self.parts.append(f'<text x="14" y="{cy:.1f}" text-anchor="middle" '
+                              f'transform="rotate(-90 14 {cy:.1f})">{escape(ylabel)}</text>')
+
+    def scale(self, lo: float, hi: float, a: float, b: float):
+        span = (hi - lo) or 1.0
+        return lambda v: a + (v - lo) * (b - a) / span
+
+    def y_axis(self, ticks: List[float]):
+        sy = self.scale(ticks[0], ticks[-1], self.y0, self.y1)
+        for t in ticks:
+            py = sy(t)
+            self.parts.append(f'<line class="g" x1="{self.x0}" y1="{py:.1f}" x2="{self.x1}" y2="{py:.1f}"/>')
+            self.parts.append(f'<text x="{self.x0 - 6}" y="{py + 4:.1f}" text-anchor="end">{_fmt(t)}</text>')
+        return sy
+
+    def x_axis(self, ticks: List[float]):
+        sx = self.scale(ticks[0], ticks[-1], self.x0, self.x1)
+        for t in ticks:
+            px = sx(t)
+            self.parts.append(f'<text x="{px:.1f}" y="{self.y0 + 16}" text-anchor="middle">{_fmt(t)}</text>')
+        return sx
+
+    def finish(self) -> str:
+        self.parts.append(f'<line class="ax" x1="{self.x0}" y1="{self.y0}" x2="{self.x1}" y2="{self.y0}"/>')
+        self.parts.append(f'<line class="ax" x1="{self.x0}" y1="{self.y0}" x2="{self.x0}" y2="{self.y1}"/>')
+        self.parts.append("</svg>")
+        return "\n".join(self.parts)
+
+
+# ---------- charts ----------
+
+def bar_chart(labels: Sequence[Any], values: Sequence[float], *, title: str = "", xlabel: str = "",
+              ylabel: str = "", width: int = WIDTH, height: int = HEIGHT) -> str:
+    fr = _Frame(title, xlabel, ylabel, width, height)
+    sy = fr.y_axis(nice_ticks(0.0, float(max(values, default=0)) or 1.0))
+    slot = (fr.x1 - fr.x0) / max(1, len(values))
+    for i, (label, v) in enumerate(zip(labels, values)):
+        x = fr.x0 + i * slot + slot * 0.15
+        top = sy(v)
+        fr.parts.append(f'<rect x="{x:.1f}" y="{top:.1f}" width="{slot * 0.7:.1f}" '
+                        f'height="{fr.y0 - top:.1f}" fill="{_FILL}"><title>{escape(str(label))}: {_fmt(v)}</title></rect>')
+        cx = x + slot * 0.35
+        fr.parts.append(f'<text x="{cx:.1f}" y="{top - 4:.1f}" text-anchor="middle">{_fmt(v)}</text>')
+        fr.parts.append(f'<text x="{cx:.1f}" y="{fr.y0 + 16}" text-anchor="middle">{escape(str(label))}</text>')
+    return fr.finish()
+
+
+def line_chart(xs: Sequence[float], ys: Sequence[float], *, title: str = "", xlabel: str = "",
+               ylabel: str = "", max_points: int = LINE_MAX_POINTS,
+               width: int = WIDTH, height: int = HEIGHT) -> str:
+    xs, ys = lttb(xs, ys, max_points)
+    fr = _Frame(title, xlabel, ylabel, width, height)
+    if len(ys):
+        sy = fr.y_axis(nice_ticks(float(min(ys)), float(max(ys))))
+        sx = fr.x_axis(nice_ticks(float(min(xs)), float(max(xs))))
+        pts = " ".join(f"{sx(float(x)):.1f},{sy(float(y)):.1f}" for x, y in zip(xs, ys))
+        fr.parts.append(f'<polyline fill="none" stroke="{_FILL}" stroke-width="1.5" points="{pts}"/>')
+    return fr.finish()
+
+
+def histogram_counts(values: Sequence[float], bins: int = 40) -> Tuple[List[int], List[float]]:
+    """(counts, edges) of the finite values; len(edges) == len(counts) + 1."""
+    if np is not None:
+        v = np.asarray(values, dtype=np.float64)
+        v = v[np.isfinite(v)]
+        if not len(v):
+            return [], []
+        counts, edges = np.histogram(v, bins=bins)
+        return counts.tolist(), edges.tolist()
+    v = [float(x) for x in values if isinstance(x, (int, float)) and math.isfinite(x)]
+    if not v:
+        return [], []
+    lo, hi = min(v), max(v)
+    if hi == lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    width = (hi - lo) / bins
+    counts = [0] * bins
+    for x in v:
+        counts[min(bins - 1, int((x - lo) / width))] += 1
+    return counts, [lo + i * width for i in range(bins + 1)]
+
+
+def histogram(values: Sequence[float], *, bins: int = 40, title: str = "", xlabel: str = "",
+              ylabel: str = "count", width: int = WIDTH, height: int = HEIGHT) -> str:
+    counts, edges = histogram_counts(values, bins)
+    fr = _Frame(title, xlabel, ylabel, width, height)
+    if counts:
+        sy = fr.y_axis(nice_ticks(0.0, float(max(counts)) or 1.0))
+        sx = fr.scale(edges[0], edges[-1], fr.x0, fr.x1)
+        for t in nice_ticks(edges[0], edges[-1]):
+            if edges[0] <= t <= edges[-1]:
+                fr.parts.append(f'<text x="{sx(t):.1f}" y="{fr.y0 + 16}" text-anchor="middle">{_fmt(t)}</text>')
+        for c, lo, hi in zip(counts, edges, edges[1:]):
+            if c:
+                top = sy(c)
+                fr.parts.append(f'<rect x="{sx(lo):.1f}" y="{top:.1f}" width="{max(0.5, sx(hi) - sx(lo) - 0.5):.1f}" '
+                                f'height="{fr.y0 - top:.1f}" fill="{_FILL}"><title>{_fmt(lo)}–{_fmt(hi)}: {c}</title></rect>')
+    return fr.finish()
+
+
+def _shade(t: float) -> str:
+    # white → _FILL
+    r, g, b = (int(255 + (c - 255) * t) for c in (0x4c, 0x72, 0xb0))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def heatmap(row_labels: Sequence[Any], col_labels: Sequence[Any], matrix: Sequence[Sequence[float]], *,
+            title: str = "", xlabel: str = "", ylabel: str = "",
+            width: int = WIDTH, height: int = HEIGHT) -> str:
+    """matrix[r][c] shaded from white (0) to the series colour (max); values printed when cells are wide enough."""
+    fr = _Frame(title, xlabel, ylabel, width, height)
+    nr, nc = len(row_labels), len(col_labels)
+    if nr and nc:
+        hi = max((float(v) for row in matrix for v in row), default=0.0) or 1.0
+        cw, ch = (fr.x1 - fr.x0) / nc, (fr.y0 - fr.y1) / nr
+        for r, row in enumerate(matrix):
+            y = fr.y1 + r * ch
+            fr.parts.append(f'<text x="{fr.x0 - 6}" y="{y + ch / 2 + 4:.1f}" text-anchor="end">{escape(str(row_labels[r]))}</text>')
+            for c, v in enumerate(row):
+                x = fr.x0 + c * cw
+                t = float(v) / hi
+                fr.parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{cw:.1f}" height="{ch:.1f}" fill="{_shade(t)}">'
+                                f'<title>{escape(str(row_labels[r]))} · {escape(str(col_labels[c]))}: {_fmt(v)}</title></rect>')
+                if cw >= 28 and ch >= 14:
+                    colour = "white" if t > 0.6 else "#333"
+                    fr.parts.append(f'<text x="{x + cw / 2:.1f}" y="{y + ch / 2 + 4:.1f}" text-anchor="middle" '
+                                    f'style="fill:{colour}">{_fmt(v)}</text>')
+        step = max(1, math.ceil(nc * 40 / (fr.x1 - fr.x0)))  # keep column labels ~40px apart
+        for c in range(0, nc, step):
+            fr.parts.append(f'<text x="{fr.x0 + (c + 0.5) * cw:.1f}" y="{fr.y0 + 16}" '
+                            f'text-anchor="middle">{escape(str(col_labels[c]))}</text>')
+    return fr.finish()
+
+
+def write_svg(path: Union[str, Path], svg: str) -> Path:
+    p = Path(path)
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(svg, encoding="utf-8")
+    os.replace(tmp, p)
+    return p
@@ -93,11 +93,15 @@ def _canonical_domain_name(dom: str) -> Optional[str]:
 
 # ---------------------------------------------------------------------------
 
-def evaluate_text(text: str, pipeline) -> dict:
+_UNSET = object()
+
+def evaluate_text(text: str, pipeline, *, adapter=_UNSET, log_name: Optional[str] = None) -> dict:
     """
     NL text → λ-term → β-NF → Pipeline.run('P -> Q', meta={"nl","lambda_nf","adapter"?}).
     Prefer domain adapter; otherwise λ extraction; otherwise NL heuristic.
     Ensure adapter metadata when domain is known (even if heuristic path).
+    `adapter` lets long-lived callers (PipelineSession) pass a warm adapter;
+    `log_name` is forwarded to Pipeline.run for this run only.
     """
     term = parse_text_to_lambda(text)
     nf = beta_normal_form(term)
@@ -109,7 +113,8 @@ def evaluate_text(text: str, pipeline) -> dict:
     adapter_meta: Optional[Dict] = None
 
     # 1) Domain adapter (if present)
-    adapter = get_adapter(dom or "")
+    if adapter is _UNSET:
+        adapter = get_adapter(dom or "")
     if adapter:
         try:
             analysis: Dict = adapter.analyze(text)  # type: ignore[attr-defined]
@@ -143,4 +148,6 @@ def evaluate_text(text: str, pipeline) -> dict:
     if adapter_meta:
         meta["adapter"] = adapter_meta
 
+    if log_name:
+        return pipeline.run(pattern, meta=meta, log_name=log_name)
     return pipeline.run(pattern, meta=meta)
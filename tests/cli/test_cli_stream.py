@@ -0,0 +1,57 @@
+import io, json, importlib, sys
+
+def test_stream_one_line_out_per_input(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+    import src.cli as cli
+
+    src = io.StringIO('1 -> 0\n\n{"text": "A -> B", "id": 7}\n{not json\n{"domain": "legal"}\n')
+    out = io.StringIO()
+    errors = cli.run_stream(src, out, domain="legal", provenance=False)
+    cli._close_sessions()
+
+    recs = [json.loads(l) for l in out.getvalue().splitlines()]
+    assert [r["line"] for r in recs] == [1, 3, 4, 5]
+    assert recs[0]["history"]["phases"] == ["ALIVE", "JAM", "MEM"]
+    assert recs[1]["id"] == 7 and recs[1]["result"]["pattern"] == "A -> B"
+    assert "error" in recs[2] and "error" in recs[3] and errors == 2
+
+def test_stream_flag_reads_input_file(monkeypatch, capsys, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    an = importlib.import_module("src.engine.analytics")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+    monkeypatch.setattr(an, "LATENCY_DIR", tmp_path / "latency")
+    import src.cli as cli
+    inp = tmp_path / "in.jsonl"
+    inp.write_text('1 -> 1\n1 -> 0\n', encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["lee", "--input", str(inp), "--jam", "--flush-every", "2"])
+    assert cli.main() == 0
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert [json.loads(l)["final_phase"] for l in lines] == ["MEM", "MEM"]
+    assert (tmp_path / "logs").exists()
+    assert not (tmp_path / "latency").exists()  # latency shards are opt-in
+
+def test_stream_records_latency_on_request(monkeypatch, capsys, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    an = importlib.import_module("src.engine.analytics")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+    monkeypatch.setattr(an, "LATENCY_DIR", tmp_path / "latency")
+    import src.cli as cli
+    inp = tmp_path / "in.jsonl"
+    inp.write_text('1 -> 1\n1 -> 0\n', encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["lee", "--input", str(inp), "--record-latency"])
+    assert cli.main() == 0
+    capsys.readouterr()
+    assert an.load_latency().rows()[0]["n"] == 2
+
+def test_sessions_are_keyed_on_their_options(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+    import src.cli as cli
+    try:
+        with_prov = cli._session("legal", "lee_stream")
+        no_prov = cli._session("legal", "lee_stream", enable_provenance=False)
+        assert no_prov is not with_prov and not no_prov.pipeline.enable_provenance
+        assert cli._session("legal", "lee_stream", enable_provenance=False) is no_prov  # still warm
+    finally:
+        cli._close_sessions()
@@ -0,0 +1,42 @@
+"""
+Cold-start guard based on `python -X importtime`.
+Budgets are generous (CI runners vary); override with LEE_IMPORT_BUDGET_MS.
+"""
+import os, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BUDGET_US = int(os.environ.get("LEE_IMPORT_BUDGET_MS", "1500")) * 1000
+
+def _importtime(code: str, cwd: Path) -> tuple[dict[str, int], subprocess.CompletedProcess]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))  # picks up sitecustomize.py
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=cwd, env=env, capture_output=True, text=True, timeout=60)
+    cumulative: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) == 3 and parts[1].isdigit():
+            cumulative[parts[2]] = int(parts[1])
+    return cumulative, proc
+
+def test_import_src_engine_cold_start(tmp_path):
+    cum, proc = _importtime("import src.engine", tmp_path)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert cum.get("src.engine", 0) < BUDGET_US
+    # no directory side effects at import time
+    assert not (tmp_path / "data").exists()
+
+def test_lee_version_cold_start(tmp_path):
+    code = "import sys; sys.argv=['lee','--version']; from src.cli import main; main()"
+    cum, proc = _importtime(code, tmp_path)
+    assert proc.returncode == 0 and "LEE" in proc.stdout
+    assert cum.get("src.cli", 0) < BUDGET_US
+    # --version must not pull in the engine
+    assert "src.engine.pipeline" not in cum
+
+def test_sitecustomize_leaves_import_builtin_alone(tmp_path):
+    code = "import builtins, sitecustomize; print(builtins.__import__.__name__)"
+    _, proc = _importtime(code, tmp_path)
+    assert proc.stdout.strip() == "__import__"
@@ -0,0 +1,36 @@
+import copy, gc
+from core.expressions import Variable, Lambda, Application, Quantifier, intern_table_size
+from nlp.parser import parse
+from nlp.rewriter import normalize
+
+def test_structurally_equal_nodes_are_identical():
+    a = Application(Lambda(Variable("x"), Variable("x")), Variable("y"))
+    b = Application(Lambda(Variable("x"), Variable("x")), Variable("y"))
+    assert a is b and a == b and hash(a) == hash(b)
+    assert Quantifier(kind="forall", var=Variable("x"), body=a) is Quantifier("forall", Variable("x"), a)
+    assert copy.deepcopy(a) is a
+
+def test_parser_and_rewriter_share_subtrees():
+    e1 = parse("(lambda x . x) y")
+    e2 = parse("(lambda x . x) y")
+    assert e1 is e2
+    assert normalize(e1) is Variable("y")
+
+def test_table_is_weak():
+    gc.collect()
+    before = intern_table_size()
+    node = Lambda(Variable("zz_unique_param"), Variable("zz_unique_body"))
+    assert intern_table_size() == before + 3
+    del node
+    gc.collect()
+    assert intern_table_size() == before
+
+def test_equal_but_differently_typed_payloads_not_merged():
+    import pytest
+    assert Variable(True).name is True
+    assert Variable(1).name == 1 and type(Variable(1).name) is int
+    f = Variable("f")
+    assert Application(f, False).arg is False and Application(f, 0).arg == 0
+    assert Application(f, ("->", True, 0)) is not Application(f, ("->", 1, 0))
+    with pytest.raises(TypeError):
+        Variable()
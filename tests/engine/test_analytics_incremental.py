@@ -0,0 +1,48 @@
+import importlib
+import json
+
+def _append(path, *recs, tail=""):
+    with path.open("a", encoding="utf-8") as f:
+        for r in recs:
+            f.write(json.dumps(r) + "\n")
+        f.write(tail)
+
+def _setup(monkeypatch, tmp_path):
+    an = importlib.import_module("src.engine.analytics")
+    monkeypatch.setattr(an, "ANALYTICS_DIR", tmp_path)
+    monkeypatch.setattr(an, "HISTORY", tmp_path / "history.jsonl")
+    monkeypatch.setattr(an, "AGG_STATE", tmp_path / "aggregate.state.json")
+    monkeypatch.setattr(an, "RUN_STORE_DIR", None)  # JSONL checkpoint path
+    return an
+
+def test_aggregate_only_parses_appended_lines(monkeypatch, tmp_path):
+    an = _setup(monkeypatch, tmp_path)
+    _append(an.HISTORY, *({"run_id": str(i), "final_phase": "JAM" if i % 2 else "MEM"} for i in range(12)),
+            tail='{"run_id": "half')
+    agg = an.aggregate()
+    assert agg["total_runs"] == 12 and agg["by_phase"] == {"JAM": 6, "MEM": 6}
+    assert [r["run_id"] for r in agg["last_runs"]] == [str(i) for i in range(2, 12)]
+
+    # finish the torn line; earlier lines are never re-parsed
+    loads = []
+    real = json.loads
+    monkeypatch.setattr(an.json, "loads", lambda s, *a, **k: loads.append(s) or real(s, *a, **k))
+    _append(an.HISTORY, tail='", "final_phase": "JAM", "session": "s"}\n')
+    agg = an.aggregate()
+    assert agg["total_runs"] == 13 and agg["by_session"] == {"default": 12, "s": 1}
+    assert agg["last_runs"][-1]["run_id"] == "half"
+    assert len([l for l in loads if isinstance(l, bytes)]) == 1
+
+def test_replaced_history_and_rebuild_start_over(monkeypatch, tmp_path):
+    an = _setup(monkeypatch, tmp_path)
+    _append(an.HISTORY, {"run_id": "a", "final_phase": "MEM"}, {"run_id": "b", "final_phase": "MEM"})
+    assert an.aggregate()["total_runs"] == 2
+    an.HISTORY.write_text(json.dumps({"run_id": "z", "final_phase": "JAM"}) + "\n", encoding="utf-8")
+    agg = an.aggregate()
+    assert agg["total_runs"] == 1 and agg["jam_rate"] == 1.0
+
+    state = json.loads(an.AGG_STATE.read_text(encoding="utf-8"))
+    state["total"] = 99
+    an.AGG_STATE.write_text(json.dumps(state), encoding="utf-8")
+    assert an.aggregate()["total_runs"] == 99
+    assert an.aggregate(rebuild=True)["total_runs"] == 1
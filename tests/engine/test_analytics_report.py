@@ -0,0 +1,73 @@
+import importlib
+import json
+
+def _setup(monkeypatch, tmp_path):
+    an = importlib.import_module("src.engine.analytics")
+    for name, path in (("ANALYTICS_DIR", tmp_path), ("HISTORY", tmp_path / "history.jsonl"),
+                       ("SUMMARY_MD", tmp_path / "summary.md"), ("AGG_STATE", tmp_path / "aggregate.state.json"),
+                       ("CHART_KEYS", tmp_path / "charts.keys.json"), ("LATENCY_DIR", tmp_path / "latency"),
+                       ("ROLLUP_DIR", tmp_path / "rollups"), ("LOG_DIR", tmp_path / "logs")):
+        monkeypatch.setattr(an, name, path)
+    monkeypatch.setattr(an, "RUN_STORE_DIR", None)
+    drawn = []
+
+    def fake(name):
+        def render(out, *data):
+            drawn.append(name)
+            out.write_bytes(b"png")
+            return True
+        return render
+    monkeypatch.setattr(an, "_render_phase_bar", fake("by_phase"))
+    monkeypatch.setattr(an, "_render_time_to_mem", fake("time_to_mem_ms"))
+    return an, drawn
+
+def _append(an, *recs):
+    with an.HISTORY.open("a", encoding="utf-8") as f:
+        for r in recs:
+            f.write(json.dumps(r) + "\n")
+
+def test_report_aggregates_once_and_skips_unchanged_charts(monkeypatch, tmp_path):
+    an, drawn = _setup(monkeypatch, tmp_path)
+    _append(an, {"run_id": "a", "log_json": "data/logs/a.json", "final_phase": "MEM", "time_to_mem_ms": 3.0},
+            {"run_id": "b", "log_json": "data/logs/b.json", "final_phase": "JAM"})
+    calls = []
+    real = an.aggregate
+    monkeypatch.setattr(an, "aggregate", lambda **kw: calls.append(kw) or real(**kw))
+
+    rep = an.build_report()
+    assert len(calls) == 1
+    assert drawn == ["by_phase", "time_to_mem_ms"]
+    assert rep["index"].exists() and rep["summary"].exists()
+
+    # idle: nothing to redraw
+    drawn.clear()
+    rep = an.build_report()
+    assert drawn == [] and rep["by_phase"].exists() and rep["time_to_mem_ms"].exists()
+
+    # a run without timing changes the phase counts and the history, so both redraw
+    _append(an, {"run_id": "c", "log_json": "data/logs/c.json", "final_phase": "JAM"})
+    an.build_report()
+    assert drawn == ["by_phase", "time_to_mem_ms"]
+
+    # a deleted image is redrawn even though its input is unchanged
+    drawn.clear()
+    (tmp_path / "by_phase.svg").unlink()
+    an.build_report(html=False)
+    assert drawn == ["by_phase"]
+
+def test_default_charts_are_svg_without_matplotlib(monkeypatch, tmp_path):
+    an = importlib.import_module("src.engine.analytics")
+    for name, path in (("ANALYTICS_DIR", tmp_path), ("HISTORY", tmp_path / "history.jsonl"),
+                       ("SUMMARY_MD", tmp_path / "summary.md"), ("AGG_STATE", tmp_path / "aggregate.state.json"),
+                       ("CHART_KEYS", tmp_path / "charts.keys.json"), ("LATENCY_DIR", tmp_path / "latency"),
+                       ("ROLLUP_DIR", tmp_path / "rollups"), ("LOG_DIR", tmp_path / "logs")):
+        monkeypatch.setattr(an, name, path)
+    monkeypatch.setattr(an, "RUN_STORE_DIR", None)
+    monkeypatch.setitem(__import__("sys").modules, "matplotlib", None)  # import fails
+    _append(an, *({"run_id": str(i), "log_json": f"{i}.json", "final_phase": "MEM", "time_to_mem_ms": float(i)}
+                  for i in range(50)))
+    rep = an.build_report()
+    for k in ("by_phase", "time_to_mem_ms", "time_to_mem_hist"):
+        assert rep[k].suffix == ".svg" and rep[k].read_text().startswith("<svg")
+    assert rep["rollup_heatmap"] is None  # no cubes yet
+    assert "time_to_mem_hist.svg" in rep["index"].read_text()
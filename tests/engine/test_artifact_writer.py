@@ -0,0 +1,62 @@
+import importlib
+import threading, time
+from pathlib import Path
+from engine.artifact_writer import ArtifactWriter
+
+def test_async_session_drains_on_close(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+
+    s = pl.PipelineSession("aw", domain="legal", enable_provenance=True, session="s",
+                           async_artifacts=True, durability="fsync")
+    paths = [Path(s.run("1 -> 0", log_name=f"aw_{i}")["log_json"]) for i in range(5)]
+    s.close()
+    for p in paths:
+        assert p.exists()
+        assert p.with_suffix(".prov.jsonl").exists()
+        assert p.with_suffix(".timeline.dot").exists()
+    assert s.writer.stats()["written"] == 20
+
+def test_drop_all_but_prov_under_backpressure(tmp_path):
+    gate = threading.Event()
+    w = ArtifactWriter(maxsize=1, backpressure="drop-all-but-prov")
+    real_write = w._write
+    w._write = lambda path, text: (gate.wait(5), real_write(path, text))
+    w.submit([(tmp_path / "0.prov.jsonl", "0", "prov")])   # taken by the (gated) thread
+    time.sleep(0.05)
+    w.submit([(tmp_path / "1.prov.jsonl", "1", "prov")])   # fills the queue
+    w.submit([(tmp_path / "2.json", "{}", "json"), (tmp_path / "2.timeline.md", "x", "render")])
+    assert w.dropped == 2
+    gate.set()
+    w.close()
+    assert (tmp_path / "1.prov.jsonl").exists() and not (tmp_path / "2.json").exists()
+
+def test_rejects_unknown_policy():
+    import pytest
+    with pytest.raises(ValueError):
+        ArtifactWriter(durability="sometimes")
+
+def test_submit_after_close_is_written_inline(tmp_path):
+    w = ArtifactWriter()
+    w.submit([(tmp_path / "a.prov.jsonl", "a", "prov")])
+    w.close()
+    w.submit([(tmp_path / "b.prov.jsonl", "b", "prov")])
+    w.flush()  # must not hang
+    assert (tmp_path / "a.prov.jsonl").read_text() == "a"
+    assert (tmp_path / "b.prov.jsonl").read_text() == "b"
+
+def test_run_index_line_is_written_after_the_artifacts(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    from engine.log_index import index_for
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+
+    s = pl.PipelineSession("ix", domain="legal", enable_provenance=True, async_artifacts=True)
+    gate = threading.Event()
+    real_write = s.writer._write
+    s.writer._write = lambda path, text: (gate.wait(5), real_write(path, text))
+    log_json = Path(s.run("1 -> 0")["log_json"])
+    assert index_for(tmp_path / "logs").runs("ix") == []  # nothing indexed before its files exist
+    gate.set()
+    s.close()
+    (run,) = index_for(tmp_path / "logs").runs("ix")
+    assert Path(run["json"]).name == log_json.name and log_json.exists()
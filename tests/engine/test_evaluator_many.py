@@ -0,0 +1,32 @@
+from core.expressions import Variable, Lambda, Application
+from engine.evaluator import evaluate_full, evaluate_many
+
+class DummyLog:
+    def __init__(self): self.events=[]
+    def event(self, k, v): self.events.append((k, v))
+
+def test_evaluate_many_columns_match_single_calls():
+    exprs = ["1 -> 0", "1 -> 1", "1 -> 0", Application(Lambda(Variable("x"), Variable("x")), Variable("y"))]
+    cols = evaluate_many(exprs)
+    assert set(cols) == {"phase", "mode", "witness_hash", "ast_size", "depth"}
+    assert all(len(v) == len(exprs) for v in cols.values())
+    assert cols["phase"] == [evaluate_full(e).phase.name for e in exprs]
+    assert cols["mode"][0] == "implication-jam" and cols["mode"][1] == ""
+    assert cols["witness_hash"][0] and cols["witness_hash"][0] == cols["witness_hash"][2]
+
+def test_evaluate_many_logs_once():
+    log = DummyLog()
+    evaluate_many(["1 -> 0", "1 -> 0", "1 -> 1"], logger=log)
+    assert [k for k, _ in log.events] == ["batch"]
+    payload = log.events[0][1]
+    assert payload["count"] == 3 and payload["unique"] == 2 and payload["jam"] == 2
+    assert payload["modes"] == {"implication-jam": 2}
+    # per-item details are kept: one entry per distinct JAM input, with its positions
+    (entry,) = payload["jams"]
+    assert entry["items"] == [0, 1] and entry["mode"] == "implication-jam"
+    assert entry["details"]["witness_hash"] and "witness" in entry["details"] and entry["details"]["ast_size"]
+
+def test_evaluate_many_unhashable_inputs_not_confused():
+    # generator of short-lived unhashable objects: ids may be reused
+    cols = evaluate_many(({"args": [i]} if i % 2 else "1 -> 0" for i in range(6)))
+    assert cols["phase"] == ["JAM", "ALIVE"] * 3
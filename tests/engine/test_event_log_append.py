@@ -0,0 +1,36 @@
+import importlib
+import json
+import os
+import pytest
+
+def test_events_append_to_segment_and_compact_on_close(monkeypatch, tmp_path):
+    el = importlib.import_module("src.engine.event_log")
+    audit = importlib.import_module("src.engine.engine_audit")
+    monkeypatch.setattr(el, "LOG_DIR", str(tmp_path))
+
+    log = el.EventLog("ev", durability="flush")
+    for i in range(5):
+        log.event("phase", {"phase": "ALIVE", "i": i})
+    # flushed per event, no JSON array yet
+    assert len(audit.load_event_log(log.segment_path)) == 5
+    log.compact()
+    assert [e["data"]["i"] for e in audit.load_event_log(log.json_path)] == list(range(5))
+
+    log.event("jam", {"phase": "JAM"})
+    log.close()
+    events = audit.load_event_log(log.json_path)
+    assert len(events) == 6 and events[-1]["type"] == "jam"
+    assert not os.path.exists(log.segment_path)
+
+def test_compact_segment_recovers_torn_tail(monkeypatch, tmp_path):
+    el = importlib.import_module("src.engine.event_log")
+    seg = tmp_path / "run.events.jsonl"
+    seg.write_text(json.dumps({"type": "a"}) + "\n" + '{"type": "b"', encoding="utf-8")
+    assert el.compact_segment(str(seg), str(tmp_path / "run.json")) == 1
+    assert json.loads((tmp_path / "run.json").read_text(encoding="utf-8")) == [{"type": "a"}]
+
+def test_bad_durability_rejected(monkeypatch, tmp_path):
+    el = importlib.import_module("src.engine.event_log")
+    monkeypatch.setattr(el, "LOG_DIR", str(tmp_path))
+    with pytest.raises(ValueError):
+        el.EventLog("ev", durability="sometimes")
@@ -0,0 +1,41 @@
+from engine.frontend_cache import FrontendCache
+
+class DummyLog:
+    def __init__(self): self.events=[]
+    def event(self, k, v): self.events.append((k, v))
+
+def test_lru_hits_misses_evictions():
+    calls = []
+    c = FrontendCache(maxsize=2)
+    fn = lambda x: calls.append(x) or x.upper()
+    assert c.get_or_compute("a", fn) == "A"
+    assert c.get_or_compute("a", fn) == "A"
+    c.get_or_compute("b", fn)
+    c.get_or_compute("a", fn)          # refresh a → b is LRU
+    c.get_or_compute("c", fn)          # evicts b
+    c.get_or_compute("b", fn)
+    assert calls == ["a", "b", "c", "b"]
+    st = c.stats()
+    assert (st["hits"], st["misses"], st["evictions"], st["size"]) == (2, 4, 2, 2)
+
+def test_unhashable_objects_keyed_by_identity():
+    c = FrontendCache(maxsize=8)
+    obj = {"args": [1]}
+    assert c.get_or_compute(obj, lambda x: 1) == 1
+    assert c.get_or_compute(obj, lambda x: 2) == 1
+    assert c.get_or_compute({"args": [1]}, lambda x: 3) == 3
+
+def test_disabled_and_logged():
+    c = FrontendCache(maxsize=0)
+    c.get_or_compute("x", str)
+    assert len(c) == 0 and c.stats()["misses"] == 1
+    log = DummyLog()
+    c.log_stats(log)
+    assert log.events[0][0] == "cache" and log.events[0][1]["cache"] == "frontend"
+
+def test_malformed_env_size_falls_back(monkeypatch):
+    from engine.frontend_cache import _env_maxsize
+    monkeypatch.setenv("LEE_FRONTEND_CACHE_SIZE", "lots")
+    assert _env_maxsize() == 4096
+    monkeypatch.setenv("LEE_FRONTEND_CACHE_SIZE", "16")
+    assert _env_maxsize() == 16
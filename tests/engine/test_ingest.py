@@ -0,0 +1,42 @@
+import importlib
+import json
+
+def test_ingest_backfills_dedupes_and_skips_unchanged(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    an = importlib.import_module("src.engine.analytics")
+    logs = tmp_path / "logs"
+    monkeypatch.setattr(pl, "LOG_DIR", logs, raising=False)
+    for name, path in (("ANALYTICS_DIR", tmp_path / "an"), ("HISTORY", tmp_path / "an" / "history.jsonl"),
+                       ("AGG_STATE", tmp_path / "an" / "agg.json"), ("INGEST_DIR", tmp_path / "an" / "ingest"),
+                       ("RUN_STORE_DIR", None)):
+        monkeypatch.setattr(an, name, path)
+
+    p = pl.Pipeline("bf", domain="legal", enable_provenance=True, session="s1")
+    runs = [p.run(t) for t in ("1 -> 0", "1 -> 1", "p & ~p")]
+    (logs / "broken.json").write_text("{not json", encoding="utf-8")
+    # a copy of a run under another file name is the same run
+    (logs / "copy_x.json").write_text((logs / f"bf_{runs[0]['history']['run_id']}.json").read_text("utf-8"), "utf-8")
+
+    c = an.ingest(logs, workers=2, batch=2)
+    assert c == {"files": 5, "unchanged": 0, "ingested": 3, "duplicates": 1, "unreadable": 1}
+    recs = [json.loads(l) for l in an.HISTORY.read_text(encoding="utf-8").splitlines()]
+    assert {r["run_id"] for r in recs} == {r["history"]["run_id"] for r in runs}
+    jam = next(r for r in recs if r["run_id"] == runs[0]["history"]["run_id"])
+    assert jam["final_phase"] == "MEM" and jam["session"] == "s1" and jam["time_to_mem_ms"] > 0
+
+    assert an.ingest(logs)["unchanged"] == 5
+    p.run("A -> B")
+    c = an.ingest(logs)
+    assert c["ingested"] == 1 and c["unchanged"] == 5
+    assert an.aggregate()["total_runs"] == 4
+
+def test_ingest_dir_process_pool(tmp_path):
+    ing = importlib.import_module("src.engine.ingest")
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    for i in range(12):
+        (logs / f"r_{i}.json").write_text(json.dumps({"history": {"run_id": f"id{i % 10}"},
+                                                      "state": {"phase": "MEM"}}), encoding="utf-8")
+    c = ing.ingest_dir(logs, history=tmp_path / "h.jsonl", state_dir=tmp_path / "st", workers=3, chunksize=1)
+    assert c["ingested"] == 10 and c["duplicates"] == 2
+    assert len((tmp_path / "h.jsonl").read_text(encoding="utf-8").splitlines()) == 10
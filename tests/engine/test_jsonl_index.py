@@ -0,0 +1,59 @@
+import json
+
+from src.engine.jsonl_index import JsonlFile, iter_lines_reversed
+
+def _write(path, recs, tail=""):
+    with path.open("a", encoding="utf-8") as f:
+        for r in recs:
+            f.write(json.dumps(r) + "\n")
+        f.write(tail)
+
+def test_tail_without_index_reads_backwards_and_skips_torn_line(tmp_path):
+    p = tmp_path / "h.jsonl"
+    _write(p, ({"i": i, "pad": "x" * 100} for i in range(5000)), tail='{"i": "half')
+    jf = JsonlFile(p)
+    assert [r["i"] for r in jf.tail(3)] == [4997, 4998, 4999]
+    assert not jf.idx_path.exists()  # tail alone doesn't index the whole file
+    assert next(iter_lines_reversed(p)) == b'{"i": "half'
+
+def test_index_is_built_once_and_extended_on_append(tmp_path, monkeypatch):
+    p = tmp_path / "h.jsonl"
+    _write(p, ({"i": i} for i in range(100)), tail="not json\n")
+    jf = JsonlFile(p)
+    assert len(jf) == 101 and jf.get(0) == {"i": 0} and jf.get(-2) == {"i": 99} and jf.get(100) is None
+    assert [r["i"] for r in jf.slice(10, 13)] == [10, 11, 12]
+
+    # appends index only the new bytes; a fresh reader picks the sidecar up
+    jf.append({"i": "new"})
+    jf.append_many([{"i": "a"}, {"i": "b"}])
+    reads = []
+    real = JsonlFile._read
+    monkeypatch.setattr(JsonlFile, "_read", lambda self, a, b: reads.append((a, b)) or real(self, a, b))
+    other = JsonlFile(p)
+    assert len(other) == 104
+    assert [r["i"] for r in other.tail(3)] == ["new", "a", "b"]
+    assert reads == [(101, 104)]
+
+    recs = list(other.since(0))
+    assert recs[100][0] is None and recs[-1] == ({"i": "b"}, p.stat().st_size)
+
+def test_replaced_file_rebuilds_the_index(tmp_path):
+    p = tmp_path / "h.jsonl"
+    _write(p, ({"i": i} for i in range(50)))
+    jf = JsonlFile(p)
+    assert len(jf) == 50
+    p.write_text('{"i": "z"}\n', encoding="utf-8")
+    assert len(jf) == 1 and jf.tail(5) == [{"i": "z"}]
+
+def test_memory_store_and_memdb_use_the_reader(tmp_path, monkeypatch):
+    from src.engine import memdb, memory_store
+    monkeypatch.setattr(memory_store, "DATA_DIR", str(tmp_path / "mem"))
+    ms = memory_store.MemoryStore("s.jsonl")
+    for i in range(20):
+        ms.append({"i": i})
+    assert [r["i"] for r in ms.load(tail=2)] == [18, 19] and len(ms.load()) == 20 and ms.get(5) == {"i": 5}
+
+    monkeypatch.setattr(memdb, "MEMDB_DIR", tmp_path / "memdb")
+    for i in range(3):
+        memdb.append_patient_history("P1", {"history": {"run_id": f"r{i}"}, "state": {"phase": "MEM"}})
+    assert [r["run_id"] for r in memdb.load_patient_history("P1", tail=2)] == ["r1", "r2"]
@@ -0,0 +1,54 @@
+import importlib
+import json
+import random
+
+def test_histogram_quantiles_within_one_percent():
+    lat = importlib.import_module("src.engine.latency")
+    rng = random.Random(7)
+    values = [rng.lognormvariate(1.0, 1.2) for _ in range(20000)]
+    h = lat.LatencyHistogram()
+    for v in values:
+        h.add(v)
+    values.sort()
+    for name, q in lat.QUANTILES:
+        exact = values[max(0, int(q * len(values)) - 1)]
+        assert abs(h.quantile(q) - exact) <= 0.011 * exact + 1e-9, name
+    assert h.n == len(values) and h.min == values[0] and h.max == values[-1]
+
+def test_shards_merge_exactly_and_round_trip():
+    lat = importlib.import_module("src.engine.latency")
+    a, b, whole = lat.LatencyStats(), lat.LatencyStats(), lat.LatencyStats()
+    for i in range(1, 500):
+        shard = a if i % 2 else b
+        for st in (shard, whole):
+            st.record("elapsed_ms", i * 0.37, session="s", domain="legal", phase="MEM")
+    a.record("elapsed_ms", None, session="s")  # ignored
+    merged = lat.LatencyStats.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+    assert merged.rows() == whole.rows()
+    assert len(json.dumps(whole.to_dict())) < 1500  # buckets, not samples
+
+def test_summary_shows_percentiles_from_history_and_shards(monkeypatch, tmp_path):
+    an = importlib.import_module("src.engine.analytics")
+    lat = importlib.import_module("src.engine.latency")
+    for name, path in (("ANALYTICS_DIR", tmp_path), ("HISTORY", tmp_path / "history.jsonl"),
+                       ("AGG_STATE", tmp_path / "aggregate.state.json"), ("SUMMARY_MD", tmp_path / "summary.md"),
+                       ("LATENCY_DIR", tmp_path / "latency"), ("RUN_STORE_DIR", None)):
+        monkeypatch.setattr(an, name, path)
+    an.HISTORY.write_text("".join(json.dumps({"run_id": str(i), "session": "s", "final_phase": "MEM",
+                                              "time_to_mem_ms": float(i)}) + "\n" for i in range(1, 101)),
+                          encoding="utf-8")
+    for _ in range(2):
+        st = lat.LatencyStats()
+        st.record("elapsed_ms", 2.0, session="batch", domain="legal", phase="MEM")
+        an.record_latency(st)
+
+    md = an.write_summary_md().read_text(encoding="utf-8")
+    assert "## Latency Percentiles (ms)" in md
+    assert "| time_to_mem_ms | s |  | MEM | 100 |" in md
+    assert "| elapsed_ms | batch | legal | MEM | 2 | 2.000 |" in md
+    # the report only reads; compaction is its own step and keeps the numbers
+    assert len(list(an.LATENCY_DIR.glob("shard-*.json"))) == 2
+    assert an.compact_latency() == 2 and an.compact_latency() == 0
+    assert [p.name for p in an.LATENCY_DIR.iterdir()] == ["merged.json"]
+    an.record_latency(st)
+    assert an.load_latency().rows()[0]["n"] == 3
@@ -0,0 +1,57 @@
+import importlib
+import os
+
+def _touch(d, name, *suffixes):
+    for suf in suffixes:
+        (d / f"{name}{suf}").write_text("{}", encoding="utf-8")
+
+def test_prune_keeps_newest_runs_per_name(tmp_path):
+    li = importlib.import_module("src.engine.log_index")
+    idx = li.LogIndex(tmp_path)
+    for i in range(5):
+        _touch(tmp_path, f"a_{i}", ".json", ".svg")
+        idx.add("a", str(i), tmp_path / f"a_{i}.json", [tmp_path / f"a_{i}.svg"], created=float(i))
+    _touch(tmp_path, "a_b_0", ".json")
+    idx.add("a_b", "0", tmp_path / "a_b_0.json", created=9.0)
+
+    assert idx.prune("a", 2) == ["a_0.json", "a_1.json", "a_2.json"]
+    assert sorted(os.listdir(tmp_path)) == ["a_3.json", "a_3.svg", "a_4.json", "a_4.svg", "a_b_0.json", "index.jsonl"]
+    assert [r["run_id"] for r in idx.runs("a")] == ["3", "4"]
+    # another process's view catches up from the file
+    assert [r["run_id"] for r in li.LogIndex(tmp_path).runs("a")] == ["3", "4"]
+
+def test_newest_reads_from_the_end_and_skips_removed(tmp_path):
+    li = importlib.import_module("src.engine.log_index")
+    idx = li.LogIndex(tmp_path)
+    for name in ("x_1", "y_1", "x_2"):
+        _touch(tmp_path, name, ".json")
+        idx.add(name.split("_")[0], name[-1], tmp_path / f"{name}.json")
+    assert idx.newest() == tmp_path / "x_2.json"
+    assert idx.newest("y") == tmp_path / "y_1.json"
+    idx.prune("x", 0)
+    assert idx.newest() == tmp_path / "y_1.json"
+    idx.compact()
+    assert idx.path.read_text(encoding="utf-8").count("\n") == 1
+
+def test_rebuild_from_existing_directory(tmp_path):
+    li = importlib.import_module("src.engine.log_index")
+    _touch(tmp_path, "run_abc", ".json", ".prov.jsonl", ".timeline.md")
+    _touch(tmp_path, "orphan_1", ".svg")
+    idx = li.LogIndex(tmp_path)
+    assert idx.newest() == tmp_path / "run_abc.json"  # missing index → rebuilt
+    (rec,) = idx.runs("run")
+    assert rec["run_id"] == "abc" and rec["artifacts"] == ["run_abc.prov.jsonl", "run_abc.timeline.md"]
+    assert idx.rebuild() == 1
+
+def test_pipeline_and_event_log_register_runs(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    el = importlib.import_module("src.engine.event_log")
+    li = importlib.import_module("src.engine.log_index")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path, raising=False)
+    monkeypatch.setattr(el, "LOG_DIR", str(tmp_path))
+
+    res = pl.Pipeline("idx", domain="legal", enable_provenance=True).run("1 -> 0")
+    assert li.newest_json(tmp_path) == tmp_path / os.path.basename(res["log_json"])
+    with el.EventLog("ev") as log:
+        log.event("phase", {"phase": "ALIVE"})
+    assert li.newest_json(tmp_path) == tmp_path / os.path.basename(log.json_path)
@@ -0,0 +1,102 @@
+import csv
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.engine import olap_query as oq
+
+FIELDS = ["run_id", "log_name", "session", "event_id", "event_type", "phase", "ts", "date", "hour",
+          "mode", "witness_pattern", "time_to_mem_ms"]
+
+def _run_file(log_dir, name, start, events, session="X", suffix=".csv"):
+    """One EventLog-style row file: events are (event_type, mode, pattern) a minute apart."""
+    path = log_dir / f"{name}_{start.strftime('%Y%m%dT%H%M%S')}{suffix}"
+    rows = []
+    for i, (etype, mode, pat) in enumerate(events):
+        ts = start + timedelta(minutes=i)
+        rows.append({"run_id": f"{name}-{start:%d}", "log_name": name, "session": session, "event_id": i + 1,
+                     "event_type": etype, "phase": "JAM" if etype == "jam" else "ALIVE", "ts": ts.isoformat(),
+                     "date": ts.date().isoformat(), "hour": ts.hour, "mode": mode, "witness_pattern": pat,
+                     "time_to_mem_ms": 5.0 if etype == "mem" else ""})
+    if suffix == ".csv":
+        with path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=FIELDS)
+            w.writeheader()
+            w.writerows(rows)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        for r in rows:
+            r["time_to_mem_ms"] = r["time_to_mem_ms"] or None
+        pq.write_table(pa.Table.from_pylist(rows), path, row_group_size=2)
+    last = start + timedelta(minutes=len(events))
+    os.utime(path, (last.timestamp(), last.timestamp()))
+    return path
+
+@pytest.fixture
+def logs(tmp_path):
+    d = tmp_path / "logs"
+    d.mkdir()
+    for day in range(1, 8):
+        start = datetime(2025, 1, day, 9, 0, tzinfo=timezone.utc)
+        _run_file(d, "cli", start, [("start", "", ""), ("jam", "implication", "P->Q"),
+                                    ("jam", "contradiction", "P&~P"), ("mem", "", "")],
+                  session="X" if day % 2 else "Y")
+    _run_file(d, "batch", datetime(2025, 1, 7, 10, 0, tzinfo=timezone.utc), [("jam", "implication", "A->B")])
+    return d
+
+def test_filters_prune_files_before_opening(logs, monkeypatch):
+    opened = []
+    real = oq._scan_csv
+    monkeypatch.setattr(oq, "_scan_csv", lambda p, *a: opened.append(p.name) or real(p, *a))
+    rows = oq.query(logs, where=[("event_type", "=", "jam"), ("mode", "=", "implication"), ("date", "=", "2025-01-07")],
+                    session="X", columns=["ts", "log_name", "witness_pattern"])
+    assert rows == [{"ts": "2025-01-07T09:01:00+00:00", "log_name": "cli", "witness_pattern": "P->Q"},
+                    {"ts": "2025-01-07T10:00:00+00:00", "log_name": "batch", "witness_pattern": "A->B"}]
+    assert opened == ["cli_20250107T090000.csv", "batch_20250107T100000.csv"]
+
+    opened.clear()
+    assert len(oq.query(logs, where=[("log_name", "=", "batch")])) == 1
+    assert opened == ["batch_20250107T100000.csv"]
+
+def test_only_event_log_row_files_are_read(logs):
+    # run_batch results share the log dir: <prefix>_<%Y%m%d_%H%M%S>.csv with their own columns
+    (logs / "batch_20250107_100000.csv").write_text("text,domain,phase,jam\nx,general,JAM,1\n", encoding="utf-8")
+    assert [p.name for p in oq.row_files(logs, [("log_name", "=", "batch")])] == ["batch_20250107T100000.csv"]
+    assert len(oq.query(logs, where=[("phase", "=", "JAM")])) == 15
+
+def test_operators_numeric_columns_and_limit(logs):
+    assert len(oq.query(logs, where=[("date", ">=", "2025-01-06"), ("event_type", "in", ["jam", "mem"])])) == 7
+    assert len(oq.query(logs, where=[("time_to_mem_ms", ">", "4")])) == 7  # coerced to float
+    assert len(oq.query(logs, where=[("witness_pattern", "not in", ["P->Q"])], event_type="jam")) == 8
+    assert [r["date"] for r in oq.query(logs, event_type="mem", limit=2)] == ["2025-01-01", "2025-01-02"]
+    with pytest.raises(ValueError):
+        oq.query(logs, where=[("mode", "~", "x")])
+
+def test_csv_scan_stops_past_a_time_upper_bound(logs):
+    path = next(p for p in oq.row_files(logs) if p.name.startswith("cli_20250103"))
+    rows = list(oq._scan_csv(path, oq._normalize([("ts", "<", "2025-01-03T09:01:30")], {}), None))
+    assert [r["event_id"] for r in rows] == [1.0, 2.0]
+
+def test_parse_where_and_cli(logs, capsys):
+    assert oq.parse_where("date>=2025-01-07") == ("date", ">=", "2025-01-07")
+    assert oq.parse_where("event_type in jam, mem") == ("event_type", "in", ["jam", "mem"])
+    assert oq._cli(["--dir", str(logs), "--where", "mode=contradiction", "--count"]) == 0
+    assert capsys.readouterr().out.strip() == "7"
+
+def test_parquet_row_group_statistics(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    d = tmp_path / "logs"
+    d.mkdir()
+    _run_file(d, "cli", datetime(2025, 1, 7, 9, tzinfo=timezone.utc),
+              [("start", "", ""), ("phase", "", ""), ("jam", "implication", "P->Q"), ("mem", "", "")],
+              suffix=".parquet")
+    read = []
+    import pyarrow.parquet as pq
+    real = pq.ParquetFile.read_row_groups
+    monkeypatch.setattr(pq.ParquetFile, "read_row_groups",
+                        lambda self, groups, **kw: read.append(list(groups)) or real(self, groups, **kw))
+    table = oq.query(d, where=[("event_type", "=", "jam")], columns=["ts", "mode"], as_arrow=True)
+    assert table.column_names == ["ts", "mode"] and table.to_pylist()[0]["mode"] == "implication"
+    assert read == [[1]]  # the first row group (start, phase) is skipped by its min/max
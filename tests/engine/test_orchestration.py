@@ -0,0 +1,238 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.engine.orchestration import BaseDriver, FileDriver, Orchestrator
+
+def _lines(d, pattern="lee_evt_*.jsonl"):
+    return [json.loads(l) for f in sorted(d.glob(pattern)) for l in f.read_text(encoding="utf-8").splitlines()]
+
+def test_events_are_buffered_until_flush_or_threshold(tmp_path):
+    drv = FileDriver(str(tmp_path), buffer_bytes=10_000, flush_interval=None)
+    for i in range(5):
+        drv.publish("jam", {"i": i})
+    assert _lines(tmp_path) == []
+    drv.flush()
+    assert [r["data"]["i"] for r in _lines(tmp_path)] == list(range(5))
+
+    small = FileDriver(str(tmp_path / "s"), buffer_bytes=1, flush_interval=None)
+    small.publish("mem", {"i": 0})
+    assert len(_lines(tmp_path / "s")) == 1  # over the threshold: committed at once
+    drv.close()
+    small.close()
+
+def test_time_threshold_commits_idle_buffers(tmp_path):
+    drv = FileDriver(str(tmp_path), flush_interval=0.05)
+    drv.publish("jam", {"i": 1})
+    deadline = time.monotonic() + 2
+    while not _lines(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(_lines(tmp_path)) == 1
+    drv.close()
+    drv.publish("jam", {"i": 2})  # usable again after close
+    drv.close()
+    assert len(_lines(tmp_path)) == 2
+
+def test_rotation_seals_files_and_keeps_every_line(tmp_path):
+    drv = FileDriver(str(tmp_path), buffer_bytes=1, flush_interval=None, rotate_bytes=300)
+    for i in range(40):
+        drv.publish("jam", {"i": i})
+    drv.close()
+    sealed = sorted(tmp_path.glob("lee_evt_jam.*.jsonl"))
+    assert sealed and all(f.stat().st_size >= 300 for f in sealed)
+    assert sorted(r["data"]["i"] for r in _lines(tmp_path, "lee_evt_jam*.jsonl")) == list(range(40))
+
+def test_orchestrator_concurrent_publishers_and_close(tmp_path):
+    cfg = {"driver": "file", "file": {"dir": str(tmp_path), "buffer_kb": 4, "flush_ms": 50}}
+    with Orchestrator(cfg) as orch:
+        def work(n):
+            for i in range(500):
+                orch.publish("run_end", {"t": n, "i": i})
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    rows = _lines(tmp_path)
+    assert len(rows) == 4000 and len({r["data"]["event_id"] for r in rows}) == 4000
+
+# ---------- WebhookDriver against a local http.server ----------
+
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.engine.orchestration import DeliveryRejected, WebhookDriver
+
+@contextlib.contextmanager
+def _receiver(statuses=(), delay=0.0):
+    """Local webhook receiver: answers `statuses` in order, then 200; records bodies and client ports."""
+    seen = {"bodies": [], "ports": set(), "statuses": list(statuses)}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(delay)
+            status = seen["statuses"].pop(0) if seen["statuses"] else 200
+            if status == 200:
+                seen["bodies"].append(body)
+                seen["ports"].add(self.client_address[1])
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *a):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True  # don't wait on idle keep-alive connections
+    t = threading.Thread(target=srv.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    t.start()
+    try:
+        yield f"http://127.0.0.1:{srv.server_address[1]}/hook", seen
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+def test_webhook_batches_over_one_keepalive_connection():
+    with _receiver() as (url, seen):
+        drv = WebhookDriver(url, batch_size=10, batch_ms=20)
+        for i in range(35):
+            drv.publish("jam", {"i": i})
+        assert drv.flush(5)
+        drv.close()
+    events = [e for b in seen["bodies"] for e in b["events"]]
+    assert [e["data"]["i"] for e in events] == list(range(35))
+    assert all(len(b["events"]) <= 10 for b in seen["bodies"])
+    m = drv.metrics()
+    assert m["delivered"] == 35 and m["failed"] == 0 and m["connections"] == 1 and len(seen["ports"]) == 1
+
+def test_webhook_retries_5xx_and_gives_up_on_4xx():
+    with _receiver(statuses=[503, 500]) as (url, seen):
+        drv = WebhookDriver(url, batch_size=1, backoff_s=0.01)
+        drv.publish("mem", {"i": 1})
+        drv.flush(5)
+        assert seen["bodies"] == [{"type": "mem", "data": {"i": 1}}]
+        assert drv.metrics()["retries"] == 2
+        drv.close()
+    with _receiver(statuses=[400]) as (url, seen):
+        drv = WebhookDriver(url, batch_size=1, backoff_s=0.01)
+        drv.publish("mem", {"i": 2})
+        drv.flush(5)
+        m = drv.metrics()
+        assert m["failed"] == 1 and m["retries"] == 0 and drv.last_error == "HTTP 400"
+        drv.close()
+
+def test_webhook_bounded_queue_never_blocks_publishers_with_drop_policy():
+    with _receiver(delay=0.3) as (url, seen):
+        drv = WebhookDriver(url, batch_size=1, queue_size=2, overflow="drop_new")
+        t0 = time.monotonic()
+        for i in range(20):
+            drv.publish("jam", {"i": i})
+        assert time.monotonic() - t0 < 0.2  # a slow receiver doesn't stall the caller
+        m = drv.metrics()
+        assert m["dropped"] >= 15 and m["enqueued"] + m["dropped"] == 20
+        drv.close()
+        assert drv.metrics()["delivered"] == m["enqueued"]
+
+def test_webhook_unreachable_receiver_counts_failures():
+    drv = WebhookDriver("http://127.0.0.1:9/hook", batch_size=1, max_retries=1, backoff_s=0.01, timeout=1)
+    drv.publish("jam", {})
+    assert drv.flush(5)
+    assert drv.metrics()["failed"] == 1 and drv.last_error
+    drv.close()
+
+def test_webhook_deliver_is_synchronous_and_raises_on_failure():
+    with _receiver(statuses=[400]) as (url, seen):
+        drv = WebhookDriver(url, batch_size=3, backoff_s=0.01)
+        with pytest.raises(DeliveryRejected, match="HTTP 400"):
+            drv.deliver([("jam", {"i": 0})])
+        drv.deliver([("jam", {"i": i}) for i in range(7)])
+        assert [len(b["events"]) for b in seen["bodies"]] == [3, 3, 1]
+        drv.close()
+
+# ---------- publish_many / event ids ----------
+
+from src.engine.orchestration import new_event_ids
+
+def test_event_ids_are_monotonic_ulids():
+    ids = new_event_ids(1000) + new_event_ids(1) + new_event_ids(5)
+    assert all(len(i) == 26 and set(i) <= set("0123456789ABCDEFGHJKMNPQRSTVWXYZ") for i in ids)
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    ms = 0  # decode the timestamp part of the last id
+    for ch in ids[-1][:10]:
+        ms = ms * 32 + "0123456789ABCDEFGHJKMNPQRSTVWXYZ".index(ch)
+    assert abs(ms / 1000 - time.time()) < 5
+
+def test_publish_many_is_one_write_per_type(tmp_path, monkeypatch):
+    import os
+    from src.engine import orchestration
+    writes = []
+    real = os.write
+    monkeypatch.setattr(orchestration.os, "write", lambda fd, b: writes.append(len(b)) or real(fd, b))
+    with Orchestrator({"driver": "file", "file": {"dir": str(tmp_path), "buffer_kb": 0}}) as orch:
+        ids = orch.publish_many([("run_start", {"k": 0}), ("jam", {"k": 1}), ("jam", {"k": 2}), ("run_end", {"k": 3})])
+    assert len(writes) == 3  # run_start, jam (both lines), run_end
+    rows = _lines(tmp_path)
+    assert sorted(r["data"]["event_id"] for r in rows) == ids == sorted(ids)
+
+def test_webhook_publish_many_is_one_request():
+    with _receiver() as (url, seen):
+        drv = WebhookDriver(url, batch_size=10, batch_ms=0)
+        drv.publish_many([("jam", {"i": i}) for i in range(4)])
+        drv.publish_many([("mem", {"i": i}) for i in range(25)])
+        assert drv.flush(5)
+        drv.close()
+    assert [len(b["events"]) for b in seen["bodies"]] == [4, 10, 10, 5]  # batches are never split
+    assert [e["data"]["i"] for b in seen["bodies"] for e in b["events"] if e["type"] == "jam"] == [0, 1, 2, 3]
+
+# ---------- fan-out ----------
+
+from src.engine.orchestration import compile_route
+
+def test_compile_route_types_and_phases():
+    anything = compile_route(None)
+    assert anything("jam", {})
+    r = compile_route({"types": ["jam", "run_*"], "phases": "jam"})
+    assert r("jam", {"phase": "JAM"}) and r("run_end", {"phase": "Jam"})
+    assert not r("mem", {"phase": "JAM"}) and not r("jam", {"phase": "MEM"}) and not r("jam", {})
+
+class _Slow(BaseDriver):
+    def __init__(self, delay):
+        self.delay, self.got = delay, []
+
+    def publish(self, event_type, payload):
+        time.sleep(self.delay)
+        self.got.append(event_type)
+
+def test_fanout_routes_and_isolates_a_slow_driver(tmp_path):
+    cfg = {"drivers": [
+        {"driver": "file", "file": {"dir": str(tmp_path)}},
+        {"name": "jams", "driver": "file", "file": {"dir": str(tmp_path / "jams")}, "route": {"types": ["jam"]}},
+    ]}
+    with Orchestrator(cfg) as orch:
+        slow = orch.driver.lanes[1].driver = _Slow(0.01)
+        t0 = time.monotonic()
+        for i in range(20):
+            orch.publish_many([("run_start", {"i": i}), ("jam", {"i": i, "phase": "JAM"})])
+        assert time.monotonic() - t0 < 0.15  # the caller never waits on the slow sink
+        m = orch.metrics()
+        assert m["jams"]["filtered"] == 20 and m["jams"]["enqueued"] == 20
+        orch.flush()
+        m = orch.metrics()
+        assert m["file0"]["delivered"] == 40 and m["jams"]["delivered"] == 20
+        assert m["jams"]["queued"] == 0 and m["jams"]["last_lag_ms"] > 0 and m["jams"]["events_per_s"] > 0
+    assert len(_lines(tmp_path)) == 40 and slow.got == ["jam"] * 20
+
+def test_fanout_drop_policy_counts_drops(tmp_path):
+    from src.engine.orchestration import FanOutDriver, _Lane
+    slow = _Slow(0.05)
+    fan = FanOutDriver([_Lane("slow", slow, compile_route(None), queue_size=2, overflow="drop_new", batch_size=1)])
+    for i in range(10):
+        fan.publish("jam", {"i": i})
+    fan.close()
+    m = fan.metrics()["slow"]
+    assert m["dropped"] > 0 and m["delivered"] + m["dropped"] == 10 == m["enqueued"] + m["dropped"]
@@ -0,0 +1,40 @@
+import importlib
+import pytest
+
+def test_session_reuses_pipeline_and_closes(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+
+    with pl.PipelineSession("sess", domain="legal", enable_provenance=True, session="s") as s:
+        pipe = s.pipeline
+        r1 = s.run("1 -> 0", log_name="sess_a")
+        r2 = s.run("1 -> 1", log_name="sess_b")
+        assert s.pipeline is pipe and s.runs == 2
+        assert r1["history"]["phases"] == ["ALIVE", "JAM", "MEM"]
+        assert r2["history"]["phases"] == ["ALIVE", "MEM"]
+        assert "sess_a_" in r1["log_json"] and "sess_b_" in r2["log_json"]
+    assert s.closed
+    with pytest.raises(RuntimeError):
+        s.run("1 -> 0")
+
+def test_session_log_name_is_per_call(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+
+    with pl.PipelineSession("base", domain="legal", enable_provenance=True) as s:
+        r1 = s.run("1 -> 0", log_name="other")
+        r2 = s.run("1 -> 0")
+    assert "other_" in r1["log_json"]
+    assert "base_" in r2["log_json"] and s.pipeline.log_name == "base"
+
+def test_session_run_text_goes_through_the_handshake(monkeypatch, tmp_path):
+    pl = importlib.import_module("src.engine.pipeline")
+    monkeypatch.setattr(pl, "LOG_DIR", tmp_path / "logs", raising=False)
+
+    with pl.PipelineSession("nl", domain="legal", enable_provenance=True) as s:
+        res = s.run_text("breach implies liability contradiction", log_name="nl_a")
+        assert s.runs == 1
+    assert res["meta"]["nl"] == "breach implies liability contradiction" and "lambda_nf" in res["meta"]
+    assert res["state"]["phase"] == "MEM" and "nl_a_" in res["log_json"]
+    jam = next(t for t in res["history"]["transitions"] if t["to"] == "JAM")
+    assert jam["details"]["nl"] == res["meta"]["nl"]
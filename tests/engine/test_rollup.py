@@ -0,0 +1,47 @@
+import importlib
+
+def _log(el, name, events):
+    log = el.EventLog(name, session="s1")
+    for kind, payload in events:
+        log.event(kind, payload)
+    log.snapshot_svg()
+    return log
+
+def test_rollup_merges_new_rows_incrementally(monkeypatch, tmp_path):
+    el = importlib.import_module("src.engine.event_log")
+    ru = importlib.import_module("src.engine.rollup")
+    monkeypatch.setattr(el, "LOG_DIR", str(tmp_path / "logs"))
+    r = ru.Rollup(tmp_path / "rollups", tmp_path / "logs")
+
+    log = _log(el, "a", [("phase", {"phase": "ALIVE", "ast_size": 3, "depth": 1}),
+                         ("jam", {"phase": "JAM", "details": {"mode": "contradiction", "ast_size": 5}})])
+    assert r.refresh() == 1
+    day = r.query("day")
+    assert len(day) == 1 and day[0]["count"] == 2 and day[0]["jam"] == 1
+    assert day[0]["ast_size_min"] == 3 and day[0]["ast_size_max"] == 5 and day[0]["ast_size_avg"] == 4
+
+    # snapshot rewrites the same row file with one more row: only that row is merged
+    log.event("mem", {"phase": "MEM", "time_to_mem_ms": 12.5})
+    log.snapshot_svg()
+    assert r.refresh() == 1 and r.refresh() == 0
+    day = r.query("day")
+    assert day[0]["count"] == 3 and day[0]["time_to_mem_ms_sum"] == 12.5
+
+    by_mode = {row["mode"]: row["count"] for row in r.query("minute", group_by=("mode",))}
+    assert by_mode == {"": 2, "contradiction": 1}
+    assert r.query("hour", mode="contradiction")[0]["jam_rate"] == 1.0
+    assert r.query("day", start="2999-01-01") == []
+    assert r.refresh(rebuild=True) == 1 and r.query("day")[0]["count"] == 3
+
+def test_rollup_ignores_non_event_log_csvs(monkeypatch, tmp_path):
+    el = importlib.import_module("src.engine.event_log")
+    ru = importlib.import_module("src.engine.rollup")
+    monkeypatch.setattr(el, "LOG_DIR", str(tmp_path / "logs"))
+    _log(el, "a", [("phase", {"phase": "ALIVE", "ast_size": 3})])
+    # run_batch writes its results next to the event logs: <prefix>_<%Y%m%d_%H%M%S>.csv
+    (tmp_path / "logs" / "batch_20250107_100000.csv").write_text(
+        "text,domain,phase,jam\nx,general,ALIVE,0\ny,general,JAM,1\n", encoding="utf-8")
+    (tmp_path / "logs" / "export.csv").write_text("ts,event_type\n2025-01-07T10:00:00,jam\n", encoding="utf-8")
+    r = ru.Rollup(tmp_path / "rollups", tmp_path / "logs")
+    assert r.refresh() == 1
+    assert r.query("day")[0]["count"] == 1
@@ -0,0 +1,71 @@
+import importlib
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+def _history(path, n, start=0):
+    with path.open("a", encoding="utf-8") as f:
+        for i in range(start, start + n):
+            f.write(json.dumps({
+                "run_id": f"r{i}", "session": None if i % 4 == 0 else f"s{i % 2}",
+                "final_phase": "JAM" if i % 3 == 0 else "MEM",
+                "time_to_mem_ms": float(i) if i % 2 else None, "log_json": f"data/logs/x_{i}.json",
+                "ts_start": None, "ts_end": f"t{i}", "recorded_at": f"t{i}",
+            }) + "\n")
+
+def test_columnar_aggregate_matches_jsonl_checkpoint(monkeypatch, tmp_path):
+    an = importlib.import_module("src.engine.analytics")
+    monkeypatch.setattr(an, "ANALYTICS_DIR", tmp_path)
+    monkeypatch.setattr(an, "HISTORY", tmp_path / "history.jsonl")
+    monkeypatch.setattr(an, "AGG_STATE", tmp_path / "aggregate.state.json")
+    monkeypatch.setattr(an, "RUN_STORE_DIR", tmp_path / "cols")
+    _history(an.HISTORY, 25)
+    cols = an.aggregate()
+    _history(an.HISTORY, 5, start=25)
+    cols = an.aggregate()
+
+    monkeypatch.setattr(an, "RUN_STORE_DIR", None)
+    ref = an.aggregate(rebuild=True)
+    assert cols == ref
+    assert cols["last_runs"][0]["run_id"] == "r20" and cols["last_runs"][-1]["session"] == "s1"
+
+def test_store_parts_merge_and_time_series(monkeypatch, tmp_path):
+    rs = importlib.import_module("src.engine.run_store")
+    monkeypatch.setattr(rs, "MAX_PARTS", 3)
+    store = rs.RunStore(tmp_path / "cols")
+    hist = tmp_path / "history.jsonl"
+    for k in range(5):
+        _history(hist, 4, start=4 * k)
+        assert store.sync(hist) == 4
+    assert len(list((tmp_path / "cols").glob("part-*"))) <= 3
+    ttm = store.columns(["time_to_mem_ms"])["time_to_mem_ms"]
+    assert np.nansum(ttm) == sum(i for i in range(20) if i % 2)
+    assert [r["run_id"] for r in store.tail(3)] == ["r17", "r18", "r19"]
+    # a fresh handle (another process) reads the same state
+    assert rs.RunStore(tmp_path / "cols").rows() == 20
+
+def _sync_in_child(root, hist, rounds):
+    rs = importlib.import_module("src.engine.run_store")
+    store = rs.RunStore(root)
+    for _ in range(rounds):
+        store.sync(hist)
+
+def test_concurrent_processes_sync_without_losing_or_doubling_rows(tmp_path):
+    import multiprocessing
+    ctx = multiprocessing.get_context("fork")
+    hist = tmp_path / "history.jsonl"
+    root = tmp_path / "cols"
+    procs = []
+    for k in range(8):
+        _history(hist, 25, start=25 * k)
+        procs.append(ctx.Process(target=_sync_in_child, args=(root, hist, 5)))
+        procs[-1].start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+    rs = importlib.import_module("src.engine.run_store")
+    store = rs.RunStore(root)
+    store.sync(hist)
+    assert store.rows() == 200
+    assert sorted(int(r["run_id"][1:]) for r in store.tail(200)) == list(range(200))
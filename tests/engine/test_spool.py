@@ -0,0 +1,199 @@
+import json
+import threading
+import time
+
+from src.engine.orchestration import BaseDriver, DeliveryRejected, Orchestrator
+from src.engine.spool import Spool
+
+def test_append_read_ack_in_order(tmp_path):
+    sp = Spool(tmp_path)
+    seqs = [sp.append("jam", {"i": i}) for i in range(10)]
+    assert seqs == list(range(1, 11)) and sp.pending() == 10
+    first = sp.read(0, max_n=4)
+    assert [s for s, _, _ in first] == [1, 2, 3, 4]
+    rest = sp.read(4)
+    assert [d["i"] for _, _, d in rest] == list(range(4, 10))
+    sp.ack(4)
+    assert sp.pending() == 6 and [s for s, _, _ in sp.read(sp.acked, 2)] == [5, 6]
+    sp.close()
+
+def test_reopen_replays_unacked_and_trims_torn_line(tmp_path):
+    sp = Spool(tmp_path)
+    for i in range(5):
+        sp.append("mem", {"i": i})
+    sp.ack(2)
+    sp.close()
+    seg = next(tmp_path.glob("seg-*.jsonl"))
+    with seg.open("ab") as f:
+        f.write(b'{"seq": 6, "type": "mem", "da')  # crash mid-append
+    sp = Spool(tmp_path)
+    assert sp.acked == 2 and sp.next_seq == 6
+    assert [d["i"] for _, _, d in sp.read(sp.acked)] == [2, 3, 4]
+    assert sp.append("mem", {"i": 5}) == 6
+    assert [s for s, _, _ in sp.read(5)] == [6]
+    sp.close()
+
+def test_fully_acked_segments_are_deleted(tmp_path):
+    sp = Spool(tmp_path, segment_bytes=200, compact_bytes=100)
+    for i in range(30):
+        sp.append("jam", {"i": i})
+    segs = sorted(tmp_path.glob("seg-*.jsonl"))
+    assert len(segs) > 3
+    sp.ack(15)
+    left = sorted(tmp_path.glob("seg-*.jsonl"))
+    assert len(left) < len(segs)
+    assert [d["i"] for _, _, d in sp.read(sp.acked)] == list(range(15, 30))
+    sp.ack(30)
+    assert len(list(tmp_path.glob("seg-*.jsonl"))) == 0  # active segment rolled and dropped
+    assert sp.append("jam", {"i": 30}) == 31
+    sp.close()
+    sp = Spool(tmp_path)
+    assert sp.next_seq == 32 and [s for s, _, _ in sp.read(sp.acked)] == [31]
+    sp.close()
+
+def test_consumers_ack_on_their_own_and_compaction_waits_for_the_slowest(tmp_path):
+    (tmp_path / "ack.json").write_text('{"acked": 0}', encoding="utf-8")  # single-consumer layout
+    sp = Spool(tmp_path, segment_bytes=200, compact_bytes=100, consumers=("a", "b"))
+    for i in range(30):
+        sp.append("jam", {"i": i})
+    sp.ack(30, "a")
+    assert sp.pending("a") == 0 and sp.pending("b") == 30 and sp.acked == 0
+    assert len(list(tmp_path.glob("seg-*.jsonl"))) > 3  # b still needs every segment
+    assert [d["i"] for _, _, d in sp.read(sp.acked_by("b"))] == list(range(30))
+    sp.ack(30, "b")
+    assert sp.pending() == 0 and len(list(tmp_path.glob("seg-*.jsonl"))) == 0
+    sp.close()
+    sp = Spool(tmp_path, consumers=("a", "c"))  # a lane was added: it starts at the oldest ack
+    assert sp.acks == {"a": 30, "c": 30}
+    sp.close()
+
+class _Flaky(BaseDriver):
+    """Refuses deliveries while `down` is set; records what it accepted."""
+
+    def __init__(self):
+        self.down = threading.Event()
+        self.got = []
+
+    def publish(self, event_type, payload):
+        self.got.append((event_type, payload))
+
+    def deliver(self, events):
+        if self.down.is_set():
+            raise ConnectionError("receiver down")
+        self.got.extend(events)
+
+def test_orchestrator_spools_until_driver_recovers_and_replays_on_restart(tmp_path):
+    cfg = {"driver": "file", "file": {"dir": str(tmp_path / "outbox")}, "spool": {"dir": str(tmp_path / "spool")}}
+    orch = Orchestrator(cfg)
+    drv = orch.dispatcher.driver = _Flaky()
+    drv.down.set()
+    for i in range(20):
+        orch.publish("jam", {"i": i})
+    time.sleep(0.1)
+    assert drv.got == [] and orch.spool.pending() == 20
+    orch.dispatcher.stop()  # "crash" with everything unacknowledged
+    orch.spool.close()
+
+    orch = Orchestrator(cfg)  # replays into the real FileDriver
+    orch.close()
+    rows = [json.loads(l) for l in (tmp_path / "outbox" / "lee_evt_jam.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["data"]["i"] for r in rows] == list(range(20))
+    assert len({r["data"]["event_id"] for r in rows}) == 20
+
+def test_dispatcher_retries_until_delivery_succeeds(tmp_path):
+    cfg = {"driver": "file", "file": {"dir": str(tmp_path / "outbox")}, "spool": {"dir": str(tmp_path / "spool")}}
+    with Orchestrator(cfg) as orch:
+        drv = orch.dispatcher.driver = _Flaky()
+        orch.dispatcher.backoff_s = 0.01
+        drv.down.set()
+        for i in range(5):
+            orch.publish("mem", {"i": i})
+        deadline = time.monotonic() + 2
+        while not orch.dispatcher.failures and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert orch.dispatcher.failures and drv.got == []
+        drv.down.clear()
+        orch.flush(5)
+        assert [p["i"] for _, p in drv.got] == list(range(5)) and orch.spool.pending() == 0
+
+class _Picky(BaseDriver):
+    """Rejects batches holding an event with {"bad": True}; fails every delivery while `down` is set."""
+
+    def __init__(self):
+        self.down = False
+        self.got = []
+
+    def deliver(self, events):
+        if self.down:
+            raise ConnectionError("receiver down")
+        if any(p.get("bad") for _, p in events):
+            raise DeliveryRejected("HTTP 400")
+        self.got.extend(events)
+
+def _dead(spool_dir):
+    return [json.loads(l) for f in sorted((spool_dir / "dead").glob("*.jsonl"))
+            for l in f.read_text(encoding="utf-8").splitlines()]
+
+def test_rejected_batch_is_dead_lettered_and_the_spool_moves_on(tmp_path):
+    cfg = {"driver": "file", "file": {"dir": str(tmp_path / "outbox")},
+           "spool": {"dir": str(tmp_path / "spool"), "batch_size": 1}}
+    with Orchestrator(cfg) as orch:
+        drv = orch.dispatcher.driver = _Picky()
+        orch.publish_many([("jam", {"i": i, "bad": i == 2}) for i in range(5)])
+        orch.flush(5)
+        assert [p["i"] for _, p in drv.got] == [0, 1, 3, 4] and orch.spool.pending() == 0
+        spool = orch.metrics()["spool"]
+        assert spool["dead_lettered"] == 1 and spool["last_error"] == "DeliveryRejected: HTTP 400"
+    dead = _dead(tmp_path / "spool")
+    assert [(d["seq"], d["data"]["i"], d["error"]) for d in dead] == [(3, 2, "DeliveryRejected: HTTP 400")]
+
+def test_batch_is_dead_lettered_after_max_attempts(tmp_path):
+    cfg = {"driver": "file", "file": {"dir": str(tmp_path / "outbox")},
+           "spool": {"dir": str(tmp_path / "spool"), "max_attempts": 3}}
+    with Orchestrator(cfg) as orch:
+        drv = orch.dispatcher.driver = _Picky()
+        orch.dispatcher.backoff_s = 0.001
+        drv.down = True
+        orch.publish_many([("mem", {"i": i}) for i in range(4)])
+        orch.flush(5)
+        assert orch.spool.pending() == 0 and drv.got == []
+        assert orch.dispatcher.failures == 3 and orch.dispatcher.dead_lettered == 4
+        drv.down = False
+        orch.publish("mem", {"i": 4})
+        orch.flush(5)
+        assert [p["i"] for _, p in drv.got] == [4]
+    assert [d["data"]["i"] for d in _dead(tmp_path / "spool")] == [0, 1, 2, 3]
+
+def test_fanout_lanes_ack_independently(tmp_path):
+    cfg = {"drivers": [{"name": "file", "driver": "file", "file": {"dir": str(tmp_path / "outbox")}},
+                       {"name": "hook", "driver": "file", "file": {"dir": str(tmp_path / "hook")}}],
+           "spool": {"dir": str(tmp_path / "spool"), "batch_size": 4}}
+    outbox = tmp_path / "outbox" / "lee_evt_jam.jsonl"
+    orch = Orchestrator(cfg)
+    hook = orch.dispatchers["hook"]
+    hook.driver.driver = _Flaky()
+    hook.driver.driver.down.set()
+    hook.backoff_s = 0.01
+    for i in range(10):
+        orch.publish("jam", {"i": i})
+    assert orch.dispatchers["file"].wait(5)  # the healthy sink is not held up by the failing one
+    deadline = time.monotonic() + 2
+    while hook.failures < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    orch.driver.flush()
+    assert hook.failures >= 5 and orch.spool.pending("hook") == 10
+    rows = [json.loads(l) for l in outbox.read_text(encoding="utf-8").splitlines()]
+    assert [r["data"]["i"] for r in rows] == list(range(10))  # each event once, despite the retries
+    m = orch.metrics()
+    assert m["file"]["spool"]["pending"] == 0 and m["hook"]["spool"]["failures"] == hook.failures
+    for d in orch.dispatchers.values():  # "crash": the hook lane never acked, its events stay spooled
+        d.stop()
+    orch.spool.close()
+    orch.driver.close()
+
+    orch = Orchestrator(cfg)  # replays to the hook lane only
+    orch.close()
+    assert len(outbox.read_text(encoding="utf-8").splitlines()) == 10
+    hooked = [json.loads(l) for l in (tmp_path / "hook" / "lee_evt_jam.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["data"]["i"] for r in hooked] == list(range(10))
+    assert {r["data"]["event_id"] for r in hooked} == {r["data"]["event_id"] for r in rows}
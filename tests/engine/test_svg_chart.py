@@ -0,0 +1,40 @@
+import math
+import xml.etree.ElementTree as ET
+
+from src.engine import svg_chart as sc
+
+def _parse(svg):
+    return ET.fromstring(svg)  # well-formed XML
+
+def test_lttb_keeps_endpoints_and_extremes():
+    xs = list(range(10_000))
+    ys = [math.sin(x / 500) for x in xs]
+    ys[4321] = 50.0  # a spike must survive downsampling
+    dx, dy = sc.lttb(xs, ys, 200)
+    assert len(dx) == 200 and dx[0] == 0 and dx[-1] == 9999
+    assert 50.0 in list(dy)
+    assert list(dx) == sorted(dx)
+    # short series pass through untouched
+    assert sc.lttb([1, 2], [3, 4], 200) == ([1, 2], [3, 4])
+
+def test_lttb_list_and_numpy_paths_agree(monkeypatch):
+    np = __import__("pytest").importorskip("numpy")
+    xs = list(range(3000))
+    ys = [(x * 7919) % 101 for x in xs]
+    fast = sc.lttb(np.array(xs, dtype=float), np.array(ys, dtype=float), 300)
+    monkeypatch.setattr(sc, "np", None)
+    slow = sc.lttb(xs, ys, 300)
+    assert [float(v) for v in slow[0]] == fast[0].tolist()
+
+def test_charts_are_well_formed_and_bounded():
+    bar = _parse(sc.bar_chart(["JAM", "MEM <&>"], [3, 5], title="t"))
+    assert len(bar.findall("{http://www.w3.org/2000/svg}rect")) == 3  # background + 2 bars
+    xs = list(range(100_000))
+    line = sc.line_chart(xs, [x % 17 for x in xs], max_points=500)
+    pts = _parse(line).find("{http://www.w3.org/2000/svg}polyline").get("points").split()
+    assert len(pts) == 500
+    counts, edges = sc.histogram_counts([1, 2, 2, 3, float("nan")], bins=2)
+    assert sum(counts) == 4 and len(edges) == 3
+    _parse(sc.histogram([1.0, 2.0, 2.5], bins=4))
+    _parse(sc.heatmap(["a", "b"], ["d1", "d2", "d3"], [[0, 1, 2], [3, 4, 5]], title="h"))
+    _parse(sc.line_chart([], []))